@@ -0,0 +1,82 @@
+"""
+Benchmarks comparing BTreeMap against TreeMap.
+Run from the root of the repository with `python -m benchmarks.bench_b_tree_map`.
+"""
+import random
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, Sequence
+
+from ech_datastructures import BTreeMap, TreeMap
+
+from .bench_tree_map import get_all, insert_all, iterate_all, us_per_op
+
+
+SIZES = (10_000, 100_000, 400_000)
+
+
+def bytes_per_entry(build: Callable[..., Any], *args: Any, n: int) -> float:
+    """
+    Measure how much memory a map takes, not counting the keys and values themselves.
+
+    Parameters
+    ----------
+    build: Callable[..., Any] - builds the map (from keys and values that already exist).
+    args: Any - arguments to pass to `build`.
+    n: int - the number of entries in the map.
+
+    Returns
+    -------
+    float - bytes allocated per entry while building the map.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = build(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return (after - before) / n
+
+
+def bench_memory(sizes: Sequence[int]):
+    """
+    Memory per entry of each backend, built from the same pre-existing sorted pairs.
+    """
+    print("memory per entry")
+    print(f"{'n':>8} {'TreeMap B':>10} {'BTreeMap(64) B':>15} {'BTreeMap(128) B':>16}")
+    for n in sizes:
+        pairs = [(i, i) for i in range(n)]
+        tree_bytes = bytes_per_entry(TreeMap.from_sorted, pairs, n=n)
+        b64_bytes = bytes_per_entry(BTreeMap.from_sorted, pairs, n=n)
+        b128_bytes = bytes_per_entry(partial(BTreeMap.from_sorted, fanout=128), pairs, n=n)
+        print(f"{n:>8} {tree_bytes:>10.1f} {b64_bytes:>15.1f} {b128_bytes:>16.1f}")
+
+
+def bench_operations(sizes: Sequence[int]):
+    """
+    Random inserts, random lookups, and a full ordered scan on each backend.
+    """
+    print("operations (us per op): TreeMap / BTreeMap")
+    print(f"{'n':>8} {'insert':>14} {'get':>14} {'scan':>14}")
+    for n in sizes:
+        keys = random.sample(range(n * 4), n)
+        results = []
+        for tree in (TreeMap(), BTreeMap()):
+            insert_time = us_per_op(insert_all, tree, keys, n_ops=n)
+            get_time = us_per_op(get_all, tree, keys, n_ops=n)
+            scan_time = us_per_op(iterate_all, tree, n_ops=n)
+            results.append((insert_time, get_time, scan_time))
+        columns = [f"{tree_time:.2f} / {b_time:.2f}" for tree_time, b_time in zip(*results)]
+        print(f"{n:>8} {columns[0]:>14} {columns[1]:>14} {columns[2]:>14}")
+
+
+def main():
+    """
+    Run all the BTreeMap benchmarks.
+    """
+    bench_memory(SIZES)
+    bench_operations(SIZES)
+
+
+if __name__ == "__main__":
+    main()
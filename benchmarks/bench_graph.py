@@ -0,0 +1,107 @@
+"""
+Benchmarks for Graph and its compressed sparse row form, FrozenGraph:
+building, freezing, and the search algorithms on random sparse graphs and on grids.
+Run from the root of the repository with `python -m benchmarks.bench_graph`.
+"""
+import random
+from typing import Sequence, Tuple
+
+from ech_datastructures import Graph
+
+from .bench_heap import bytes_per_entry
+from .bench_tree_map import us_per_op
+
+
+SIZES = (10_000, 100_000)
+
+# average number of edges per node in the random graphs
+DEGREE = 4
+
+
+def build(edges: Sequence[Tuple[int, int, int]]):
+    """
+    Workload: build a Graph edge by edge.
+    """
+    Graph(edges)
+
+
+def random_edges(n: int) -> Sequence[Tuple[int, int, int]]:
+    """
+    Random weighted edges between `n` nodes.
+    """
+    return [(random.randrange(n), random.randrange(n), random.randrange(1, 100))
+            for _ in range(DEGREE * n)]
+
+
+def grid(size: int) -> Graph:
+    """
+    An unweighted `size` x `size` grid, like a road map or a game board.
+    """
+    graph = Graph()
+    for x in range(size):
+        for y in range(size):
+            graph.add_node((x, y))
+            if x > 0:
+                graph.add_edge((x - 1, y), (x, y))
+            if y > 0:
+                graph.add_edge((x, y - 1), (x, y))
+    return graph
+
+
+def bench_random(sizes: Sequence[int]):
+    """
+    Build, freeze, and search random sparse graphs, comparing Graph and FrozenGraph.
+    """
+    print(f"random graphs, {DEGREE} edges per node (us per edge, and bytes per edge)")
+    print(f"{'n':>8} {'':>10} {'build':>10} {'bfs':>10} {'dijkstra':>10} {'prim':>10} "
+          f"{'bytes':>10}")
+    for n in sizes:
+        edges = random_edges(n)
+        graph = Graph(edges)
+        m = graph.n_edges
+        frozen = graph.freeze()
+        for label, g, build_time, size in (
+                ("Graph", graph, us_per_op(build, edges, n_ops=m),
+                 bytes_per_entry(Graph, edges, n=m)),
+                ("Frozen", frozen, us_per_op(graph.freeze, n_ops=m),
+                 bytes_per_entry(graph.freeze, n=m))):
+            times = [build_time,
+                     us_per_op(g.bfs, 0, n_ops=m),
+                     us_per_op(g.dijkstra, 0, n_ops=m),
+                     us_per_op(g.minimum_spanning_tree, n_ops=m),
+                     size]
+            print(f"{n:>8} {label:>10} " + " ".join(f"{t:>10.2f}" for t in times))
+
+
+def bench_grid(sizes: Sequence[int]):
+    """
+    Corner-to-corner shortest paths on a grid: Dijkstra against A* with a Manhattan heuristic.
+    """
+    print("grid, corner to corner (ms per path)")
+    print(f"{'n':>8} {'':>10} {'dijkstra':>10} {'a*':>10}")
+    for n in sizes:
+        size = int(n ** 0.5)
+        goal = (size - 1, size - 1)
+
+        def manhattan(node: Tuple[int, int], goal=goal) -> int:
+            return goal[0] - node[0] + goal[1] - node[1]
+
+        graph = grid(size)
+        for label, g in (("Graph", graph), ("Frozen", graph.freeze())):
+            # 1000 "operations" per call turns microseconds into milliseconds
+            times = [us_per_op(g.shortest_path, (0, 0), goal, n_ops=1000),
+                     us_per_op(g.shortest_path, (0, 0), goal, manhattan, n_ops=1000)]
+            print(f"{n:>8} {label:>10} " + " ".join(f"{t:>10.2f}" for t in times))
+
+
+def main():
+    """
+    Run all the graph benchmarks.
+    """
+    random.seed(25)
+    bench_random(SIZES)
+    bench_grid(SIZES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Benchmarks for Heap.
+Run from the root of the repository with `python -m benchmarks.bench_heap`.
+"""
+import heapq
+import random
+import tracemalloc
+from array import array
+from typing import Any, Callable, Iterable, Sequence
+
+from ech_datastructures import Heap, NumericHeap, nlargest
+
+from .bench_tree_map import us_per_op
+
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+class _LegacyHeapElem:
+    """
+    The original Heap element wrapper, which calls the key function on every comparison.
+    Kept here only as a baseline.
+    """
+    __slots__ = "val", "key", "reverse"
+
+    def __init__(self, val: Any, *, key: Callable[[Any], Any], reverse: bool):
+        self.val = val
+        self.key = key
+        self.reverse = reverse
+
+    def __lt__(self, other: "_LegacyHeapElem") -> bool:
+        natural = self.key(self.val) < self.key(other.val)
+        if self.reverse:
+            return not natural
+        return natural
+
+
+class LegacyHeap:
+    """
+    Just enough of the original Heap to push and pop, built on `_LegacyHeapElem`.
+    """
+    __slots__ = "_data", "_key", "_reverse"
+
+    def __init__(self, data: Iterable = None, *, key: Callable[[Any], Any] = None,
+                 reverse: bool = False):
+        self._key = (lambda x: x) if key is None else key
+        self._reverse = reverse
+        self._data = [] if data is None else [self._wrap(x) for x in data]
+        heapq.heapify(self._data)
+
+    def _wrap(self, item: Any) -> _LegacyHeapElem:
+        return _LegacyHeapElem(item, key=self._key, reverse=self._reverse)
+
+    def add(self, new_item: Any):
+        """
+        Push one item.
+        """
+        heapq.heappush(self._data, self._wrap(new_item))
+
+    def pop(self) -> Any:
+        """
+        Pop the best item.
+        """
+        return heapq.heappop(self._data).val
+
+
+class CountingKey:
+    """
+    A deliberately slow key function that also counts how many times it is called.
+    """
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, item: Sequence[float]) -> float:
+        self.calls += 1
+        return sum(x * x for x in item)
+
+
+def push_all(h: Any, items: Sequence):
+    """
+    Workload: push each item.
+    """
+    for item in items:
+        h.add(item)
+
+
+def pop_all(h: Any, n: int):
+    """
+    Workload: pop `n` items.
+    """
+    for _ in range(n):
+        h.pop()
+
+
+def bench_key_calls(sizes: Sequence[int]):
+    """
+    Push then pop every item with an expensive key, counting key calls and time per operation.
+    """
+    print("expensive key, push then pop all: legacy _HeapElem / Heap")
+    print(f"{'n':>8} {'key calls/op':>16} {'push us':>16} {'pop us':>16}")
+    for n in sizes:
+        items = [tuple(random.random() for _ in range(8)) for _ in range(n)]
+        results = []
+        for heap_class in (LegacyHeap, Heap):
+            key = CountingKey()
+            h = heap_class(key=key)
+            push_time = us_per_op(push_all, h, items, n_ops=n)
+            pop_time = us_per_op(pop_all, h, n, n_ops=n)
+            results.append((key.calls / (2 * n), push_time, pop_time))
+        columns = [f"{old:.1f} / {new:.1f}" for old, new in zip(*results)]
+        print(f"{n:>8} {columns[0]:>16} {columns[1]:>16} {columns[2]:>16}")
+
+
+def bench_cheap_key(sizes: Sequence[int]):
+    """
+    Push then pop every item with the default key and with `reverse=True`.
+    """
+    print("default key, push then pop all (us per op): legacy _HeapElem / Heap")
+    print(f"{'n':>8} {'reverse':>8} {'push':>16} {'pop':>16}")
+    for n in sizes:
+        items = [random.random() for _ in range(n)]
+        for reverse in (False, True):
+            results = []
+            for heap_class in (LegacyHeap, Heap):
+                h = heap_class(reverse=reverse)
+                push_time = us_per_op(push_all, h, items, n_ops=n)
+                pop_time = us_per_op(pop_all, h, n, n_ops=n)
+                results.append((push_time, pop_time))
+            columns = [f"{old:.2f} / {new:.2f}" for old, new in zip(*results)]
+            print(f"{n:>8} {str(reverse):>8} {columns[0]:>16} {columns[1]:>16}")
+
+
+def add_each(h: Heap, items: Sequence):
+    """
+    Workload: add the items one at a time.
+    """
+    for item in items:
+        h.add(item)
+
+
+def bench_update(sizes: Sequence[int]):
+    """
+    Add a batch of items to a heap, one at a time or with `update`, for a few batch sizes.
+    The batch is in descending order, which is the worst case for pushing into a min-heap.
+    """
+    print("batch add (us per item): add each / update")
+    print(f"{'n':>8} {'k = n/10':>16} {'k = n/2':>16} {'k = 2n':>16}")
+    for n in sizes:
+        columns = []
+        for k in (n // 10, n // 2, 2 * n):
+            items = [random.random() for _ in range(n)]
+            batch = sorted((random.random() for _ in range(k)), reverse=True)
+            add_time = us_per_op(add_each, Heap(items), batch, n_ops=k)
+            update_time = us_per_op(Heap(items).update, batch, n_ops=k)
+            columns.append(f"{add_time:.2f} / {update_time:.2f}")
+        print(f"{n:>8} {columns[0]:>16} {columns[1]:>16} {columns[2]:>16}")
+
+
+def top_k_by_hand(items: Sequence, k: int):
+    """
+    Workload: keep the k largest items with `add_pop` and a length check.
+    """
+    h = Heap()
+    for item in items:
+        if len(h) < k:
+            h.add(item)
+        else:
+            h.add_pop(item)
+
+
+def top_k_bounded(items: Sequence, k: int):
+    """
+    Workload: keep the k largest items with a bounded Heap.
+    """
+    h = Heap(maxsize=k)
+    for item in items:
+        h.add(item)
+
+
+def bench_top_k(sizes: Sequence[int]):
+    """
+    Keep the 100 largest of a stream of items.
+    """
+    k = 100
+    print(f"top {k} of a stream (us per item): by hand / maxsize / nlargest")
+    for n in sizes:
+        items = [random.random() for _ in range(n * 10)]
+        times = [
+            us_per_op(top_k_by_hand, items, k, n_ops=len(items)),
+            us_per_op(top_k_bounded, items, k, n_ops=len(items)),
+            us_per_op(nlargest, k, items, n_ops=len(items)),
+        ]
+        print(f"{n * 10:>8} " + " / ".join(f"{t:.3f}" for t in times))
+
+
+def pop_each(h: Heap, m: int):
+    """
+    Workload: pop m items one at a time.
+    """
+    for _ in range(m):
+        h.pop()
+
+
+def bench_pop_many(sizes: Sequence[int]):
+    """
+    Pop a batch of items one at a time or with `pop_many`, and peek at them with `peek_k`.
+    """
+    print("batch pop (us per item): pop each / pop_many / peek_k")
+    print(f"{'n':>8} {'m = 100':>22} {'m = n/10':>22} {'m = n':>22}")
+    for n in sizes:
+        items = [random.random() for _ in range(n)]
+        columns = []
+        for m in (100, n // 10, n):
+            times = (
+                us_per_op(pop_each, Heap(items, key=abs), m, n_ops=m),
+                us_per_op(Heap(items, key=abs).pop_many, m, n_ops=m),
+                us_per_op(Heap(items, key=abs).peek_k, m, n_ops=m),
+            )
+            columns.append(" / ".join(f"{t:.2f}" for t in times))
+        print(f"{n:>8} {columns[0]:>22} {columns[1]:>22} {columns[2]:>22}")
+
+
+def bytes_per_entry(build: Callable[..., Any], *args: Any, n: int) -> float:
+    """
+    Measure the memory allocated by `build(*args)` (which must return the structure it builds),
+    per entry.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return (after - before) / n
+
+
+def push_pairs(h: Heap, priorities: Sequence[float]):
+    """
+    Workload: push (priority, id) tuples one at a time.
+    """
+    for ident, priority in enumerate(priorities):
+        h.add((priority, ident))
+
+
+def push_numeric(h: NumericHeap, priorities: Sequence[float]):
+    """
+    Workload: push (priority, id) entries one at a time.
+    """
+    for ident, priority in enumerate(priorities):
+        h.add(priority, ident)
+
+
+def bench_numeric(sizes: Sequence[int]):
+    """
+    Compare a Heap of (priority, id) tuples with a NumericHeap: memory, building, pushing, popping.
+    """
+    print("(priority, id) entries: Heap of tuples / NumericHeap")
+    print(f"{'n':>8} {'bytes/entry':>16} {'build us':>16} {'push us':>16} {'pop us':>16}")
+    for n in sizes:
+        priorities = array("d", (random.random() for _ in range(n)))
+        pairs = list(zip(priorities, range(n)))
+        memory = (
+            bytes_per_entry(Heap, zip(priorities, range(n)), n=n),
+            bytes_per_entry(NumericHeap, priorities, n=n),
+        )
+        build = (
+            us_per_op(Heap, pairs, n_ops=n),
+            us_per_op(NumericHeap, priorities, n_ops=n),
+        )
+        heap, numeric = Heap(), NumericHeap()
+        push = (
+            us_per_op(push_pairs, heap, priorities, n_ops=n),
+            us_per_op(push_numeric, numeric, priorities, n_ops=n),
+        )
+        pop = (
+            us_per_op(pop_all, heap, n, n_ops=n),
+            us_per_op(pop_all, numeric, n, n_ops=n),
+        )
+        columns = [" / ".join(f"{t:.2f}" for t in times) for times in (memory, build, push, pop)]
+        print(f"{n:>8} " + " ".join(f"{column:>16}" for column in columns))
+
+
+def main():
+    """
+    Run all the Heap benchmarks.
+    """
+    bench_key_calls(SIZES)
+    bench_cheap_key(SIZES)
+    bench_update(SIZES)
+    bench_top_k(SIZES)
+    bench_pop_many(SIZES)
+    bench_numeric(SIZES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmarks comparing the heap engines: binary and 4-ary Heap, PairingHeap, and RadixHeap
+(plus IndexedHeap for decrease-key).
+Run from the root of the repository with `python -m benchmarks.bench_heap_engines`.
+"""
+import random
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence
+
+from ech_datastructures import Heap, IndexedHeap, PairingHeap, RadixHeap
+
+from .bench_tree_map import us_per_op
+
+
+SIZES = (1_000, 10_000, 100_000)
+
+ENGINES: Dict[str, Callable[..., Any]] = {
+    "Heap": Heap,
+    "Heap(4)": partial(Heap, arity=4),
+    "Pairing": PairingHeap,
+    "Radix": RadixHeap,
+}
+
+
+def push_pop_all(make_heap: Callable[..., Any], items: Sequence[int]):
+    """
+    Workload: push every item, then pop them all.
+    """
+    h = make_heap()
+    for item in items:
+        h.add(item)
+    while not h.is_empty():
+        h.pop()
+
+
+def steady_state(make_heap: Callable[..., Any], items: Sequence[int], deltas: Sequence[int]):
+    """
+    Workload: starting from a full heap, repeatedly pop the next item and push a later one,
+    like a timer queue or an event simulation.
+    """
+    h = make_heap(items)
+    for delta in deltas:
+        h.add(h.pop() + delta)
+
+
+def merge_all(make_heap: Callable[..., Any], chunks: List[List[int]]):
+    """
+    Workload: build many small heaps, merge them into one, then pop everything.
+    """
+    heaps = [make_heap(chunk) for chunk in chunks]
+    h = heaps[0]
+    for other in heaps[1:]:
+        h.merge(other)
+    while not h.is_empty():
+        h.pop()
+
+
+def decrease_keys(make_heap: Callable[..., Any], items: Sequence[int], decreases: Sequence[int]):
+    """
+    Workload: add every item, keeping its handle, then lower random items' priorities,
+    like Dijkstra's algorithm relaxing edges, then pop everything.
+    """
+    h = make_heap()
+    handles = [h.add(item) for item in items]
+    for i in decreases:
+        handle = handles[i]
+        h.change_priority(handle, handle.item - 1)
+    while not h.is_empty():
+        h.pop()
+
+
+def print_row(label: str, times: Sequence[float]):
+    """
+    Print one row of results.
+    """
+    print(f"{label:>8} " + " ".join(f"{t:>10.2f}" for t in times))
+
+
+def bench_mixes(sizes: Sequence[int]):
+    """
+    Push/pop, steady-state, and merge mixes for every engine.
+    """
+    for title, run in (("push all, then pop all", _run_push_pop),
+                       ("steady state pop + push", _run_steady_state),
+                       ("merge 100 heaps, then pop all", _run_merge)):
+        print(f"{title} (us per item)")
+        print(f"{'n':>8} " + " ".join(f"{name:>10}" for name in ENGINES))
+        for n in sizes:
+            print_row(str(n), [run(make_heap, n) for make_heap in ENGINES.values()])
+
+
+def _run_push_pop(make_heap: Callable[..., Any], n: int) -> float:
+    """
+    Time `push_pop_all` on random keys.
+    """
+    items = [random.randrange(1 << 30) for _ in range(n)]
+    return us_per_op(push_pop_all, make_heap, items, n_ops=n)
+
+
+def _run_steady_state(make_heap: Callable[..., Any], n: int) -> float:
+    """
+    Time `steady_state` on random keys and increments.
+    """
+    items = [random.randrange(1 << 20) for _ in range(n)]
+    deltas = [random.randrange(1 << 20) for _ in range(n)]
+    return us_per_op(steady_state, make_heap, items, deltas, n_ops=n)
+
+
+def _run_merge(make_heap: Callable[..., Any], n: int) -> float:
+    """
+    Time `merge_all` on 100 chunks of random keys.
+    """
+    chunks = [[random.randrange(1 << 30) for _ in range(n // 100)] for _ in range(100)]
+    return us_per_op(merge_all, make_heap, chunks, n_ops=n)
+
+
+def bench_decrease_key(sizes: Sequence[int]):
+    """
+    Decrease-key for the engines that support handles.
+    """
+    print("add all, decrease n keys, then pop all (us per item)")
+    print(f"{'n':>8} {'Indexed':>10} {'Pairing':>10}")
+    for n in sizes:
+        items = [random.randrange(1 << 30) for _ in range(n)]
+        decreases = [random.randrange(n) for _ in range(n)]
+        print_row(str(n), [us_per_op(decrease_keys, make_heap, items, decreases, n_ops=n)
+                           for make_heap in (IndexedHeap, PairingHeap)])
+
+
+def main():
+    """
+    Run all the heap engine benchmarks.
+    """
+    bench_mixes(SIZES)
+    bench_decrease_key(SIZES)
+
+
+if __name__ == "__main__":
+    main()
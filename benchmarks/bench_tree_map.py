@@ -0,0 +1,230 @@
+"""
+Benchmarks for TreeMap.
+Run from the root of the repository with `python -m benchmarks.bench_tree_map`.
+"""
+import random
+import time
+from typing import Any, Callable, Sequence
+
+from ech_datastructures import TreeMap
+
+
+SIZES = (1_000, 4_000, 16_000, 64_000)
+
+
+def us_per_op(func: Callable[..., Any], *args: Any, n_ops: int) -> float:
+    """
+    Time a single call to `func(*args)`, which performs `n_ops` operations.
+
+    Parameters
+    ----------
+    func: Callable[..., Any] - the workload to time.
+    args: Any - arguments to pass to `func`.
+    n_ops: int - how many operations `func` performs.
+
+    Returns
+    -------
+    float - average time per operation, in microseconds.
+    """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    return elapsed / n_ops * 1e6
+
+
+def insert_all(tree: TreeMap, keys: Sequence):
+    """
+    Workload: insert each key into the tree.
+    """
+    for key in keys:
+        tree[key] = key
+
+
+def get_all(tree: TreeMap, keys: Sequence):
+    """
+    Workload: look up each key in the tree.
+    """
+    for key in keys:
+        _ = tree[key]
+
+
+def contains_all(tree: TreeMap, keys: Sequence):
+    """
+    Workload: check membership of each key in the tree.
+    """
+    for key in keys:
+        _ = key in tree
+
+
+def window_queries(tree: TreeMap, starts: Sequence, width: int):
+    """
+    Workload: for each start, collect the keys in the window [start, start + width).
+    """
+    for start in starts:
+        _ = list(tree.irange(start, start + width, inclusive=(True, False)))
+
+
+def pages_by_position(tree: TreeMap, offsets: Sequence, page_size: int):
+    """
+    Workload: for each offset, collect the page of keys starting at that position.
+    """
+    for offset in offsets:
+        _ = list(tree.islice(offset, offset + page_size))
+
+
+def pages_by_list(tree: TreeMap, offsets: Sequence, page_size: int):
+    """
+    Workload: like `pages_by_position`, but by materializing all the keys for each page.
+    """
+    for offset in offsets:
+        _ = list(tree.keys())[offset:offset + page_size]
+
+
+def step_with_cursor(tree: TreeMap, n_steps: int):
+    """
+    Workload: step through the first `n_steps` keys with a cursor.
+    """
+    cursor = tree.cursor()
+    for _ in range(n_steps):
+        cursor.next()
+
+
+def step_with_lookups(tree: TreeMap, n_steps: int):
+    """
+    Workload: step through the first `n_steps` keys with a fresh descent per step.
+    """
+    key = tree.first()[0]
+    for _ in range(n_steps):
+        key = tree.higher_key(key)
+
+
+def iterate_all(tree: TreeMap):
+    """
+    Workload: iterate over every key in the tree.
+    """
+    for _ in tree:
+        pass
+
+
+def bench_sorted_inserts():
+    """
+    Insert keys in ascending order, which degrades an unbalanced tree into a linked list.
+    With a balanced tree the per-operation cost should only grow logarithmically.
+    """
+    print("sorted inserts / lookups")
+    print(f"{'n':>8} {'height':>7} {'insert us/op':>13} {'get us/op':>10}")
+    for n in SIZES:
+        tree = TreeMap()
+        keys = range(n)
+        insert_time = us_per_op(insert_all, tree, keys, n_ops=n)
+        get_time = us_per_op(get_all, tree, keys, n_ops=n)
+        # pylint: disable=protected-access
+        height = tree._root.height
+        print(f"{n:>8} {height:>7} {insert_time:>13.2f} {get_time:>10.2f}")
+
+
+def bench_full_scan():
+    """
+    Iterate over the whole tree; the per-key cost should stay flat as the tree grows.
+    """
+    print("full in-order scan")
+    print(f"{'n':>8} {'iter us/key':>12} {'== us/key':>10}")
+    for n in SIZES:
+        tree = TreeMap()
+        other = TreeMap()
+        insert_all(tree, range(n))
+        insert_all(other, range(n))
+        iter_time = us_per_op(iterate_all, tree, n_ops=n)
+        eq_time = us_per_op(tree.__eq__, other, n_ops=n)
+        print(f"{n:>8} {iter_time:>12.3f} {eq_time:>10.3f}")
+
+
+def bench_contains():
+    """
+    Membership tests for keys that are (even) and are not (odd) in the tree.
+    The per-check cost should only grow logarithmically.
+    """
+    print("membership checks")
+    print(f"{'n':>8} {'hit us/op':>10} {'miss us/op':>11}")
+    for n in SIZES:
+        tree = TreeMap()
+        insert_all(tree, range(0, 2 * n, 2))
+        hit_time = us_per_op(contains_all, tree, range(0, 2 * n, 2), n_ops=n)
+        miss_time = us_per_op(contains_all, tree, range(1, 2 * n, 2), n_ops=n)
+        print(f"{n:>8} {hit_time:>10.2f} {miss_time:>11.2f}")
+
+
+def bench_bulk_build():
+    """
+    Build a tree from n pairs: one insertion at a time vs. the bulk constructors.
+    """
+    print("bulk construction")
+    print(f"{'n':>8} {'insert us/op':>13} {'from_sorted us/op':>18} {'unsorted us/op':>15}")
+    for n in SIZES:
+        pairs = [(i, i) for i in range(n)]
+        shuffled = random.sample(pairs, n)
+        insert_time = us_per_op(insert_all, TreeMap(), range(n), n_ops=n)
+        sorted_time = us_per_op(TreeMap.from_sorted, pairs, n_ops=n)
+        unsorted_time = us_per_op(TreeMap, shuffled, n_ops=n)
+        print(f"{n:>8} {insert_time:>13.2f} {sorted_time:>18.2f} {unsorted_time:>15.2f}")
+
+
+def bench_range_queries():
+    """
+    Query small windows of 10 keys; the cost should be O(log(n) + 10), not O(n).
+    """
+    print("range queries (10 keys per window)")
+    print(f"{'n':>8} {'irange us/query':>16} {'full scan us/query':>19}")
+    n_queries = 1_000
+    for n in SIZES:
+        tree = TreeMap.from_sorted((i, i) for i in range(n))
+        starts = [random.randrange(n - 10) for _ in range(n_queries)]
+        irange_time = us_per_op(window_queries, tree, starts, 10, n_ops=n_queries)
+        scan_time = us_per_op(iterate_all, tree, n_ops=1)
+        print(f"{n:>8} {irange_time:>16.2f} {scan_time:>19.2f}")
+
+
+def bench_pagination():
+    """
+    Fetch pages of 20 keys at random offsets: positional slicing vs. materializing the keys.
+    """
+    print("pagination (20 keys per page)")
+    print(f"{'n':>8} {'islice us/page':>15} {'list us/page':>13}")
+    n_pages = 200
+    for n in SIZES:
+        tree = TreeMap.from_sorted((i, i) for i in range(n))
+        offsets = [random.randrange(n - 20) for _ in range(n_pages)]
+        islice_time = us_per_op(pages_by_position, tree, offsets, 20, n_ops=n_pages)
+        list_time = us_per_op(pages_by_list, tree, offsets[:10], 20, n_ops=10)
+        print(f"{n:>8} {islice_time:>15.2f} {list_time:>13.2f}")
+
+
+def bench_stepping():
+    """
+    Step from key to key: a cursor's O(1) amortized steps vs. O(log(n)) `higher_key` lookups.
+    """
+    print("stepping to the next key")
+    print(f"{'n':>8} {'cursor us/step':>15} {'higher_key us/step':>19}")
+    for n in SIZES:
+        tree = TreeMap.from_sorted((i, i) for i in range(n))
+        n_steps = n - 1
+        cursor_time = us_per_op(step_with_cursor, tree, n_steps, n_ops=n_steps)
+        lookup_time = us_per_op(step_with_lookups, tree, n_steps, n_ops=n_steps)
+        print(f"{n:>8} {cursor_time:>15.2f} {lookup_time:>19.2f}")
+
+
+def main():
+    """
+    Run all the TreeMap benchmarks.
+    """
+    bench_sorted_inserts()
+    bench_full_scan()
+    bench_contains()
+    bench_bulk_build()
+    bench_range_queries()
+    bench_pagination()
+    bench_stepping()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,14 @@
-from .heap import Heap
+from .b_tree_map import BTreeMap
+from .concurrent_heap import AsyncHeap, ConcurrentHeap
+from .disjoint_set import DisjointSet
+from .graph import Graph
+from .heap import Heap, nlargest, nsmallest
+from .indexed_heap import IndexedHeap
+from .min_max_heap import MinMaxHeap
+from .numeric_heap import NumericHeap
+from .pairing_heap import PairingHeap
+from .radix_heap import RadixHeap
+from .sorted_list import SortedList
 from .tree_map import TreeMap
+from .tree_set import TreeSet
+from .trie import Trie
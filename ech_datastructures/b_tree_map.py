@@ -0,0 +1,965 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import ItemsView, KeysView, Mapping as MappingABC, ValuesView
+from typing import Any, Generator, Generic, Iterable, List, Mapping, Optional, Tuple, TypeVar, Union
+
+from .tree_map import _dedupe_sorted, _is_sorted, _sorted_unique_pairs, _to_pairs, \
+    _update_pairs
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class _BTreeLeaf(Generic[K, V]):
+    """
+    Intended only as a "helper class" to BTreeMap.
+    A leaf of the B+ tree: stores sorted keys and their values in parallel lists,
+    as well as links to the neighboring leaves, so ordered scans never go back up the tree.
+    """
+    __slots__ = "keys", "values", "prev", "next"
+
+    def __init__(self, keys: List[K], values: List[V]):
+        """
+        Construct a leaf of a B+ tree, not yet linked to any other leaves.
+
+        Parameters
+        ----------
+        keys: List[K] - the keys stored in this leaf, sorted.
+        values: List[V] - the values stored in this leaf, in the same order as their keys.
+        """
+        self.keys = keys
+        self.values = values
+        self.prev: Optional["_BTreeLeaf[K, V]"] = None
+        self.next: Optional["_BTreeLeaf[K, V]"] = None
+
+
+class _BTreeBranch(Generic[K]):
+    """
+    Intended only as a "helper class" to BTreeMap.
+    An internal node of the B+ tree: stores separator keys and child nodes.
+    Child `i` holds the keys `k` where `keys[i - 1] <= k < keys[i]`.
+    """
+    __slots__ = "keys", "children"
+
+    def __init__(self, keys: List[K], children: List[Any]):
+        """
+        Construct an internal node of a B+ tree.
+
+        Parameters
+        ----------
+        keys: List[K] - the separator keys, sorted. There is one fewer than there are children.
+        children: List[Union[_BTreeBranch, _BTreeLeaf]] - the child nodes, in order.
+        """
+        self.keys = keys
+        self.children = children
+
+
+def _even_chunks(n: int, max_size: int) -> List[Tuple[int, int]]:
+    """
+    Split `n` items into as few chunks as possible with at most `max_size` items each,
+    with chunk sizes as even as possible. Unless there is only one chunk,
+    every chunk has at least `max_size // 2` items.
+
+    Parameters
+    ----------
+    n: int - The number of items to split up.
+    max_size: int - The greatest number of items allowed in a chunk.
+
+    Returns
+    -------
+    List[Tuple[int, int]] - The (start, stop) indices of each chunk.
+    """
+    n_chunks = -(-n // max_size)  # ceiling division
+    base, extra = divmod(n, n_chunks)
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        stop = start + base + (1 if i < extra else 0)
+        chunks.append((start, stop))
+        start = stop
+    return chunks
+
+
+# pylint: disable=too-many-public-methods
+class BTreeMap(MappingABC, Generic[K, V]):
+    """
+    A dictionary/map object, backed by a B+ tree.
+    Naturally keeps items sorted by keys.
+
+    An alternative to TreeMap for very large maps: keys and values are kept in sorted Python lists
+    of up to `fanout` entries per node (searched with `bisect`), rather than one object per entry,
+    which takes much less memory and gives better locality. The leaves are linked together,
+    so ordered scans run straight along the leaves.
+    Lookups, insertions, and removals are all O(log(n)).
+
+    `K` represents the type of keys.
+    `V` represents the type of values.
+
+    Keys are ordered using `<`, and key equality is checked using `==`.
+    """
+    __slots__ = "_root", "_count", "_height", "_max", "_min"
+
+    def __init__(self,
+                 data: Union[Mapping[K, V], Iterable[Tuple[K, V]]] = None,
+                 *,
+                 fanout: int = 64):
+        """
+        Construct a BTreeMap.
+        If initial data is given, it is sorted (unless it's already sorted) and then the
+        tree is built in a single pass, rather than inserting the pairs one at a time.
+
+        Parameters
+        ----------
+        data: Union[Mapping[K, V], Iterable[Tuple[K, V]]] (optional) -
+            initial key/value pairs for the BTreeMap to store, as a Mapping object or
+            an Iterable of key/value pairs. If a key is given more than once,
+            the last value given for it is kept.
+            If `None` (default), the BTreeMap starts with no contents.
+        fanout: int - the greatest number of entries in a leaf, and of children of an
+            internal node. Every node except the root is kept at least half full.
+            Default is 64; values from 32 to 128 generally work well.
+
+        Raises
+        ------
+        ValueError - If `fanout` is less than 4.
+        """
+        if fanout < 4:
+            raise ValueError("fanout must be at least 4")
+        self._max = fanout
+        self._min = fanout // 2
+        # the root is a leaf when height is 0, and a branch otherwise
+        self._root: Union[_BTreeBranch[K], _BTreeLeaf[K, V]] = _BTreeLeaf([], [])
+        self._height = 0
+        self._count = 0
+        if data is not None:
+            self._build(_sorted_unique_pairs(_to_pairs(data)))
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[Tuple[K, V]], *, fanout: int = 64) -> "BTreeMap[K, V]":
+        """
+        Construct a BTreeMap from key/value pairs which are already sorted by key,
+        in O(n) time. If a key is given more than once, the last value given for it is kept.
+
+        Parameters
+        ----------
+        pairs: Iterable[Tuple[K, V]] - The key/value pairs, sorted by key.
+        fanout: int - See `BTreeMap.__init__`.
+
+        Raises
+        ------
+        ValueError - If the pairs are not sorted by key, or `fanout` is less than 4.
+
+        Returns
+        -------
+        BTreeMap[K, V] - A new BTreeMap containing the given pairs.
+        """
+        pairs = _to_pairs(pairs)
+        if not _is_sorted(pairs):
+            raise ValueError("pairs are not sorted by key")
+        tree = cls(fanout=fanout)
+        tree._build(_dedupe_sorted(pairs))
+        return tree
+
+    def _build(self, pairs: List[Tuple[K, V]]):
+        """
+        Replace the contents of the map, building the tree bottom-up in O(n) time.
+
+        Parameters
+        ----------
+        pairs: List[Tuple[K, V]] - The key/value pairs, sorted by key with no duplicate keys.
+
+        Returns
+        -------
+        None
+        """
+        self._count = len(pairs)
+        self._height = 0
+        if len(pairs) <= self._max:
+            self._root = _BTreeLeaf([key for key, _ in pairs], [value for _, value in pairs])
+            return
+        # fill the leaves, and link them together
+        level: List[Any] = []
+        prev = None
+        for start, stop in _even_chunks(len(pairs), self._max):
+            chunk = pairs[start:stop]
+            leaf = _BTreeLeaf([key for key, _ in chunk], [value for _, value in chunk])
+            leaf.prev = prev
+            if prev is not None:
+                prev.next = leaf
+            level.append(leaf)
+            prev = leaf
+        # the least key in each node of the current level
+        firsts = [leaf.keys[0] for leaf in level]
+        # group each level under a new level of branches, until there's just one node
+        while len(level) > 1:
+            new_level = []
+            new_firsts = []
+            for start, stop in _even_chunks(len(level), self._max):
+                new_level.append(_BTreeBranch(firsts[start + 1:stop], level[start:stop]))
+                new_firsts.append(firsts[start])
+            level = new_level
+            firsts = new_firsts
+            self._height += 1
+        self._root = level[0]
+
+    def _find_leaf(self, key: K) -> _BTreeLeaf[K, V]:
+        """
+        Descend to the leaf where the given key is, or would be.
+
+        Parameters
+        ----------
+        key: K - The key to search for.
+
+        Returns
+        -------
+        _BTreeLeaf[K, V] - The leaf that should hold the key.
+        """
+        node = self._root
+        for _ in range(self._height):
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def _find_path(self, key: K) -> Tuple[_BTreeLeaf[K, V], List[Tuple[_BTreeBranch[K], int]]]:
+        """
+        Descend to the leaf where the given key is, or would be,
+        remembering the path taken to get there.
+
+        Parameters
+        ----------
+        key: K - The key to search for.
+
+        Returns
+        -------
+        Tuple[_BTreeLeaf[K, V], List[Tuple[_BTreeBranch[K], int]]] - The leaf that should hold
+            the key, and each branch above it (from the root down) with the index of the child
+            that was taken.
+        """
+        path = []
+        node = self._root
+        for _ in range(self._height):
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = node.children[i]
+        return node, path
+
+    def _first_leaf(self) -> _BTreeLeaf[K, V]:
+        """
+        Descend to the leaf with the least keys.
+
+        Returns
+        -------
+        _BTreeLeaf[K, V] - The leftmost leaf.
+        """
+        node = self._root
+        for _ in range(self._height):
+            node = node.children[0]
+        return node
+
+    def _last_leaf(self) -> _BTreeLeaf[K, V]:
+        """
+        Descend to the leaf with the greatest keys.
+
+        Returns
+        -------
+        _BTreeLeaf[K, V] - The rightmost leaf.
+        """
+        node = self._root
+        for _ in range(self._height):
+            node = node.children[-1]
+        return node
+
+    def _insert(self, key: K, value: V, overwrite: bool) -> Tuple[bool, V]:
+        """
+        Insert a key/value pair if the key is not present, splitting nodes as needed.
+        If the key is present, its value is overwritten only if `overwrite` is True.
+
+        Parameters
+        ----------
+        key: K - The key to insert.
+        value: V - The value to insert.
+        overwrite: bool - Whether to overwrite the value of a key that is already present.
+
+        Returns
+        -------
+        Tuple[bool, V] - True if the key was newly added (False otherwise),
+            and the value the key had before the call (or `value`, if the key is new).
+        """
+        leaf, path = self._find_path(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            old_value = leaf.values[i]
+            if overwrite:
+                leaf.values[i] = value
+            return False, old_value
+        leaf.keys.insert(i, key)
+        leaf.values.insert(i, value)
+        self._count += 1
+        if len(leaf.keys) > self._max:
+            self._split(leaf, path)
+        return True, value
+
+    def _split(self, leaf: _BTreeLeaf[K, V], path: List[Tuple[_BTreeBranch[K], int]]):
+        """
+        Split an overfull leaf in half, then split each overfull ancestor in turn.
+        If the root splits, the tree grows a level.
+
+        Parameters
+        ----------
+        leaf: _BTreeLeaf[K, V] - The overfull leaf.
+        path: List[Tuple[_BTreeBranch[K], int]] - The path to the leaf; see `_find_path`.
+
+        Returns
+        -------
+        None
+        """
+        half = len(leaf.keys) // 2
+        new_node = _BTreeLeaf(leaf.keys[half:], leaf.values[half:])
+        del leaf.keys[half:]
+        del leaf.values[half:]
+        # link the new leaf in after the old one
+        new_node.prev = leaf
+        new_node.next = leaf.next
+        if leaf.next is not None:
+            leaf.next.prev = new_node
+        leaf.next = new_node
+        separator = new_node.keys[0]
+        # push the separator and the new node up into the parent, as far as needed
+        while len(path) > 0:
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, new_node)
+            if len(parent.children) <= self._max:
+                return
+            # the parent is overfull too; the middle separator moves up
+            mid = len(parent.keys) // 2
+            separator = parent.keys[mid]
+            new_node = _BTreeBranch(parent.keys[mid + 1:], parent.children[mid + 1:])
+            del parent.keys[mid:]
+            del parent.children[mid + 1:]
+        # the root itself split
+        self._root = _BTreeBranch([separator], [self._root, new_node])
+        self._height += 1
+
+    def _remove(self, key: K) -> V:
+        """
+        Remove a key and return its value, merging or rebalancing nodes as needed.
+
+        Parameters
+        ----------
+        key: K - The key to remove.
+
+        Raises
+        ------
+        KeyError - If the key is not in the map.
+
+        Returns
+        -------
+        V - The value the key had.
+        """
+        leaf, path = self._find_path(key)
+        i = bisect_left(leaf.keys, key)
+        if i == len(leaf.keys) or leaf.keys[i] != key:
+            raise KeyError(key)
+        value = leaf.values[i]
+        del leaf.keys[i]
+        del leaf.values[i]
+        self._count -= 1
+        # the root is allowed to be less than half full
+        if len(path) > 0 and len(leaf.keys) < self._min:
+            self._fix_underflow(path)
+        return value
+
+    def _fix_underflow(self, path: List[Tuple[_BTreeBranch[K], int]]):
+        """
+        Fix an underfull leaf by borrowing from or merging with a sibling,
+        then fix each ancestor that becomes underfull in turn.
+        If the root is left with a single child, the tree shrinks a level.
+
+        Parameters
+        ----------
+        path: List[Tuple[_BTreeBranch[K], int]] - The path to the underfull leaf;
+            see `_find_path`.
+
+        Returns
+        -------
+        None
+        """
+        is_leaf = True
+        while len(path) > 0:
+            parent, i = path.pop()
+            if is_leaf:
+                self._rebalance_leaf(parent, i)
+            else:
+                self._rebalance_branch(parent, i)
+            if len(path) == 0:  # the parent is the root
+                if len(parent.children) == 1:
+                    self._root = parent.children[0]
+                    self._height -= 1
+                return
+            if len(parent.children) >= self._min:
+                return
+            is_leaf = False
+
+    def _rebalance_leaf(self, parent: _BTreeBranch[K], i: int):
+        """
+        Fix the underfull leaf `parent.children[i]`, by borrowing an entry from a sibling
+        that has entries to spare, or else by merging with a sibling.
+
+        Parameters
+        ----------
+        parent: _BTreeBranch[K] - The parent of the underfull leaf.
+        i: int - The index of the underfull leaf among the parent's children.
+
+        Returns
+        -------
+        None
+        """
+        node = parent.children[i]
+        left = parent.children[i - 1] if i > 0 else None
+        right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+        if left is not None and len(left.keys) > self._min:
+            node.keys.insert(0, left.keys.pop())
+            node.values.insert(0, left.values.pop())
+            parent.keys[i - 1] = node.keys[0]
+        elif right is not None and len(right.keys) > self._min:
+            node.keys.append(right.keys.pop(0))
+            node.values.append(right.values.pop(0))
+            parent.keys[i] = right.keys[0]
+        else:
+            if left is None:
+                # merge the right sibling into this one instead
+                left, node, i = node, right, i + 1
+            left.keys.extend(node.keys)
+            left.values.extend(node.values)
+            left.next = node.next
+            if node.next is not None:
+                node.next.prev = left
+            del parent.keys[i - 1]
+            del parent.children[i]
+
+    def _rebalance_branch(self, parent: _BTreeBranch[K], i: int):
+        """
+        Fix the underfull branch `parent.children[i]`, by rotating a child over from a sibling
+        that has children to spare, or else by merging with a sibling.
+
+        Parameters
+        ----------
+        parent: _BTreeBranch[K] - The parent of the underfull branch.
+        i: int - The index of the underfull branch among the parent's children.
+
+        Returns
+        -------
+        None
+        """
+        node = parent.children[i]
+        left = parent.children[i - 1] if i > 0 else None
+        right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+        if left is not None and len(left.children) > self._min:
+            # the separator comes down, and the left sibling's last key goes up in its place
+            node.keys.insert(0, parent.keys[i - 1])
+            node.children.insert(0, left.children.pop())
+            parent.keys[i - 1] = left.keys.pop()
+        elif right is not None and len(right.children) > self._min:
+            # the separator comes down, and the right sibling's first key goes up in its place
+            node.keys.append(parent.keys[i])
+            node.children.append(right.children.pop(0))
+            parent.keys[i] = right.keys.pop(0)
+        else:
+            if left is None:
+                # merge the right sibling into this one instead
+                left, node, i = node, right, i + 1
+            # the separator between the two comes down into the merged node
+            left.keys.append(parent.keys[i - 1])
+            left.keys.extend(node.keys)
+            left.children.extend(node.children)
+            del parent.keys[i - 1]
+            del parent.children[i]
+
+    def clear(self):
+        """
+        Empty all data from the BTreeMap.
+
+        Returns
+        -------
+        None
+        """
+        self._root = _BTreeLeaf([], [])
+        self._height = 0
+        self._count = 0
+
+    def get(self, key: K, default: V = None) -> V:
+        """
+        Return the value for key if key is in the map, else default.
+
+        Parameters
+        ----------
+        key: K - The key to search for and retrieve a value for.
+        default: V - The value to return if the key is not present.
+            None, by default.
+
+        Returns
+        -------
+        V - The value associated with the given key, or `default` if the key is not present.
+        """
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        return default
+
+    def pop(self, key: K, default: V = None) -> V:
+        """
+        If key is in the map, remove it and return its value, else return default.
+        If default is None and key is not in the map, a KeyError is raised.
+
+        Parameters
+        ----------
+        key: K - The key to search for and remove.
+        default: V - The value to return if the key is not present.
+            None, by default.
+
+        Raises
+        ------
+        KeyError - If the key is not in the map and default is None.
+
+        Returns
+        -------
+        V - The value associated with the given key, or `default` if the key is not present.
+        """
+        try:
+            return self._remove(key)
+        except KeyError:
+            if default is None:
+                raise
+            return default
+
+    def popitem(self) -> Tuple[K, V]:
+        """
+        Remove and return the (key, value) pair with the greatest key.
+        If the map is empty, calling popitem() raises a KeyError.
+
+        Raises
+        ------
+        KeyError - If the map is empty.
+
+        Returns
+        -------
+        Tuple[K, V] - The (key, value) pair that was removed from the map.
+        """
+        key, _ = self.last()
+        return key, self._remove(key)
+
+    def setdefault(self, key: K, default: V = None) -> V:
+        """
+        If key is in the map, return its value.
+        If not, insert key with a value of default and return default.
+
+        Parameters
+        ----------
+        key: K - The key to search for and retrieve a value for.
+        default: V - The value to insert and return if the key is not initially present.
+            None, by default.
+
+        Returns
+        -------
+        V - The value associated with the given key,
+            or `default` if the key is not initially present.
+        """
+        return self._insert(key, default, overwrite=False)[1]
+
+    def update(self, other: Union[Mapping[K, V], Iterable[Tuple[K, V]]], **kwargs):
+        """
+        Update the map with the key/value pairs from `other`, overwriting existing keys.
+        update() accepts either another Mapping object or an Iterable of key/value pairs
+        (as tuples or other iterables of length two). If keyword arguments are specified,
+        the map is then updated with those key/value pairs: `m.update(red=1, blue=2)`
+        Like `TreeMap.update`, a large batch is merged with the existing contents and the tree
+        is rebuilt in O(n + k), while a small one is inserted one pair at a time.
+
+        Parameters
+        ----------
+        other: Union[Mapping[K, V], Iterable[Tuple[K, V]]] -
+            A Mapping object or Iterable object to provide new key/value pairs
+        kwargs - Keyword arguments, e.g. `red=1`, in which case the key/value pair
+            `("red", 1)` would be written to the map.
+
+        Returns
+        -------
+        None
+        """
+        _update_pairs(self, self.items(), other, kwargs)
+
+    # same signature as TreeMap.irange
+    # pylint: disable=duplicate-code
+    def irange(self,
+               lo: Optional[K] = None,
+               hi: Optional[K] = None,
+               inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Generator[K, None, None]:
+        """
+        Iterate over the keys between `lo` and `hi`, from least to greatest
+        (or from greatest to least, if `reverse` is True).
+        Finding the start of the range takes O(log(n)), and the scan then runs along the
+        linked leaves, bisecting each leaf only to find where the range ends.
+
+        Parameters
+        ----------
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range, if present in the map. Default is `(True, True)`.
+        reverse: bool - If True, iterate in descending order. Default is False.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys in the range.
+        """
+        # pylint: enable=duplicate-code
+        lo_bisect = bisect_left if inclusive[0] else bisect_right
+        hi_bisect = bisect_right if inclusive[1] else bisect_left
+        if reverse:
+            leaf = self._last_leaf() if hi is None else self._find_leaf(hi)
+            stop = len(leaf.keys) if hi is None else hi_bisect(leaf.keys, hi)
+            while True:
+                start = 0 if lo is None else lo_bisect(leaf.keys, lo, 0, stop)
+                for i in range(stop - 1, start - 1, -1):
+                    yield leaf.keys[i]
+                if start > 0 or leaf.prev is None:
+                    return
+                leaf = leaf.prev
+                stop = len(leaf.keys)
+        leaf = self._first_leaf() if lo is None else self._find_leaf(lo)
+        start = 0 if lo is None else lo_bisect(leaf.keys, lo)
+        while True:
+            stop = len(leaf.keys) if hi is None else hi_bisect(leaf.keys, hi, start)
+            yield from leaf.keys[start:stop]
+            if stop < len(leaf.keys) or leaf.next is None:
+                return
+            leaf = leaf.next
+            start = 0
+
+    def first(self) -> Tuple[K, V]:
+        """
+        Get the (key, value) pair with the least key, without removing it.
+
+        Raises
+        ------
+        KeyError - If the map is empty.
+
+        Returns
+        -------
+        Tuple[K, V] - The (key, value) pair with the least key.
+        """
+        if self._count == 0:
+            raise KeyError("map is empty")
+        leaf = self._first_leaf()
+        return leaf.keys[0], leaf.values[0]
+
+    def last(self) -> Tuple[K, V]:
+        """
+        Get the (key, value) pair with the greatest key, without removing it.
+
+        Raises
+        ------
+        KeyError - If the map is empty.
+
+        Returns
+        -------
+        Tuple[K, V] - The (key, value) pair with the greatest key.
+        """
+        if self._count == 0:
+            raise KeyError("map is empty")
+        leaf = self._last_leaf()
+        return leaf.keys[-1], leaf.values[-1]
+
+    def items(self) -> "BTreeMapItemsView[K, V]":
+        """
+        Return a new view of the map’s items ((key, value) pairs), sorted by keys.
+
+        Returns
+        -------
+        BTreeMapItemsView[K, V] - A view of the (key, value) pairs, sorted by keys.
+        """
+        return BTreeMapItemsView(self)
+
+    def keys(self) -> "BTreeMapKeysView[K]":
+        """
+        Return a new view of the map's keys, sorted.
+
+        Returns
+        -------
+        BTreeMapKeysView[K] - A view of the keys, sorted.
+        """
+        return BTreeMapKeysView(self)
+
+    def values(self) -> "BTreeMapValuesView[V]":
+        """
+        Return a new view of the map’s values, sorted by their keys (which are not given here).
+
+        Returns
+        -------
+        BTreeMapValuesView[V] - A view of the values, sorted by their keys.
+        """
+        return BTreeMapValuesView(self)
+
+    def _iter_leaves(self, reverse: bool = False) -> Generator[_BTreeLeaf[K, V], None, None]:
+        """
+        Iterate over the leaves, following the links between them.
+
+        Parameters
+        ----------
+        reverse: bool - If True, go from the last leaf to the first. Default is False.
+
+        Returns
+        -------
+        Generator[_BTreeLeaf[K, V], None, None] - lazily generates the leaves in order.
+        """
+        if reverse:
+            leaf = self._last_leaf()
+            while leaf is not None:
+                yield leaf
+                leaf = leaf.prev
+        else:
+            leaf = self._first_leaf()
+            while leaf is not None:
+                yield leaf
+                leaf = leaf.next
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Check if a key is present in the map.
+
+        Parameters
+        ----------
+        key: K - The key to search for.
+
+        Returns
+        -------
+        bool - True if the key is in the map, False if not.
+        """
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        return i < len(leaf.keys) and leaf.keys[i] == key
+
+    # the same one-line __delitem__ and equality preamble as TreeMap's
+    # pylint: disable=duplicate-code
+    def __delitem__(self, key: K):
+        """
+        Remove the key and its value from the map.
+        Raises a KeyError if the key is not in the map.
+
+        Parameters
+        ----------
+        key: K - The key to search for and remove.
+
+        Raises
+        ------
+        KeyError - If the key is not in the map.
+
+        Returns
+        -------
+        None
+        """
+        self._remove(key)
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Check if the map is equal to another object.
+        The other object will not be considered equal if it is of any other class.
+        Both keys and values are compared using the `!=` operator.
+
+        Parameters
+        ----------
+        other: Any - The object to compare to.
+
+        Returns
+        -------
+        bool - True if `other` is also a BTreeMap and has the same key/value pairs,
+            False otherwise.
+        """
+        if not isinstance(other, self.__class__):
+            return False
+        # pylint: enable=duplicate-code
+        if len(self) != len(other):
+            return False
+        for (self_key, self_value), (other_key, other_value) in zip(self.items(), other.items()):
+            if self_key != other_key or self_value != other_value:
+                return False
+        return True
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Return the value associate with the given key.
+        Raises a KeyError if key is not in the map.
+
+        Parameters
+        ----------
+        key: K - The key to search for and retrieve a value for.
+
+        Raises
+        ------
+        KeyError - If the key is not in the map.
+
+        Returns
+        -------
+        V - The value associated with the given key.
+        """
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf.values[i]
+        raise KeyError(key)
+
+    def __setitem__(self, key: K, value: V):
+        """
+        Set the given key's value to the given value.
+        Can be used to overwrite the value of an existing key, or to insert a new key/value pair.
+
+        Parameters
+        ----------
+        key: K - The key where the value should be written.
+        value: V - The value to be written.
+
+        Returns
+        -------
+        None
+        """
+        self._insert(key, value, overwrite=True)
+
+    def __iter__(self) -> Generator[K, None, None]:
+        """
+        Iterate over the map, in order from least to greatest (by keys).
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys from least to greatest
+        """
+        for leaf in self._iter_leaves():
+            yield from leaf.keys
+
+    def __reversed__(self) -> Generator[K, None, None]:
+        """
+        Iterate over the map, in order from greatest to least (by keys).
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys from greatest to least
+        """
+        for leaf in self._iter_leaves(reverse=True):
+            yield from reversed(leaf.keys)
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in the map.
+
+        Returns
+        -------
+        int - The number of key/value pairs in the map.
+        """
+        return self._count
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the map.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the map.
+        """
+        return f"{self.__class__.__name__}(len={len(self)})"
+
+    __hash__ = None
+
+
+class BTreeMapKeysView(KeysView):
+    """
+    A lazy view of the keys of a BTreeMap, sorted.
+    Returned by `BTreeMap.keys`; iterates straight along the leaves.
+    """
+    # pylint: disable=protected-access
+    __slots__ = ()
+
+    def __iter__(self) -> Generator[K, None, None]:
+        """
+        Iterate over the keys, sorted.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys.
+        """
+        for leaf in self._mapping._iter_leaves():
+            yield from leaf.keys
+
+    def __reversed__(self) -> Generator[K, None, None]:
+        """
+        Iterate over the keys, in reverse order.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys, in reverse.
+        """
+        for leaf in self._mapping._iter_leaves(reverse=True):
+            yield from reversed(leaf.keys)
+
+
+class BTreeMapValuesView(ValuesView):
+    """
+    A lazy view of the values of a BTreeMap, sorted by their keys.
+    Returned by `BTreeMap.values`; iterates straight along the leaves.
+    """
+    # pylint: disable=protected-access
+    __slots__ = ()
+
+    def __iter__(self) -> Generator[V, None, None]:
+        """
+        Iterate over the values, sorted by their keys.
+
+        Returns
+        -------
+        Generator[V, None, None] - lazily generates the values.
+        """
+        for leaf in self._mapping._iter_leaves():
+            yield from leaf.values
+
+    def __reversed__(self) -> Generator[V, None, None]:
+        """
+        Iterate over the values, in reverse order of their keys.
+
+        Returns
+        -------
+        Generator[V, None, None] - lazily generates the values, in reverse.
+        """
+        for leaf in self._mapping._iter_leaves(reverse=True):
+            yield from reversed(leaf.values)
+
+
+class BTreeMapItemsView(ItemsView):
+    """
+    A lazy view of the (key, value) pairs of a BTreeMap, sorted by keys.
+    Returned by `BTreeMap.items`; iterates straight along the leaves.
+    """
+    # pylint: disable=protected-access
+    __slots__ = ()
+
+    def __iter__(self) -> Generator[Tuple[K, V], None, None]:
+        """
+        Iterate over the (key, value) pairs, sorted by keys.
+
+        Returns
+        -------
+        Generator[Tuple[K, V], None, None] - lazily generates the pairs.
+        """
+        for leaf in self._mapping._iter_leaves():
+            yield from zip(leaf.keys, leaf.values)
+
+    def __reversed__(self) -> Generator[Tuple[K, V], None, None]:
+        """
+        Iterate over the (key, value) pairs, in reverse order of keys.
+
+        Returns
+        -------
+        Generator[Tuple[K, V], None, None] - lazily generates the pairs, in reverse.
+        """
+        for leaf in self._mapping._iter_leaves(reverse=True):
+            yield from zip(reversed(leaf.keys), reversed(leaf.values))
@@ -0,0 +1,267 @@
+import asyncio
+import queue
+from operator import itemgetter
+from typing import Any, Callable, Generic, List, TypeVar
+
+from .heap import Heap
+
+
+T = TypeVar("T")
+
+
+def _identity(item: T) -> T:
+    """
+    Key function for queues without a key. Giving the Heap a key (even this one) makes it store
+    a sequence number with each item, so equal items come out in the order they were put.
+
+    Parameters
+    ----------
+    item: T - an item.
+
+    Returns
+    -------
+    T - the same item.
+    """
+    return item
+
+
+class ConcurrentHeap(queue.Queue, Generic[T]):
+    """
+    Thread-safe priority queue: a `queue.Queue` whose items come out in Heap order.
+    Supports everything `queue.Queue` does (blocking `put`/`get` with timeouts, `task_done`/`join`,
+    and a capacity), with Heap's `key` and `reverse` options, plus batched gets.
+
+    The key function is called before the lock is taken, so expensive keys don't hold up
+    other threads. Equal items come out in the order they were put.
+
+    `T` represents the type of items being stored in the ConcurrentHeap.
+    """
+
+    def __init__(self,
+                 maxsize: int = 0,
+                 *,
+                 key: Callable[[T], Any] = None,
+                 reverse: bool = False):
+        """
+        Construct a ConcurrentHeap.
+
+        Parameters
+        ----------
+        maxsize: int - the most items the queue will hold; `put` blocks while it is full.
+            If 0 or less (default), the queue has no limit.
+            Note that this is a capacity, unlike `Heap`'s `maxsize`, which discards items.
+        key: Callable[(T) -> Any] - function to determine an element's ordering value.
+            See `Heap`.
+        reverse: bool - if "high" values should be greater priority in the queue. See `Heap`.
+        """
+        self._key = key
+        self._reverse = reverse
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int):
+        """
+        Create the storage for the queue. Called by `queue.Queue.__init__`.
+
+        Parameters
+        ----------
+        maxsize: int - the queue's capacity (handled by `queue.Queue`).
+
+        Returns
+        -------
+        None
+        """
+        # with a key, items are stored as (key, item) pairs so the key is only computed in `put`
+        self.queue = Heap(key=_identity if self._key is None else itemgetter(0),
+                          reverse=self._reverse)
+
+    def _qsize(self) -> int:
+        """
+        Get the number of items in the queue. Called by `queue.Queue` with the lock held.
+
+        Returns
+        -------
+        int - number of items in the queue.
+        """
+        return len(self.queue)
+
+    def _put(self, item: Any):
+        """
+        Store an item. Called by `queue.Queue.put` with the lock held.
+
+        Parameters
+        ----------
+        item: Any - the item, or its (key, item) pair if the queue has a key.
+
+        Returns
+        -------
+        None
+        """
+        self.queue.add(item)
+
+    def _get(self) -> T:
+        """
+        Remove the next item. Called by `queue.Queue.get` with the lock held.
+
+        Returns
+        -------
+        T - the next item.
+        """
+        entry = self.queue.pop()
+        return entry if self._key is None else entry[1]
+
+    def put(self, item: T, block: bool = True, timeout: float = None):
+        """
+        Put an item into the queue. See `queue.Queue.put`.
+
+        Parameters
+        ----------
+        item: T - item to add.
+        block: bool - whether to wait for a free slot if the queue is full.
+        timeout: float (optional) - the most seconds to wait, if `block` is `True`.
+            If `None` (default), waits as long as it takes.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        queue.Full - the queue stayed full (only if `block` is `False` or `timeout` is given).
+        """
+        if self._key is not None:
+            # computed before the lock is taken
+            item = (self._key(item), item)
+        super().put(item, block, timeout)
+
+    def get_many(self, max_items: int, block: bool = True, timeout: float = None) -> List[T]:
+        """
+        Remove and return up to `max_items` items, in priority order.
+        Waits (like `get`) only for the first item; the rest are whatever is available
+        immediately afterward. Each item still needs its own call to `task_done`.
+
+        Parameters
+        ----------
+        max_items: int - the most items to return. Must be at least 1.
+        block: bool - whether to wait for an item if the queue is empty.
+        timeout: float (optional) - the most seconds to wait, if `block` is `True`.
+            If `None` (default), waits as long as it takes.
+
+        Returns
+        -------
+        List[T] - between 1 and `max_items` items.
+
+        Raises
+        ------
+        ValueError - `max_items` is less than 1.
+        queue.Empty - no item became available (only if `block` is `False` or `timeout` is given).
+        """
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        items = [self.get(block, timeout)]
+        if max_items > 1:
+            with self.mutex:
+                rest = self.queue.pop_many(max_items - 1)
+                if len(rest) > 0:
+                    self.not_full.notify(len(rest))
+            if self._key is not None:
+                rest = [entry[1] for entry in rest]
+            items.extend(rest)
+        return items
+
+
+class AsyncHeap(asyncio.Queue, Generic[T]):
+    """
+    Priority queue for coroutines: an `asyncio.Queue` whose items come out in Heap order.
+    Supports everything `asyncio.Queue` does (awaitable `put`/`get`, `task_done`/`join`,
+    and a capacity), with Heap's `key` and `reverse` options, plus batched gets.
+    Like `asyncio.Queue`, it is not thread-safe.
+
+    Equal items come out in the order they were put.
+
+    `T` represents the type of items being stored in the AsyncHeap.
+    """
+
+    def __init__(self,
+                 maxsize: int = 0,
+                 *,
+                 key: Callable[[T], Any] = None,
+                 reverse: bool = False):
+        """
+        Construct an AsyncHeap.
+
+        Parameters
+        ----------
+        maxsize: int - the most items the queue will hold; `put` waits while it is full.
+            If 0 or less (default), the queue has no limit.
+            Note that this is a capacity, unlike `Heap`'s `maxsize`, which discards items.
+        key: Callable[(T) -> Any] - function to determine an element's ordering value.
+            See `Heap`.
+        reverse: bool - if "high" values should be greater priority in the queue. See `Heap`.
+        """
+        self._key = key
+        self._reverse = reverse
+        super().__init__(maxsize)
+
+    def _init(self, maxsize: int):
+        """
+        Create the storage for the queue. Called by `asyncio.Queue.__init__`.
+
+        Parameters
+        ----------
+        maxsize: int - the queue's capacity (handled by `asyncio.Queue`).
+
+        Returns
+        -------
+        None
+        """
+        self._queue = Heap(key=_identity if self._key is None else self._key,
+                           reverse=self._reverse)
+
+    def _put(self, item: T):
+        """
+        Store an item. Called by `asyncio.Queue.put_nowait`.
+
+        Parameters
+        ----------
+        item: T - item to add.
+
+        Returns
+        -------
+        None
+        """
+        self._queue.add(item)
+
+    def _get(self) -> T:
+        """
+        Remove the next item. Called by `asyncio.Queue.get_nowait`.
+
+        Returns
+        -------
+        T - the next item.
+        """
+        return self._queue.pop()
+
+    async def get_many(self, max_items: int) -> List[T]:
+        """
+        Remove and return up to `max_items` items, in priority order.
+        Waits (like `get`) only for the first item; the rest are whatever is available
+        immediately afterward. Each item still needs its own call to `task_done`.
+
+        Parameters
+        ----------
+        max_items: int - the most items to return. Must be at least 1.
+
+        Returns
+        -------
+        List[T] - between 1 and `max_items` items.
+
+        Raises
+        ------
+        ValueError - `max_items` is less than 1.
+        """
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        items = [await self.get()]
+        while len(items) < max_items and not self.empty():
+            items.append(self.get_nowait())
+        return items
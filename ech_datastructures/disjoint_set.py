@@ -0,0 +1,302 @@
+from array import array
+from typing import Dict, Generic, Hashable, Iterable, Iterator, List, Tuple, TypeVar
+
+
+T = TypeVar("T", bound=Hashable)
+
+
+class DisjointSet(Generic[T]):
+    """
+    Disjoint-set forest (AKA union-find): keeps track of which items have been joined together,
+    directly or through a chain of other items, into the same group ("component").
+    `union`, `find`, and `connected` take nearly O(1) amortized time
+    (O(α(n)), where α is the very slowly growing inverse Ackermann function).
+
+    Each item is given a dense integer id when it is first seen, and the forest itself is kept
+    in two `array.array` buffers indexed by those ids (parent ids and ranks), rather than in
+    Python objects, so each item takes roughly 9 bytes of forest plus its entry in the id `dict`.
+    Trees are joined by rank and flattened by path halving as they are searched.
+
+    `T` represents the type of items, which must be hashable.
+    """
+    __slots__ = "_ids", "_items", "_parent", "_rank", "_n_components"
+
+    def __init__(self, items: Iterable[T] = None):
+        """
+        Construct a DisjointSet.
+
+        Parameters
+        ----------
+        items: Iterable[T] (optional) - initial items, each in a component of its own.
+            If `None` (default), the DisjointSet starts with no contents.
+        """
+        self._ids: Dict[T, int] = {}
+        self._items: List[T] = []
+        self._parent = array("q")
+        # ranks are at most log2(n), so a byte is plenty
+        self._rank = array("B")
+        self._n_components = 0
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def _id(self, item: T) -> int:
+        """
+        Get the id of an item, adding it as a new component if it hasn't been seen before.
+
+        Parameters
+        ----------
+        item: T - the item to look up.
+
+        Returns
+        -------
+        int - the item's id.
+        """
+        ident = self._ids.get(item)
+        if ident is None:
+            ident = len(self._items)
+            self._ids[item] = ident
+            self._items.append(item)
+            self._parent.append(ident)
+            self._rank.append(0)
+            self._n_components += 1
+        return ident
+
+    def _find(self, ident: int) -> int:
+        """
+        Find the root of the tree containing an id,
+        pointing every other node on the way at its grandparent (path halving).
+
+        Parameters
+        ----------
+        ident: int - the id to look up.
+
+        Returns
+        -------
+        int - the id of the root.
+        """
+        parent = self._parent
+        while parent[ident] != ident:
+            parent[ident] = parent[parent[ident]]
+            ident = parent[ident]
+        return ident
+
+    def _link(self, root_a: int, root_b: int) -> bool:
+        """
+        Join the trees with the given roots, hanging the lower-ranked root under the other.
+
+        Parameters
+        ----------
+        root_a: int - the root of one tree.
+        root_b: int - the root of the other tree.
+
+        Returns
+        -------
+        bool - True if the trees were joined, False if they were already the same tree.
+        """
+        if root_a == root_b:
+            return False
+        rank = self._rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+        self._n_components -= 1
+        return True
+
+    @property
+    def n_components(self) -> int:
+        """
+        The number of components (disjoint groups of items).
+        """
+        return self._n_components
+
+    def add(self, item: T):
+        """
+        Add an item in a component of its own.
+        Does nothing if the item is already in the DisjointSet.
+
+        Parameters
+        ----------
+        item: T - the item to add.
+
+        Returns
+        -------
+        None
+        """
+        self._id(item)
+
+    def find(self, item: T) -> T:
+        """
+        Find the representative of an item's component.
+        Two items are in the same component exactly when they have the same representative,
+        but the representative may change when the component is joined with another.
+
+        Parameters
+        ----------
+        item: T - the item to look up.
+
+        Raises
+        ------
+        KeyError - If the item is not in the DisjointSet.
+
+        Returns
+        -------
+        T - the representative item of the component.
+        """
+        return self._items[self._find(self._ids[item])]
+
+    def connected(self, item_a: T, item_b: T) -> bool:
+        """
+        Check if two items are in the same component.
+
+        Parameters
+        ----------
+        item_a: T - one item.
+        item_b: T - the other item.
+
+        Raises
+        ------
+        KeyError - If either item is not in the DisjointSet.
+
+        Returns
+        -------
+        bool - True if the items are in the same component, False if not.
+        """
+        return self._find(self._ids[item_a]) == self._find(self._ids[item_b])
+
+    def union(self, item_a: T, item_b: T) -> bool:
+        """
+        Join the components of two items. Items not yet in the DisjointSet are added first.
+
+        Parameters
+        ----------
+        item_a: T - one item.
+        item_b: T - the other item.
+
+        Returns
+        -------
+        bool - True if two components were joined, False if the items were already connected.
+        """
+        return self._link(self._find(self._id(item_a)), self._find(self._id(item_b)))
+
+    def union_many(self, pairs: Iterable[Tuple[T, T]]) -> int:
+        """
+        Join the components of each pair of items, like calling `union` for each pair.
+        Items not yet in the DisjointSet are added first.
+        The lookups, path halving, and linking are done inline rather than through method calls,
+        which saves some overhead when there are many pairs (e.g. the edges of a graph).
+
+        Parameters
+        ----------
+        pairs: Iterable[Tuple[T, T]] - the pairs of items to join.
+
+        Returns
+        -------
+        int - the number of joins made, i.e. how much the number of components went down
+            (not counting components added for new items).
+        """
+        ids, parent, rank = self._ids, self._parent, self._rank
+        n_joined = 0
+        for item_a, item_b in pairs:
+            root_a = ids.get(item_a)
+            if root_a is None:
+                root_a = self._id(item_a)
+            root_b = ids.get(item_b)
+            if root_b is None:
+                root_b = self._id(item_b)
+            while parent[root_a] != root_a:
+                parent[root_a] = parent[parent[root_a]]
+                root_a = parent[root_a]
+            while parent[root_b] != root_b:
+                parent[root_b] = parent[parent[root_b]]
+                root_b = parent[root_b]
+            if root_a == root_b:
+                continue
+            if rank[root_a] < rank[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            if rank[root_a] == rank[root_b]:
+                rank[root_a] += 1
+            n_joined += 1
+        self._n_components -= n_joined
+        return n_joined
+
+    def components(self) -> List[List[T]]:
+        """
+        Group all the items by component, in O(n) time.
+
+        Returns
+        -------
+        List[List[T]] - one list per component. Components are in the order their first items
+            were added, and each component's items are in the order they were added.
+        """
+        groups: Dict[int, List[T]] = {}
+        for ident, item in enumerate(self._items):
+            root = self._find(ident)
+            group = groups.get(root)
+            if group is None:
+                groups[root] = [item]
+            else:
+                group.append(item)
+        return list(groups.values())
+
+    def clear(self):
+        """
+        Empty all data from the DisjointSet, releasing its buffers.
+
+        Returns
+        -------
+        None
+        """
+        self._ids = {}
+        self._items = []
+        self._parent = array("q")
+        self._rank = array("B")
+        self._n_components = 0
+
+    def __contains__(self, item: T) -> bool:
+        """
+        Check if an item is in the DisjointSet.
+
+        Parameters
+        ----------
+        item: T - the item to search for.
+
+        Returns
+        -------
+        bool - True if the item is in the DisjointSet, False if not.
+        """
+        return item in self._ids
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items, in the order they were added.
+
+        Returns
+        -------
+        Iterator[T] - an iterator over the items.
+        """
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in the DisjointSet (not the number of components).
+
+        Returns
+        -------
+        int - the number of items.
+        """
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the DisjointSet.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the DisjointSet.
+        """
+        return f"{self.__class__.__name__}(len={len(self)}, n_components={self._n_components})"
@@ -0,0 +1,799 @@
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, \
+    Tuple, TypeVar, Union
+
+from .heap import Heap
+
+
+T = TypeVar("T", bound=Hashable)
+Number = Union[int, float]
+
+# `_search` target meaning "search the whole graph"; `None` can be a node
+_NO_TARGET = object()
+
+
+class _GraphBase(ABC, Generic[T]):
+    """
+    Intended only as a "helper class" to Graph and FrozenGraph.
+    Holds the read-only queries and the search algorithms, which are written against
+    internal node "handles" so they can run on either representation:
+    Graph uses the nodes themselves as handles, and FrozenGraph uses dense integer ids.
+    Subclasses provide `_handle`, `_node`, `_handles`, and `_edges`.
+    """
+    __slots__ = ("_directed",)
+
+    def __init__(self, directed: bool):
+        """
+        Parameters
+        ----------
+        directed: bool - whether edges go only one way.
+        """
+        self._directed = directed
+
+    @abstractmethod
+    def _handle(self, node: T) -> Any:
+        """
+        Get the handle of a node.
+
+        Parameters
+        ----------
+        node: T - the node to look up.
+
+        Raises
+        ------
+        KeyError - If the node is not in the graph.
+
+        Returns
+        -------
+        Any - the node's handle.
+        """
+
+    @abstractmethod
+    def _node(self, handle: Any) -> T:
+        """
+        Get the node for a handle.
+
+        Parameters
+        ----------
+        handle: Any - the node's handle.
+
+        Returns
+        -------
+        T - the node.
+        """
+
+    @abstractmethod
+    def _handles(self) -> Iterable[Any]:
+        """
+        Get the handles of all the nodes, in the order the nodes were added.
+
+        Returns
+        -------
+        Iterable[Any] - the handles.
+        """
+
+    @abstractmethod
+    def _edges(self, handle: Any) -> Iterable[Tuple[Any, Number]]:
+        """
+        Get the edges leaving a node.
+
+        Parameters
+        ----------
+        handle: Any - the node's handle.
+
+        Returns
+        -------
+        Iterable[Tuple[Any, Number]] - the (handle, weight) of each neighbor.
+        """
+
+    def _search(self,
+                source: Any,
+                target: Any = _NO_TARGET,
+                heuristic: Callable[[T], Number] = None
+                ) -> Tuple[Dict[Any, Number], Dict[Any, Any]]:
+        """
+        Dijkstra's algorithm, or A* if there is a heuristic, on a Heap with lazy deletion:
+        instead of lowering a node's priority, a new entry is added and stale entries are
+        skipped when they are popped.
+        A* breaks ties between equal estimates in favor of the node with the smaller heuristic
+        (i.e. the one furthest along), which on graphs with many equal-length paths, like grids,
+        avoids exploring every one of them.
+
+        Parameters
+        ----------
+        source: Any - the handle of the node to start from.
+        target: Any (optional) - the handle of the node to stop at.
+            If not given, the search reaches every node it can.
+        heuristic: Callable[[T], Number] (optional) - estimate of each node's distance to the
+            target, which must never overestimate and must be consistent.
+
+        Raises
+        ------
+        ValueError - If an edge with a negative weight is reached.
+
+        Returns
+        -------
+        Tuple[Dict[Any, Number], Dict[Any, Any]] - the distance to each node reached, and each
+            node's predecessor on its shortest path. If the search stopped at `target`,
+            the distances of nodes other than `target` may not be final.
+        """
+        dist: Dict[Any, Number] = {source: 0}
+        pred: Dict[Any, Any] = {}
+        done = set()
+        tiebreak = count(1)  # so that handles are never compared
+        estimate = 0 if heuristic is None else heuristic(self._node(source))
+        heap = Heap([(estimate, estimate, 0, source)])
+        while not heap.is_empty():
+            handle = heap.pop()[3]
+            if handle in done:
+                continue  # a stale entry
+            if handle == target:
+                break
+            done.add(handle)
+            base = dist[handle]
+            for neighbor, weight in self._edges(handle):
+                if weight < 0:
+                    raise ValueError("shortest paths need non-negative edge weights")
+                new_dist = base + weight
+                if neighbor not in dist or new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    pred[neighbor] = handle
+                    estimate = 0 if heuristic is None else heuristic(self._node(neighbor))
+                    heap.add((new_dist + estimate, estimate, next(tiebreak), neighbor))
+        return dist, pred
+
+    @property
+    def directed(self) -> bool:
+        """
+        Whether edges go only one way.
+        """
+        return self._directed
+
+    def neighbors(self, node: T) -> List[Tuple[T, Number]]:
+        """
+        Get the edges leaving a node (for an undirected graph, all the node's edges).
+
+        Parameters
+        ----------
+        node: T - the node to look up.
+
+        Raises
+        ------
+        KeyError - If the node is not in the graph.
+
+        Returns
+        -------
+        List[Tuple[T, Number]] - the (node, weight) of each neighbor.
+        """
+        return [(self._node(neighbor), weight)
+                for neighbor, weight in self._edges(self._handle(node))]
+
+    def bfs(self, source: T) -> Dict[T, int]:
+        """
+        Breadth-first search, ignoring weights, in O(V + E) time.
+        A plain FIFO queue gives the right order here, so no Heap is needed.
+
+        Parameters
+        ----------
+        source: T - the node to start from.
+
+        Raises
+        ------
+        KeyError - If `source` is not in the graph.
+
+        Returns
+        -------
+        Dict[T, int] - the number of edges on the shortest path to each node that can be
+            reached from `source`, in the order the nodes were reached.
+        """
+        start = self._handle(source)
+        hops = {start: 0}
+        queue = deque([start])
+        while len(queue) > 0:
+            handle = queue.popleft()
+            next_hops = hops[handle] + 1
+            for neighbor, _ in self._edges(handle):
+                if neighbor not in hops:
+                    hops[neighbor] = next_hops
+                    queue.append(neighbor)
+        return {self._node(handle): n for handle, n in hops.items()}
+
+    def dijkstra(self, source: T) -> Dict[T, Number]:
+        """
+        Find the length of the shortest path from `source` to every node it can reach,
+        with Dijkstra's algorithm, in O(E log E) time.
+
+        Parameters
+        ----------
+        source: T - the node to start from.
+
+        Raises
+        ------
+        KeyError - If `source` is not in the graph.
+        ValueError - If an edge with a negative weight is reached.
+
+        Returns
+        -------
+        Dict[T, Number] - the distance to each node that can be reached from `source`.
+        """
+        dist, _ = self._search(self._handle(source))
+        return {self._node(handle): d for handle, d in dist.items()}
+
+    def shortest_path(self,
+                      source: T,
+                      target: T,
+                      heuristic: Callable[[T], Number] = None) -> Tuple[Number, List[T]]:
+        """
+        Find a shortest path between two nodes, stopping as soon as `target` is reached.
+        Uses A* if a heuristic is given, otherwise Dijkstra's algorithm.
+
+        Parameters
+        ----------
+        source: T - the node to start from.
+        target: T - the node to find a path to.
+        heuristic: Callable[[T], Number] (optional) - A* heuristic: a lower bound on each node's
+            distance to `target` (e.g. the straight-line distance on a map). It must be
+            consistent: for each edge (u, v), `heuristic(u) <= weight + heuristic(v)`.
+            If `None` (default), Dijkstra's algorithm is used.
+
+        Raises
+        ------
+        KeyError - If `source` or `target` is not in the graph.
+        ValueError - If there is no path from `source` to `target`,
+            or an edge with a negative weight is reached.
+
+        Returns
+        -------
+        Tuple[Number, List[T]] - the length of the path, and the nodes along it,
+            from `source` to `target` inclusive.
+        """
+        start, goal = self._handle(source), self._handle(target)
+        dist, pred = self._search(start, goal, heuristic)
+        if goal not in dist:
+            raise ValueError(f"there is no path from {source!r} to {target!r}")
+        path = [goal]
+        while path[-1] != start:
+            path.append(pred[path[-1]])
+        path.reverse()
+        return dist[goal], [self._node(handle) for handle in path]
+
+    def minimum_spanning_tree(self) -> List[Tuple[T, T, Number]]:
+        """
+        Find a minimum spanning tree with Prim's algorithm, in O(E log E) time.
+        If the graph is not connected, this is a minimum spanning forest: one tree per component.
+
+        Raises
+        ------
+        ValueError - If the graph is directed.
+
+        Returns
+        -------
+        List[Tuple[T, T, Number]] - the (node, node, weight) of each edge in the tree,
+            in the order they were chosen.
+        """
+        if self._directed:
+            raise ValueError("minimum spanning trees are only defined for undirected graphs")
+        visited = set()
+        tree = []
+        tiebreak = count()
+        for root in self._handles():
+            if root in visited:
+                continue
+            visited.add(root)
+            heap = Heap([(weight, next(tiebreak), root, neighbor)
+                         for neighbor, weight in self._edges(root)])
+            while not heap.is_empty():
+                weight, _, parent, handle = heap.pop()
+                if handle in visited:
+                    continue
+                visited.add(handle)
+                tree.append((self._node(parent), self._node(handle), weight))
+                for neighbor, next_weight in self._edges(handle):
+                    if neighbor not in visited:
+                        heap.add((next_weight, next(tiebreak), handle, neighbor))
+        return tree
+
+
+class Graph(_GraphBase[T]):
+    """
+    A graph, weighted or not, directed or not, kept as a dict of dicts:
+    each node maps to a dict from its neighbors to the weights of the edges to them.
+    Any hashable object can be a node. Unweighted edges have weight 1.
+    There is at most one edge from one node to another; adding it again replaces its weight.
+
+    For large graphs that are done changing, `freeze` makes a compact, read-only FrozenGraph
+    that runs the same algorithms over flat arrays.
+
+    `T` represents the type of nodes.
+    """
+    __slots__ = "_adj", "_n_edges"
+
+    def __init__(self, edges: Iterable[Tuple[Any, ...]] = None, *, directed: bool = False):
+        """
+        Construct a Graph.
+
+        Parameters
+        ----------
+        edges: Iterable[Tuple[Any, ...]] (optional) - initial edges, as (node, node) pairs
+            or (node, node, weight) triples. Nodes are added as needed.
+            If `None` (default), the Graph starts with no contents.
+        directed: bool - whether edges go only one way, from the first node to the second.
+        """
+        super().__init__(directed)
+        self._adj: Dict[T, Dict[T, Number]] = {}
+        self._n_edges = 0
+        if edges is not None:
+            for edge in edges:
+                self.add_edge(*edge)
+
+    def _handle(self, node: T) -> T:
+        """
+        Get the handle of a node. A Graph's nodes are their own handles.
+
+        Parameters
+        ----------
+        node: T - the node to look up.
+
+        Raises
+        ------
+        KeyError - If the node is not in the Graph.
+
+        Returns
+        -------
+        T - the node itself.
+        """
+        if node not in self._adj:
+            raise KeyError(node)
+        return node
+
+    def _node(self, handle: T) -> T:
+        """
+        Get the node for a handle. A Graph's nodes are their own handles.
+
+        Parameters
+        ----------
+        handle: T - the node's handle.
+
+        Returns
+        -------
+        T - the node, which is `handle` itself.
+        """
+        return handle
+
+    def _handles(self) -> Iterable[T]:
+        """
+        Get the handles of all the nodes, in the order the nodes were added.
+
+        Returns
+        -------
+        Iterable[T] - the nodes themselves.
+        """
+        return self._adj
+
+    def _edges(self, handle: T) -> Iterable[Tuple[T, Number]]:
+        """
+        Get the edges leaving a node, straight from its dict of neighbors.
+
+        Parameters
+        ----------
+        handle: T - the node.
+
+        Returns
+        -------
+        Iterable[Tuple[T, Number]] - the (neighbor, weight) of each edge.
+        """
+        return self._adj[handle].items()
+
+    @property
+    def n_edges(self) -> int:
+        """
+        The number of edges. For an undirected graph, each edge counts once.
+        """
+        return self._n_edges
+
+    def add_node(self, node: T):
+        """
+        Add a node with no edges. Does nothing if the node is already in the Graph.
+
+        Parameters
+        ----------
+        node: T - the node to add.
+
+        Returns
+        -------
+        None
+        """
+        if node not in self._adj:
+            self._adj[node] = {}
+
+    def add_edge(self, node_a: T, node_b: T, weight: Number = 1):
+        """
+        Add an edge, adding its nodes if they are not already in the Graph.
+        If the edge is already in the Graph, its weight is replaced.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+        weight: Number - the weight of the edge. Defaults to 1.
+
+        Returns
+        -------
+        None
+        """
+        self.add_node(node_a)
+        self.add_node(node_b)
+        if node_b not in self._adj[node_a]:
+            self._n_edges += 1
+        self._adj[node_a][node_b] = weight
+        if not self._directed:
+            self._adj[node_b][node_a] = weight
+
+    def remove_edge(self, node_a: T, node_b: T):
+        """
+        Remove an edge. The nodes stay in the Graph.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+
+        Raises
+        ------
+        KeyError - If the edge is not in the Graph.
+
+        Returns
+        -------
+        None
+        """
+        if not self.has_edge(node_a, node_b):
+            raise KeyError((node_a, node_b))
+        del self._adj[node_a][node_b]
+        if not self._directed and node_a != node_b:
+            del self._adj[node_b][node_a]
+        self._n_edges -= 1
+
+    def remove_node(self, node: T):
+        """
+        Remove a node and all its edges.
+        For a directed graph, this has to check every node for edges into `node`,
+        so it takes O(V) time.
+
+        Parameters
+        ----------
+        node: T - the node to remove.
+
+        Raises
+        ------
+        KeyError - If the node is not in the Graph.
+
+        Returns
+        -------
+        None
+        """
+        edges = self._adj.pop(node)
+        self._n_edges -= len(edges)
+        if self._directed:
+            for other in self._adj.values():
+                if node in other:
+                    del other[node]
+                    self._n_edges -= 1
+        else:
+            for neighbor in edges:
+                if neighbor != node:
+                    del self._adj[neighbor][node]
+
+    def has_edge(self, node_a: T, node_b: T) -> bool:
+        """
+        Check if an edge is in the Graph.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+
+        Returns
+        -------
+        bool - True if the edge is in the Graph, False if not.
+        """
+        edges = self._adj.get(node_a)
+        return edges is not None and node_b in edges
+
+    def weight(self, node_a: T, node_b: T) -> Number:
+        """
+        Get the weight of an edge.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+
+        Raises
+        ------
+        KeyError - If the edge is not in the Graph.
+
+        Returns
+        -------
+        Number - the weight of the edge.
+        """
+        if not self.has_edge(node_a, node_b):
+            raise KeyError((node_a, node_b))
+        return self._adj[node_a][node_b]
+
+    def freeze(self) -> "FrozenGraph[T]":
+        """
+        Make a compact, read-only copy of the Graph in compressed sparse row form.
+        See `FrozenGraph`.
+
+        Returns
+        -------
+        FrozenGraph[T] - A read-only copy of the Graph.
+        """
+        return FrozenGraph(self)
+
+    def clear(self):
+        """
+        Remove all nodes and edges from the Graph.
+
+        Returns
+        -------
+        None
+        """
+        self._adj = {}
+        self._n_edges = 0
+
+    def __contains__(self, node: Any) -> bool:
+        """
+        Check if a node is in the Graph.
+
+        Parameters
+        ----------
+        node: Any - the node to search for.
+
+        Returns
+        -------
+        bool - True if the node is in the Graph, False if not.
+        """
+        return node in self._adj
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the nodes, in the order they were added.
+
+        Returns
+        -------
+        Iterator[T] - an iterator over the nodes.
+        """
+        return iter(self._adj)
+
+    def __len__(self) -> int:
+        """
+        Return the number of nodes in the Graph.
+
+        Returns
+        -------
+        int - the number of nodes.
+        """
+        return len(self._adj)
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the Graph.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the Graph.
+        """
+        return f"{self.__class__.__name__}(len={len(self)}, n_edges={self._n_edges}, " \
+               f"directed={self._directed})"
+
+
+class FrozenGraph(_GraphBase[T]):
+    """
+    A compact, read-only copy of a Graph, in compressed sparse row (CSR) form.
+    Create one with `Graph.freeze`. Supports the same queries and algorithms as Graph.
+
+    Nodes are numbered in the order they were added to the Graph, and all the edges are kept
+    in two flat arrays, grouped by the node they leave and sorted by the node they go to:
+    the ids of the nodes they go to, and their weights. A third array holds where each node's
+    group starts. So a node's neighbors are one contiguous slice, and the algorithms work
+    with integer ids rather than hashing the nodes themselves.
+    Weights are stored as floats. An undirected edge is stored once in each direction.
+
+    `T` represents the type of nodes.
+    """
+    __slots__ = "_nodes", "_ids", "_offsets", "_targets", "_weights", "_n_edges"
+
+    def __init__(self, graph: Graph[T]):
+        """
+        Pack a Graph into a FrozenGraph, in O(V + E log(max degree)) time.
+
+        Parameters
+        ----------
+        graph: Graph[T] - The Graph to copy.
+        """
+        # pylint: disable=protected-access
+        super().__init__(graph._directed)
+        self._nodes: List[T] = list(graph._adj)
+        self._ids: Dict[T, int] = {node: i for i, node in enumerate(self._nodes)}
+        self._offsets = array("q", [0])
+        self._targets = array("q")
+        self._weights = array("d")
+        for edges in graph._adj.values():
+            row = sorted((self._ids[neighbor], weight) for neighbor, weight in edges.items())
+            self._targets.extend(target for target, _ in row)
+            self._weights.extend(weight for _, weight in row)
+            self._offsets.append(len(self._targets))
+        self._n_edges = graph._n_edges
+
+    def _handle(self, node: T) -> int:
+        """
+        Get the handle of a node: its id, which is its position in the order nodes were added.
+
+        Parameters
+        ----------
+        node: T - the node to look up.
+
+        Raises
+        ------
+        KeyError - If the node is not in the FrozenGraph.
+
+        Returns
+        -------
+        int - the node's id.
+        """
+        return self._ids[node]
+
+    def _node(self, handle: int) -> T:
+        """
+        Get the node with the given id.
+
+        Parameters
+        ----------
+        handle: int - the node's id.
+
+        Returns
+        -------
+        T - the node.
+        """
+        return self._nodes[handle]
+
+    def _handles(self) -> Iterable[int]:
+        """
+        Get the ids of all the nodes, in the order the nodes were added.
+
+        Returns
+        -------
+        Iterable[int] - the ids, from 0 up.
+        """
+        return range(len(self._nodes))
+
+    def _edges(self, handle: int) -> Iterable[Tuple[int, float]]:
+        """
+        Get the edges leaving a node, from its slice of the edge arrays.
+
+        Parameters
+        ----------
+        handle: int - the node's id.
+
+        Returns
+        -------
+        Iterable[Tuple[int, float]] - the (neighbor id, weight) of each edge, by neighbor id.
+        """
+        start, stop = self._offsets[handle], self._offsets[handle + 1]
+        return zip(self._targets[start:stop], self._weights[start:stop])
+
+    def _find_edge(self, node_a: T, node_b: T) -> Optional[int]:
+        """
+        Find where an edge is stored, by binary search over the edges leaving `node_a`.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+
+        Returns
+        -------
+        Optional[int] - the edge's position in the arrays, or None if it is not in the graph.
+        """
+        ident_a, ident_b = self._ids.get(node_a), self._ids.get(node_b)
+        if ident_a is None or ident_b is None:
+            return None
+        stop = self._offsets[ident_a + 1]
+        i = bisect_left(self._targets, ident_b, self._offsets[ident_a], stop)
+        return i if i < stop and self._targets[i] == ident_b else None
+
+    @property
+    def n_edges(self) -> int:
+        """
+        The number of edges. For an undirected graph, each edge counts once.
+        """
+        return self._n_edges
+
+    def has_edge(self, node_a: T, node_b: T) -> bool:
+        """
+        Check if an edge is in the FrozenGraph, in O(log(degree)) time.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+
+        Returns
+        -------
+        bool - True if the edge is in the FrozenGraph, False if not.
+        """
+        return self._find_edge(node_a, node_b) is not None
+
+    def weight(self, node_a: T, node_b: T) -> float:
+        """
+        Get the weight of an edge, in O(log(degree)) time.
+
+        Parameters
+        ----------
+        node_a: T - where the edge starts (for a directed graph).
+        node_b: T - where the edge ends (for a directed graph).
+
+        Raises
+        ------
+        KeyError - If the edge is not in the FrozenGraph.
+
+        Returns
+        -------
+        float - the weight of the edge.
+        """
+        i = self._find_edge(node_a, node_b)
+        if i is None:
+            raise KeyError((node_a, node_b))
+        return self._weights[i]
+
+    def __contains__(self, node: Any) -> bool:
+        """
+        Check if a node is in the FrozenGraph.
+
+        Parameters
+        ----------
+        node: Any - the node to search for.
+
+        Returns
+        -------
+        bool - True if the node is in the FrozenGraph, False if not.
+        """
+        return node in self._ids
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the nodes, in the order they were added.
+
+        Returns
+        -------
+        Iterator[T] - an iterator over the nodes.
+        """
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        """
+        Return the number of nodes in the FrozenGraph.
+
+        Returns
+        -------
+        int - the number of nodes.
+        """
+        return len(self._nodes)
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the FrozenGraph.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the FrozenGraph.
+        """
+        return f"{self.__class__.__name__}(len={len(self)}, n_edges={self._n_edges}, " \
+               f"directed={self._directed})"
@@ -1,38 +1,165 @@
+# pylint: disable=too-many-lines
 import heapq
-from typing import Any, Callable, Generic, Iterable, List, TypeVar
+from collections.abc import Sequence as SequenceABC, Sized
+from itertools import count, islice
+from operator import itemgetter
+from typing import Any, Callable, Generator, Generic, Iterable, Iterator, List, Optional, TypeVar, \
+    Union
 
 
 T = TypeVar("T")
 
+# how a Heap stores its items in the backing array
+_RAW = 0  # the items themselves (no key, not reversed)
+_NEGATED = 1  # negated items (no key, reversed, only numbers seen so far)
+_KEYED = 2  # (key, sequence number, item) tuples; reversed keys are wrapped in _ReverseKey
+_NEG_KEYED = 3  # (negated key, sequence number, item) tuples (reversed, only numeric keys so far)
 
-class _HeapElem(Generic[T]):
+# exact types whose negation is exact and reverses their order (bool and int subclasses don't
+# round-trip through negation, so they are deliberately excluded)
+_NEGATABLE_TYPES = (int, float)
+
+# see `Heap.update`; roughly how many sift levels a push costs compared to
+# the per-element cost of re-heapifying the whole array
+_HEAPIFY_FACTOR = 4
+
+
+class _ReverseKey:
     """
     Helper class for Heap.
-    Stores a single value in a way that lets us use the `heapq` package.
+    Wraps a precomputed sort key so that it compares in the opposite order.
     """
-    __slots__ = "val", "key", "reverse"
+    __slots__ = ("key",)
 
-    def __init__(self,
-                 val: T,
-                 *,
-                 key: Callable[[T], Any],
-                 reverse: bool):
+    def __init__(self, key: Any):
         """
-        Construct a _HeapElem.
+        Construct a _ReverseKey.
         """
-        self.val = val
         self.key = key
-        self.reverse = reverse
 
-    def __lt__(self, other: "_HeapElem[T]") -> bool:
+    def __lt__(self, other: "_ReverseKey") -> bool:
         """
         Comparison function used by heapq to do sorting
         Returning `True` means `self` comes before `other`.
         """
-        natural = self.key(self.val) < self.key(other.val)
-        if self.reverse:
-            return not natural
-        return natural
+        return other.key < self.key
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Equality check used by tuple comparison to detect ties.
+        """
+        return self.key == other.key
+
+    __hash__ = None
+
+
+class _BinaryHeapOps:
+    """
+    Helper class for Heap.
+    Provides the functions of the `heapq` module that Heap uses, for binary heaps.
+    Heap stores this class instead of the module itself, which can't be copied.
+    """
+    __slots__ = ()
+    arity = 2
+    heapify = staticmethod(heapq.heapify)
+    heappush = staticmethod(heapq.heappush)
+    heappop = staticmethod(heapq.heappop)
+    heapreplace = staticmethod(heapq.heapreplace)
+    heappushpop = staticmethod(heapq.heappushpop)
+
+
+class _DaryHeapOps:
+    """
+    Helper class for Heap.
+    Provides the functions of the `heapq` module that Heap uses, for heaps where each node has
+    `arity` children instead of 2. Element `i`'s children are at `arity * i + 1` and up.
+    """
+    __slots__ = ("arity",)
+
+    def __init__(self, arity: int):
+        """
+        Construct a _DaryHeapOps.
+        """
+        self.arity = arity
+
+    def _sift_up(self, heap: List[Any], pos: int):
+        """
+        Move `heap[pos]` toward the root until its parent is not greater than it.
+        """
+        item = heap[pos]
+        while pos > 0:
+            parent_pos = (pos - 1) // self.arity
+            parent = heap[parent_pos]
+            if not item < parent:
+                break
+            heap[pos] = parent
+            pos = parent_pos
+        heap[pos] = item
+
+    def _sift_down(self, heap: List[Any], pos: int):
+        """
+        Move `heap[pos]` toward the leaves until none of its children are less than it.
+        """
+        end = len(heap)
+        item = heap[pos]
+        while True:
+            first_child = self.arity * pos + 1
+            if first_child >= end:
+                break
+            # find the least child
+            best = first_child
+            for child in range(first_child + 1, min(first_child + self.arity, end)):
+                if heap[child] < heap[best]:
+                    best = child
+            if not heap[best] < item:
+                break
+            heap[pos] = heap[best]
+            pos = best
+        heap[pos] = item
+
+    def heapify(self, heap: List[Any]):
+        """
+        See `heapq.heapify`.
+        """
+        for pos in reversed(range((len(heap) + self.arity - 2) // self.arity)):
+            self._sift_down(heap, pos)
+
+    def heappush(self, heap: List[Any], item: Any):
+        """
+        See `heapq.heappush`.
+        """
+        heap.append(item)
+        self._sift_up(heap, len(heap) - 1)
+
+    def heappop(self, heap: List[Any]) -> Any:
+        """
+        See `heapq.heappop`.
+        """
+        last = heap.pop()
+        if len(heap) == 0:
+            return last
+        top = heap[0]
+        heap[0] = last
+        self._sift_down(heap, 0)
+        return top
+
+    def heapreplace(self, heap: List[Any], item: Any) -> Any:
+        """
+        See `heapq.heapreplace`.
+        """
+        top = heap[0]
+        heap[0] = item
+        self._sift_down(heap, 0)
+        return top
+
+    def heappushpop(self, heap: List[Any], item: Any) -> Any:
+        """
+        See `heapq.heappushpop`.
+        """
+        if len(heap) > 0 and heap[0] < item:
+            item, heap[0] = heap[0], item
+            self._sift_down(heap, 0)
+        return item
 
 
 class Heap(Generic[T]):
@@ -46,14 +173,38 @@ class Heap(Generic[T]):
     `pop`, they come out sorted.
 
     `T` represents the type of items being stored in the Heap.
+
+    Each item's key is computed only once, when the item is added. Internally, each item is stored
+    as a `(key, sequence number, item)` tuple, so comparisons run at native speed,
+    ties are broken by insertion order, and the items themselves are never compared.
+    Two common cases skip the tuple entirely: with no `key` and no `reverse`, the items are stored
+    as-is, and with `reverse` but no `key`, int and float items are stored negated.
+    Similarly, a reversed Heap with a `key` stores int and float keys negated.
+    Storing anything else switches the Heap over to the general representation.
+    Without a `key`, equal items may come out in any order.
+
+    With `maxsize`, the Heap becomes a bounded "top-k" collection: once it is full, each new item
+    either replaces the top of the Heap, or is discarded if it would have been popped before it.
+    So a min-heap keeps the `maxsize` largest items it has seen, and a max-heap
+    (`reverse=True`) keeps the `maxsize` smallest. Among equal items, the earliest ones are kept,
+    which means that in a bounded Heap, equal items pop in reverse insertion order.
+
+    With `arity`, each node of the Heap has that many children instead of 2, which makes the Heap
+    shallower. The default binary Heap uses the `heapq` module's native implementation,
+    while other arities are implemented in Python, which is usually much slower in CPython.
+    See also PairingHeap and RadixHeap, for workloads with many merges and decrease-key
+    operations, or with monotone integer keys.
     """
-    __slots__ = "_data", "_key", "_reverse"
+    # pylint: disable=protected-access
+    __slots__ = "_data", "_key", "_reverse", "_counter", "_mode", "_maxsize", "_ops"
 
-    def __init__(self,
+    def __init__(self,  # pylint: disable=too-many-arguments
                  data: Iterable[T] = None,
                  *,
                  key: Callable[[T], Any] = None,
-                 reverse: bool = False):
+                 reverse: bool = False,
+                 maxsize: Optional[int] = None,
+                 arity: int = 2):
         """
         Construct a Heap.
 
@@ -62,36 +213,337 @@ class Heap(Generic[T]):
         data: Iterable[T] (optional) - initial values for the Heap to store.
             If `None` (default), the Heap starts with no contents.
         key: Callable[(T) -> Any] - function to determine an element's ordering value.
-            Returned values are compared using the "less-than" operator: `key(e1) < key(e2)`.
+            It is called once per element, when the element is added.
+            Returned values are compared using the "less-than" operator: `key(e1) < key(e2)`,
+            and ties are detected using `==`; tied elements come out in insertion order.
             If `None` (default), the elements are compared directly.
         reverse: bool - if "high" values should be greater priority in the Heap.
             If `False` (default), elements with lower key values are at the top of the Heap.
             If `True`, elements with higher key values are at the top of the Heap.
+        maxsize: Optional[int] - the most items the Heap will hold; see the class description.
+            If `None` (default), the Heap has no limit.
+        arity: int - the number of children of each node. Must be at least 2 (default).
+
+        Raises
+        ------
+        ValueError - `maxsize` is less than 1, or `arity` is less than 2.
         """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        self._ops = _BinaryHeapOps if arity == 2 else _DaryHeapOps(arity)
+        self._maxsize = maxsize
         # save provided sorting key, if any
+        self._key = key
         if key is None:
-            self._key = lambda x: x
+            self._mode = _NEGATED if reverse else _RAW
         else:
-            self._key = key
+            self._mode = _NEG_KEYED if reverse else _KEYED
         self._reverse = reverse
+        # tie-breaker for elements with equal keys
+        self._counter = self._counter_from(0)
         # save provided data, if any
-        if data is None:
-            self._data = []
+        self._data = []
+        if data is not None and maxsize is None:
+            self._append_all(data)
+            self._ops.heapify(self._data)
+        elif data is not None:
+            for item in data:
+                self._push_bounded(self._wrap(item))
+
+    def _counter_from(self, start: int) -> count:
+        """
+        Make the source of sequence numbers, which break ties between entries with equal keys.
+        Bounded Heaps count down, so that later entries are nearer the top and are discarded first.
+
+        Parameters
+        ----------
+        start: int - the first sequence number.
+
+        Returns
+        -------
+        count - iterator of sequence numbers.
+        """
+        return count(start, 1 if self._maxsize is None else -1)
+
+    def _append_all(self, items: Iterable[T]):
+        """
+        Append entries for the given items to the end of the backing array,
+        without restoring the heap property.
+        All the entries are made before any are appended, so if `key` raises,
+        the backing array is left as it was.
+
+        Parameters
+        ----------
+        items: Iterable[T] - items to be stored.
+
+        Returns
+        -------
+        None
+        """
+        if self._mode == _RAW:
+            entries = list(items)
         else:
-            self._data = [_HeapElem(x, key=self._key, reverse=self._reverse) for x in data]
-            heapq.heapify(self._data)
+            entries = []
+            for item in items:
+                mode = self._mode
+                entry = self._wrap(item)
+                if self._mode != mode:
+                    # `_wrap` converted the stored entries to the general representation,
+                    # so convert the pending ones too, and keep this entry's tie-breaker last
+                    entries = self._general_entries(entries, mode)
+                    entry = entry[0], next(self._counter), entry[2]
+                entries.append(entry)
+        self._data.extend(entries)
+
+    def _wrap(self, item: T) -> Any:
+        """
+        Compute an item's key and package it for storage in the backing array.
+        If the item doesn't fit the Heap's current representation, all the stored entries are
+        converted to the general representation first.
+
+        Parameters
+        ----------
+        item: T - item to be stored.
+
+        Returns
+        -------
+        Any - the entry to store.
+        """
+        if self._mode == _RAW:
+            return item
+        if self._mode == _NEGATED:
+            if type(item) in _NEGATABLE_TYPES:
+                return -item
+            self._generalize()
+        sort_key = item if self._key is None else self._key(item)
+        if self._mode == _NEG_KEYED:
+            if type(sort_key) in _NEGATABLE_TYPES:
+                return -sort_key, next(self._counter), item
+            self._generalize()
+        if self._reverse:
+            sort_key = _ReverseKey(sort_key)
+        return sort_key, next(self._counter), item
+
+    def _unwrap(self, entry: Any) -> T:
+        """
+        Recover the item from an entry of the backing array.
+
+        Parameters
+        ----------
+        entry: Any - entry from the backing array.
+
+        Returns
+        -------
+        T - the stored item.
+        """
+        if self._mode == _RAW:
+            return entry
+        if self._mode == _NEGATED:
+            return -entry
+        return entry[2]
+
+    def _general_entries(self, entries: List[Any], mode: int) -> List[Any]:
+        """
+        Convert entries from a negated representation to
+        `(_ReverseKey(key), sequence number, item)` tuples.
+        The converted entries are in the same order, but new sequence numbers (if needed)
+        may not respect the heap property.
+
+        Parameters
+        ----------
+        entries: List[Any] - the entries to convert.
+        mode: int - the representation they are in, `_NEGATED` or `_NEG_KEYED`.
+
+        Returns
+        -------
+        List[Any] - the converted entries.
+        """
+        if mode == _NEGATED:
+            return [(_ReverseKey(-entry), next(self._counter), -entry) for entry in entries]
+        return [(_ReverseKey(-neg_key), seq, item) for neg_key, seq, item in entries]
+
+    def _generalize(self):
+        """
+        Convert all stored entries from a negated representation to
+        `(_ReverseKey(key), sequence number, item)` tuples, modifying the backing array in place.
+
+        Returns
+        -------
+        None
+        """
+        self._data[:] = self._general_entries(self._data, self._mode)
+        self._ops.heapify(self._data)
+        self._mode = _KEYED
+
+    def _entries_from(self, other: "Heap[T]") -> List[Any]:
+        """
+        Get the entries of another Heap in the form used by this Heap, with new sequence numbers
+        that come after all of this Heap's and keep `other`'s ties in their original order.
+
+        Parameters
+        ----------
+        other: Heap[T] - the Heap whose entries are needed. It is not changed.
+
+        Returns
+        -------
+        List[Any] - entries to store in this Heap.
+
+        Raises
+        ------
+        ValueError - `other` has a different key or order than this Heap.
+        """
+        if other._key is not self._key or other._reverse != self._reverse:
+            raise ValueError("can only merge Heaps with the same key and order")
+        if other._mode == self._mode:
+            entries = other._data
+        else:
+            # only reversed Heaps can differ, when one has been generalized and the other hasn't
+            if self._mode != _KEYED:
+                self._generalize()
+            if other._mode == _KEYED:
+                entries = other._data
+            else:
+                entries = other._general_entries(other._data, other._mode)
+        if self._mode in (_RAW, _NEGATED):
+            return list(entries)
+        # sequence numbers run up in unbounded Heaps and down in bounded ones (see `_counter_from`)
+        step = 1 if self._maxsize is None else -1
+        other_step = 1 if other._maxsize is None else -1
+        base = next(self._counter)
+        last = base
+        rebased = []
+        for sort_key, seq, item in entries:
+            new_seq = base + step * other_step * seq
+            rebased.append((sort_key, new_seq, item))
+            if (new_seq - last) * step > 0:
+                last = new_seq
+        self._counter = self._counter_from(last + step)
+        return rebased
+
+    def _push_bounded(self, entry: Any):
+        """
+        Add an entry to a Heap that has a `maxsize`. If the Heap is full, the entry replaces
+        the top of the Heap if it comes after the top, and is discarded otherwise.
+
+        Parameters
+        ----------
+        entry: Any - entry to store.
+
+        Returns
+        -------
+        None
+        """
+        data = self._data
+        if len(data) < self._maxsize:
+            self._ops.heappush(data, entry)
+        elif self._mode in (_RAW, _NEGATED):
+            if data[0] < entry:
+                self._ops.heapreplace(data, entry)
+        # compare keys only, so that an equal key doesn't replace the earlier entry
+        elif data[0][0] < entry[0]:
+            self._ops.heapreplace(data, entry)
+
+    def _unwrap_all(self, entries: Iterable[Any]) -> List[T]:
+        """
+        Recover the items from several entries of the backing array.
+
+        Parameters
+        ----------
+        entries: Iterable[Any] - entries from the backing array.
+
+        Returns
+        -------
+        List[T] - the stored items, in the same order.
+        """
+        if self._mode == _RAW:
+            return list(entries)
+        if self._mode == _NEGATED:
+            return [-entry for entry in entries]
+        return [entry[2] for entry in entries]
+
+    def _iter_sorted_entries(self) -> Generator[Any, None, None]:
+        """
+        Walk the backing array best-first, without changing it.
+        A small heap of candidates holds the children of each entry yielded so far,
+        so the first k entries take O(k log k) time.
+
+        Returns
+        -------
+        Generator[Any, None, None] - the entries, in the order they would be popped.
+
+        Raises
+        ------
+        RuntimeError - the Heap changed size during iteration.
+        """
+        data = self._data
+        n = len(data)
+        if n == 0:
+            return
+        arity = self.arity
+        # (entry, position) pairs; positions are unique, so entries that are equal still compare
+        candidates = [(data[0], 0)]
+        while len(candidates) > 0:
+            if len(data) != n:
+                raise RuntimeError("Heap changed size during iteration")
+            entry, pos = heapq.heappop(candidates)
+            yield entry
+            first_child = arity * pos + 1
+            for child in range(first_child, min(first_child + arity, n)):
+                heapq.heappush(candidates, (data[child], child))
+
+    def _should_heapify(self, n_new: int) -> bool:
+        """
+        Decide whether adding `n_new` entries is faster by pushing them one at a time,
+        or by appending them all and re-heapifying.
+        Pushing costs up to O(log n) per entry, while re-heapifying costs O(n) in total.
+
+        Parameters
+        ----------
+        n_new: int - the number of entries to be added.
+
+        Returns
+        -------
+        bool - `True` if re-heapifying should be faster.
+        """
+        total = len(self._data) + n_new
+        return n_new * total.bit_length() >= _HEAPIFY_FACTOR * total
+
+    @property
+    def arity(self) -> int:
+        """
+        Get the number of children of each node of the Heap.
+
+        Returns
+        -------
+        int - the Heap's `arity`.
+        """
+        return self._ops.arity
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """
+        Get the most items the Heap will hold.
+
+        Returns
+        -------
+        Optional[int] - the Heap's `maxsize`, or `None` if it has no limit.
+        """
+        return self._maxsize
 
     @property
-    def data(self) -> List[T]:
+    def data(self) -> "HeapDataView[T]":
         """
         Get a view of the contents of the Heap. This view represents the raw backing array.
         See more: https://docs.python.org/3/library/heapq.html
+        Nothing is copied; the view reflects later changes to the Heap.
 
         Returns
         -------
-        List[T] - simple view of the contents of the Heap.
+        HeapDataView[T] - read-only view of the contents of the Heap.
         """
-        return [elem.val for elem in self._data]
+        return HeapDataView(self)
 
     def peek(self) -> T:
         """
@@ -106,9 +558,10 @@ class Heap(Generic[T]):
         IndexError - Heap was empty at the start of the operation; nothing to peek.
         """
         try:
-            return self._data[0].val
+            entry = self._data[0]
         except IndexError as e:
             raise IndexError("peek from empty Heap") from e
+        return self._unwrap(entry)
 
     def pop(self) -> T:
         """
@@ -123,13 +576,88 @@ class Heap(Generic[T]):
         IndexError - Heap was empty at the start of the operation; nothing to pop.
         """
         try:
-            return heapq.heappop(self._data).val
+            entry = self._ops.heappop(self._data)
         except IndexError as e:
             raise IndexError("pop from empty Heap") from e
+        return self._unwrap(entry)
+
+    def pop_many(self, m: int) -> List[T]:
+        """
+        Remove the next `m` items from the Heap and return them, in the order `pop` would.
+        If the Heap has fewer than `m` items, all of them are returned.
+        Popping most of the Heap sorts the backing array instead,
+        since a sorted array is still a valid heap.
+
+        Parameters
+        ----------
+        m: int - the most items to pop.
+
+        Returns
+        -------
+        List[T] - popped items.
+        """
+        data = self._data
+        m = max(0, min(m, len(data)))
+        if 2 * m >= len(data):
+            data.sort()
+            popped = data[:m]
+            del data[:m]
+        else:
+            pop = self._ops.heappop
+            popped = [pop(data) for _ in range(m)]
+        return self._unwrap_all(popped)
+
+    def drain(self) -> Generator[T, None, None]:
+        """
+        Pop items from the Heap one at a time until it is empty.
+        Items added during iteration are popped as well, in order.
+
+        Returns
+        -------
+        Generator[T, None, None] - popped items.
+        """
+        while len(self._data) > 0:
+            yield self._unwrap(self._ops.heappop(self._data))
+
+    def peek_k(self, k: int) -> List[T]:
+        """
+        Return the next `k` items from the Heap, in the order `pop` would, but leave the Heap
+        unchanged. If the Heap has fewer than `k` items, all of them are returned.
+        Takes O(k log k) time, regardless of the size of the Heap.
+
+        Parameters
+        ----------
+        k: int - the most items to return.
+
+        Returns
+        -------
+        List[T] - next items (still in the Heap).
+        """
+        return self._unwrap_all(islice(self._iter_sorted_entries(), max(0, k)))
+
+    def sorted_view(self) -> Generator[T, None, None]:
+        """
+        Iterate over the items of the Heap in the order `pop` would return them,
+        but leave the Heap unchanged. Getting the first k items takes O(k log k) time,
+        regardless of the size of the Heap.
+        The Heap must not be modified during iteration.
+
+        Returns
+        -------
+        Generator[T, None, None] - items of the Heap, in order.
+
+        Raises
+        ------
+        RuntimeError - the Heap changed size during iteration.
+        """
+        for entry in self._iter_sorted_entries():
+            yield self._unwrap(entry)
 
     def add(self, new_item: T):
         """
         Add a new item to the Heap.
+        If the Heap has a `maxsize` and is full, either the new item or the top of the Heap
+        is discarded, whichever would be popped first.
 
         Parameters
         ----------
@@ -139,7 +667,10 @@ class Heap(Generic[T]):
         -------
         None
         """
-        heapq.heappush(self._data, _HeapElem(new_item, key=self._key, reverse=self._reverse))
+        if self._maxsize is None:
+            self._ops.heappush(self._data, self._wrap(new_item))
+        else:
+            self._push_bounded(self._wrap(new_item))
 
     def add_pop(self, new_item: T) -> T:
         """
@@ -154,10 +685,8 @@ class Heap(Generic[T]):
         -------
         T - popped item.
         """
-        return heapq.heappushpop(
-            self._data,
-            _HeapElem(new_item, key=self._key, reverse=self._reverse)
-        ).val
+        entry = self._wrap(new_item)
+        return self._unwrap(self._ops.heappushpop(self._data, entry))
 
     def pop_add(self, new_item: T) -> T:
         """
@@ -176,17 +705,16 @@ class Heap(Generic[T]):
         ------
         IndexError - Heap was empty at the start of the operation; nothing to pop.
         """
-        try:
-            return heapq.heapreplace(
-                self._data,
-                _HeapElem(new_item, key=self._key, reverse=self._reverse)
-            ).val
-        except IndexError as e:
-            raise IndexError("pop_add from empty Heap") from e
+        if not self._data:
+            raise IndexError("pop_add from empty Heap")
+        entry = self._wrap(new_item)
+        return self._unwrap(self._ops.heapreplace(self._data, entry))
 
     def update(self, new_items: Iterable[T]):
         """
-        Add multiple items to the Heap by calling `Heap.add` for each.
+        Add multiple items to the Heap.
+        Small batches are added with `Heap.add`, in O(k log n) time. Batches that are large
+        compared to the Heap are appended and then the whole Heap is re-heapified, in O(n + k) time.
 
         Parameters
         ----------
@@ -196,8 +724,142 @@ class Heap(Generic[T]):
         -------
         None
         """
-        for item in new_items:
-            self.add(item)
+        if self._maxsize is not None:
+            for item in new_items:
+                self._push_bounded(self._wrap(item))
+            return
+        if not isinstance(new_items, Sized):
+            new_items = list(new_items)
+        if self._should_heapify(len(new_items)):
+            self._append_all(new_items)
+            self._ops.heapify(self._data)
+        else:
+            for item in new_items:
+                self.add(item)
+
+    def merge(self, other: "Heap[T]"):
+        """
+        Add all the items from another Heap to this Heap, in O(n + k) time at most.
+        `other` is left unchanged.
+
+        Parameters
+        ----------
+        other: Heap[T] - Heap whose items should be added.
+            It must have been made with the same `key` (the same object) and `reverse` as this Heap.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError - `other` has a different key or order than this Heap.
+        """
+        entries = self._entries_from(other)
+        if self._maxsize is not None:
+            for entry in entries:
+                self._push_bounded(entry)
+        elif self._should_heapify(len(entries)):
+            self._data.extend(entries)
+            self._ops.heapify(self._data)
+        else:
+            for entry in entries:
+                self._ops.heappush(self._data, entry)
+
+    def copy(self) -> "Heap[T]":
+        """
+        Make a shallow copy of the Heap.
+
+        Returns
+        -------
+        Heap[T] - a new Heap with the same items, key, order, maxsize, and arity.
+        """
+        result = self.__class__(key=self._key, reverse=self._reverse, maxsize=self._maxsize,
+                                arity=self.arity)
+        result._data = list(self._data)
+        result._mode = self._mode
+        # the copy's new items must tie-break after all the copied ones
+        result._counter = result._counter_from(next(self._counter))
+        return result
+
+    def __or__(self, other: "Heap[T]") -> "Heap[T]":
+        """
+        Combine two Heaps into a new Heap. See `Heap.merge`.
+
+        Parameters
+        ----------
+        other: Heap[T] - Heap whose items should be combined with this one's.
+
+        Returns
+        -------
+        Heap[T] - a new Heap with the items of both.
+
+        Raises
+        ------
+        ValueError - `other` has a different key or order than this Heap.
+        """
+        if not isinstance(other, Heap):
+            return NotImplemented
+        result = self.copy()
+        result.merge(other)
+        return result
+
+    def __ior__(self, other: "Heap[T]") -> "Heap[T]":
+        """
+        Add all the items from another Heap to this Heap. See `Heap.merge`.
+
+        Parameters
+        ----------
+        other: Heap[T] - Heap whose items should be added.
+
+        Returns
+        -------
+        Heap[T] - this Heap.
+
+        Raises
+        ------
+        ValueError - `other` has a different key or order than this Heap.
+        """
+        if not isinstance(other, Heap):
+            return NotImplemented
+        self.merge(other)
+        return self
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Check if an item equal to `item` is in the Heap, in O(n) time.
+
+        Parameters
+        ----------
+        item: Any - item to search for.
+
+        Returns
+        -------
+        bool - `True` if the item is in the Heap, `False` otherwise.
+        """
+        if self._mode == _RAW:
+            return item in self._data
+        if self._mode == _NEGATED:
+            if type(item) in _NEGATABLE_TYPES:
+                return -item in self._data
+            return any(-entry == item for entry in self._data)
+        return item in map(itemgetter(2), self._data)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items of the Heap, in the order of the backing array (not sorted).
+        Use `sorted_view` to iterate in sorted order.
+        The Heap must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[T] - items of the Heap.
+        """
+        if self._mode == _RAW:
+            return iter(self._data)
+        if self._mode == _NEGATED:
+            return (-entry for entry in self._data)
+        return map(itemgetter(2), self._data)
 
     def __len__(self) -> int:
         """
@@ -228,3 +890,118 @@ class Heap(Generic[T]):
         None
         """
         self._data.clear()
+
+
+class HeapDataView(SequenceABC, Generic[T]):
+    """
+    A read-only view of the backing array of a Heap, returned by `Heap.data`.
+    Items are in heap order (not sorted), and are retrieved lazily: nothing is copied.
+    The view reflects later changes to the Heap.
+    """
+    # pylint: disable=protected-access
+    __slots__ = ("_heap",)
+
+    def __init__(self, heap: Heap[T]):
+        """
+        Construct a HeapDataView. Use `Heap.data` instead of calling this directly.
+
+        Parameters
+        ----------
+        heap: Heap[T] - the Heap to view.
+        """
+        self._heap = heap
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        """
+        Get the item at a position in the backing array, or a list of items for a slice.
+
+        Parameters
+        ----------
+        index: Union[int, slice] - position(s) to get. Negative positions count from the end.
+
+        Returns
+        -------
+        Union[T, List[T]] - the item at `index`, or a list of items if `index` is a slice.
+
+        Raises
+        ------
+        IndexError - `index` is out of range.
+        """
+        if isinstance(index, slice):
+            return self._heap._unwrap_all(self._heap._data[index])
+        return self._heap._unwrap(self._heap._data[index])
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        See `Heap.__contains__`.
+        """
+        return item in self._heap
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        See `Heap.__iter__`.
+        """
+        return iter(self._heap)
+
+    def __len__(self) -> int:
+        """
+        Check the number of items in the view.
+
+        Returns
+        -------
+        int - number of items in the Heap.
+        """
+        return len(self._heap._data)
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the view.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the view.
+        """
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+
+def nlargest(n: int, iterable: Iterable[T], key: Callable[[T], Any] = None) -> List[T]:
+    """
+    Find the `n` largest items, in O(m log n) time and O(n) memory for `m` items.
+    Equivalent to `sorted(iterable, key=key, reverse=True)[:n]`.
+    This is the same selection as a Heap with `maxsize=n`, but done by `heapq.nlargest`,
+    whose tighter loop has much less overhead per item.
+
+    Parameters
+    ----------
+    n: int - how many items to find.
+    iterable: Iterable[T] - items to search.
+    key: Callable[(T) -> Any] - function to determine an item's ordering value.
+        If `None` (default), the items are compared directly.
+
+    Returns
+    -------
+    List[T] - the largest items, largest first.
+    """
+    return heapq.nlargest(n, iterable, key=key)
+
+
+def nsmallest(n: int, iterable: Iterable[T], key: Callable[[T], Any] = None) -> List[T]:
+    """
+    Find the `n` smallest items, in O(m log n) time and O(n) memory for `m` items.
+    Equivalent to `sorted(iterable, key=key)[:n]`.
+    This is the same selection as a Heap with `maxsize=n` and `reverse=True`,
+    but done by `heapq.nsmallest`, whose tighter loop has much less overhead per item.
+
+    Parameters
+    ----------
+    n: int - how many items to find.
+    iterable: Iterable[T] - items to search.
+    key: Callable[(T) -> Any] - function to determine an item's ordering value.
+        If `None` (default), the items are compared directly.
+
+    Returns
+    -------
+    List[T] - the smallest items, smallest first.
+    """
+    return heapq.nsmallest(n, iterable, key=key)
@@ -0,0 +1,441 @@
+from itertools import count
+from typing import Any, Callable, Generic, Iterable, List, Tuple, TypeVar
+
+from .heap import _ReverseKey
+
+
+T = TypeVar("T")
+
+# marks that no argument was given, for arguments where `None` is a legitimate value
+_MISSING = object()
+
+
+class _HeapHandle(Generic[T]):
+    """
+    Base for the handles returned by addressable heaps: an item, with the rank it is ordered by.
+    """
+    __slots__ = "_item", "_rank"
+
+    def __init__(self, item: T, rank: Tuple[Any, int]):
+        """
+        Construct a handle. Use the heap's `add` instead of calling this directly.
+
+        Parameters
+        ----------
+        item: T - the item being stored.
+        rank: Tuple[Any, int] - the item's (sort key, sequence number), compared to order the heap.
+        """
+        self._item = item
+        self._rank = rank
+
+    @property
+    def item(self) -> T:
+        """
+        Get the item this handle refers to.
+
+        Returns
+        -------
+        T - the item.
+        """
+        return self._item
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the handle.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the handle.
+        """
+        return f"{self.__class__.__name__}({self._item!r})"
+
+
+class IndexedHeapHandle(_HeapHandle, Generic[T]):
+    """
+    A reference to one item in an IndexedHeap, returned by `IndexedHeap.add`.
+    Pass it back to `IndexedHeap.change_priority` or `IndexedHeap.remove`
+    to modify that item's entry in O(log n) time.
+
+    A handle stays valid until its item is popped or removed from the heap.
+    """
+    __slots__ = ("_index",)
+
+    def __init__(self, item: T, rank: Tuple[Any, int]):
+        """
+        Construct an IndexedHeapHandle. Use `IndexedHeap.add` instead of calling this directly.
+
+        Parameters
+        ----------
+        item: T - the item being stored.
+        rank: Tuple[Any, int] - the item's (sort key, sequence number), compared to order the heap.
+        """
+        super().__init__(item, rank)
+        # position in the heap's backing array, or -1 once the item has left the heap
+        self._index = -1
+
+
+class IndexedHeap(Generic[T]):
+    """
+    Heap whose entries can be found and changed after they are added, AKA an addressable
+    priority queue. `add` returns a handle for the new entry, which can later be used to change
+    the entry's priority (decrease-key or increase-key) or remove it, each in O(log n) time.
+
+    Ordering follows the same rules as Heap: each item's key is computed once,
+    ties pop in insertion order, and the items themselves are never compared.
+
+    `T` represents the type of items being stored in the IndexedHeap.
+    """
+    # pylint: disable=protected-access
+    __slots__ = "_data", "_key", "_reverse", "_counter"
+
+    def __init__(self,
+                 data: Iterable[T] = None,
+                 *,
+                 key: Callable[[T], Any] = None,
+                 reverse: bool = False):
+        """
+        Construct an IndexedHeap.
+
+        Parameters
+        ----------
+        data: Iterable[T] (optional) - initial values for the IndexedHeap to store.
+            If `None` (default), the IndexedHeap starts with no contents.
+            Use `add` instead to get handles for the items.
+        key: Callable[(T) -> Any] - function to determine an element's ordering value.
+            It is called once per element, when the element is added or its priority changes.
+            Returned values are compared using the "less-than" operator: `key(e1) < key(e2)`.
+            If `None` (default), the elements are compared directly.
+        reverse: bool - if "high" values should be greater priority in the IndexedHeap.
+            If `False` (default), elements with lower key values are at the top of the IndexedHeap.
+            If `True`, elements with higher key values are at the top of the IndexedHeap.
+        """
+        if key is None:
+            self._key = lambda x: x
+        else:
+            self._key = key
+        self._reverse = reverse
+        # tie-breaker for elements with equal keys
+        self._counter = count()
+        self._data: List[IndexedHeapHandle[T]] = []
+        if data is not None:
+            for item in data:
+                handle = IndexedHeapHandle(item, self._rank(item))
+                handle._index = len(self._data)
+                self._data.append(handle)
+            for pos in reversed(range(len(self._data) // 2)):
+                self._sift_down(pos)
+
+    def _rank(self, item: T) -> Tuple[Any, int]:
+        """
+        Compute the value that an item is ordered by.
+
+        Parameters
+        ----------
+        item: T - item to be stored.
+
+        Returns
+        -------
+        Tuple[Any, int] - (sort key, sequence number) for the item.
+        """
+        sort_key = self._key(item)
+        if self._reverse:
+            sort_key = _ReverseKey(sort_key)
+        return sort_key, next(self._counter)
+
+    def _sift_up(self, pos: int):
+        """
+        Move the entry at `pos` toward the root until its parent comes before it,
+        keeping each moved handle's position up to date.
+
+        Parameters
+        ----------
+        pos: int - position in the backing array of the entry to move.
+
+        Returns
+        -------
+        None
+        """
+        data = self._data
+        handle = data[pos]
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = data[parent_pos]
+            if not handle._rank < parent._rank:
+                break
+            data[pos] = parent
+            parent._index = pos
+            pos = parent_pos
+        data[pos] = handle
+        handle._index = pos
+
+    def _sift_down(self, pos: int):
+        """
+        Move the entry at `pos` toward the leaves until both of its children come after it,
+        keeping each moved handle's position up to date.
+
+        Parameters
+        ----------
+        pos: int - position in the backing array of the entry to move.
+
+        Returns
+        -------
+        None
+        """
+        data = self._data
+        end = len(data)
+        handle = data[pos]
+        child_pos = 2 * pos + 1
+        while child_pos < end:
+            # pick the child that comes first
+            right_pos = child_pos + 1
+            if right_pos < end and data[right_pos]._rank < data[child_pos]._rank:
+                child_pos = right_pos
+            child = data[child_pos]
+            if not child._rank < handle._rank:
+                break
+            data[pos] = child
+            child._index = pos
+            pos = child_pos
+            child_pos = 2 * pos + 1
+        data[pos] = handle
+        handle._index = pos
+
+    def _remove_at(self, pos: int) -> IndexedHeapHandle[T]:
+        """
+        Take the entry at `pos` out of the heap, filling the gap with the last entry.
+
+        Parameters
+        ----------
+        pos: int - position in the backing array of the entry to remove.
+
+        Returns
+        -------
+        IndexedHeapHandle[T] - the removed entry, which is no longer valid.
+        """
+        data = self._data
+        handle = data[pos]
+        last = data.pop()
+        if last is not handle:
+            data[pos] = last
+            last._index = pos
+            self._sift_down(pos)
+            self._sift_up(last._index)
+        handle._index = -1
+        return handle
+
+    def _check_handle(self, handle: IndexedHeapHandle[T]):
+        """
+        Make sure a handle refers to an entry currently in this heap.
+
+        Parameters
+        ----------
+        handle: IndexedHeapHandle[T] - handle to check.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError - `handle` is not in this IndexedHeap.
+        """
+        if handle not in self:
+            raise KeyError(handle)
+
+    @property
+    def data(self) -> List[T]:
+        """
+        Get a view of the contents of the IndexedHeap. This view represents the raw backing array.
+
+        Returns
+        -------
+        List[T] - simple view of the contents of the IndexedHeap.
+        """
+        return [handle._item for handle in self._data]
+
+    def peek(self) -> T:
+        """
+        Return the next item from the IndexedHeap but leave the IndexedHeap unchanged.
+
+        Returns
+        -------
+        T - next item (still in the IndexedHeap).
+
+        Raises
+        ------
+        IndexError - IndexedHeap was empty at the start of the operation; nothing to peek.
+        """
+        try:
+            return self._data[0]._item
+        except IndexError as e:
+            raise IndexError("peek from empty IndexedHeap") from e
+
+    def peek_handle(self) -> IndexedHeapHandle[T]:
+        """
+        Return the handle of the next item but leave the IndexedHeap unchanged.
+
+        Returns
+        -------
+        IndexedHeapHandle[T] - handle of the next item (still in the IndexedHeap).
+
+        Raises
+        ------
+        IndexError - IndexedHeap was empty at the start of the operation; nothing to peek.
+        """
+        try:
+            return self._data[0]
+        except IndexError as e:
+            raise IndexError("peek from empty IndexedHeap") from e
+
+    def pop(self) -> T:
+        """
+        Remove the next item from the IndexedHeap and return it.
+        Its handle is no longer valid afterward.
+
+        Returns
+        -------
+        T - next item (no longer in the IndexedHeap).
+
+        Raises
+        ------
+        IndexError - IndexedHeap was empty at the start of the operation; nothing to pop.
+        """
+        if len(self._data) == 0:
+            raise IndexError("pop from empty IndexedHeap")
+        return self._remove_at(0)._item
+
+    def add(self, new_item: T) -> IndexedHeapHandle[T]:
+        """
+        Add a new item to the IndexedHeap.
+
+        Parameters
+        ----------
+        new_item: T - new item to add to the IndexedHeap.
+
+        Returns
+        -------
+        IndexedHeapHandle[T] - handle for the new item's entry.
+        """
+        handle = IndexedHeapHandle(new_item, self._rank(new_item))
+        self._data.append(handle)
+        self._sift_up(len(self._data) - 1)
+        return handle
+
+    def change_priority(self, handle: IndexedHeapHandle[T], new_item: T = _MISSING):
+        """
+        Recompute the ordering of an entry that is already in the IndexedHeap,
+        moving it up or down as needed. Works for both decreasing and increasing its priority.
+
+        Parameters
+        ----------
+        handle: IndexedHeapHandle[T] - handle of the entry to change.
+        new_item: T (optional) - item to store in place of the entry's current item.
+            If not given, the current item's key is recomputed instead,
+            which is useful when the item was modified in a way that changes its key.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError - `handle` is not in this IndexedHeap.
+        """
+        self._check_handle(handle)
+        item = handle._item if new_item is _MISSING else new_item
+        # compute the key before changing anything, in case it raises
+        sort_key = self._key(item)
+        if self._reverse:
+            sort_key = _ReverseKey(sort_key)
+        old_rank = handle._rank
+        handle._item = item
+        # keep the original sequence number, so the entry doesn't lose its place among ties
+        handle._rank = sort_key, old_rank[1]
+        if handle._rank < old_rank:
+            self._sift_up(handle._index)
+        else:
+            self._sift_down(handle._index)
+
+    def remove(self, handle: IndexedHeapHandle[T]) -> T:
+        """
+        Remove an entry from anywhere in the IndexedHeap.
+        The handle is no longer valid afterward.
+
+        Parameters
+        ----------
+        handle: IndexedHeapHandle[T] - handle of the entry to remove.
+
+        Returns
+        -------
+        T - the removed item.
+
+        Raises
+        ------
+        KeyError - `handle` is not in this IndexedHeap.
+        """
+        self._check_handle(handle)
+        return self._remove_at(handle._index)._item
+
+    def update(self, new_items: Iterable[T]) -> List[IndexedHeapHandle[T]]:
+        """
+        Add multiple items to the IndexedHeap by calling `IndexedHeap.add` for each.
+
+        Parameters
+        ----------
+        new_items: Iterable[T] - items to add to the IndexedHeap.
+
+        Returns
+        -------
+        List[IndexedHeapHandle[T]] - handles for the new items, in the order they were given.
+        """
+        return [self.add(item) for item in new_items]
+
+    def __contains__(self, handle: Any) -> bool:
+        """
+        Check if a handle refers to an entry currently in the IndexedHeap.
+
+        Parameters
+        ----------
+        handle: Any - handle to look for.
+
+        Returns
+        -------
+        bool - `True` if the handle's entry is in the IndexedHeap, `False` otherwise.
+        """
+        if not isinstance(handle, IndexedHeapHandle):
+            return False
+        index = handle._index
+        return 0 <= index < len(self._data) and self._data[index] is handle
+
+    def __len__(self) -> int:
+        """
+        Check the number of elements in the IndexedHeap.
+
+        Returns
+        -------
+        int - number of elements in the IndexedHeap.
+        """
+        return len(self._data)
+
+    def is_empty(self) -> bool:
+        """
+        Check if the IndexedHeap is empty or not.
+
+        Returns
+        -------
+        bool - `True` if there is no data in the IndexedHeap, `False` otherwise.
+        """
+        return len(self._data) == 0
+
+    def clear(self):
+        """
+        Empty all data from the IndexedHeap. All handles become invalid.
+
+        Returns
+        -------
+        None
+        """
+        for handle in self._data:
+            handle._index = -1
+        self._data.clear()
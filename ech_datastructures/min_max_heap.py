@@ -0,0 +1,409 @@
+from itertools import count
+from operator import itemgetter
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+def _is_min_level(index: int) -> bool:
+    """
+    Check if a position in a min-max heap is on a "min" level (even depth) or a "max" level.
+
+    Parameters
+    ----------
+    index: int - position in the backing array.
+
+    Returns
+    -------
+    bool - `True` if the position is on a min level, `False` if it is on a max level.
+    """
+    return (index + 1).bit_length() % 2 == 1
+
+
+class MinMaxHeap(Generic[T]):
+    """
+    Double-ended priority queue, built as a min-max heap: a binary heap whose levels alternate
+    between coming before all their descendants (min levels) and after them (max levels).
+    Both ends can be peeked in O(1) time, and popped in O(log n) time.
+
+    "Min" and "max" follow the same conventions as Heap: with a `key`, items are ordered by
+    their keys, and with `reverse=True`, the ends are swapped, so that the "min" end (the one
+    a Heap would pop) holds the highest key. Ties at the min end come out in insertion order,
+    and ties at the max end come out newest first.
+
+    Each item's key is computed only once, when the item is added,
+    and the items themselves are never compared.
+
+    `T` represents the type of items being stored in the MinMaxHeap.
+    """
+    # the constructor takes the same arguments as the other keyed heaps
+    # pylint: disable=duplicate-code
+    __slots__ = "_data", "_key", "_reverse", "_counter"
+
+    def __init__(self,
+                 data: Iterable[T] = None,
+                 *,
+                 key: Callable[[T], Any] = None,
+                 reverse: bool = False):
+        """
+        Construct a MinMaxHeap, in O(n) time.
+
+        Parameters
+        ----------
+        data: Iterable[T] (optional) - initial values for the MinMaxHeap to store.
+            If `None` (default), the MinMaxHeap starts with no contents.
+        key: Callable[(T) -> Any] - function to determine an element's ordering value.
+            It is called once per element, when the element is added.
+            Returned values are compared using the "less-than" operator: `key(e1) < key(e2)`.
+            If `None` (default), the elements are compared directly.
+        reverse: bool - if "high" values should be at the min end of the MinMaxHeap.
+            If `False` (default), `pop_min` returns the element with the lowest key value.
+            If `True`, `pop_min` returns the element with the highest key value.
+        """
+        self._key = key
+        self._reverse = reverse
+        # tie-breaker for elements with equal keys; see `_wrap`
+        self._counter = count()
+        # pylint: enable=duplicate-code
+        self._data: List[Tuple[Any, int, T]] = []
+        if data is not None:
+            self._data = [self._wrap(item) for item in data]
+            for index in reversed(range(len(self._data) // 2)):
+                self._trickle_down(index)
+
+    def _wrap(self, item: T) -> Tuple[Any, int, T]:
+        """
+        Compute an item's key and package it for storage in the backing array.
+
+        Parameters
+        ----------
+        item: T - item to be stored.
+
+        Returns
+        -------
+        Tuple[Any, int, T] - the (sort key, sequence number, item) entry to store.
+        """
+        sort_key = item if self._key is None else self._key(item)
+        seq = next(self._counter)
+        # when reversed, the max end is the user's min end,
+        # and it pops the greatest sequence number among ties
+        return sort_key, -seq if self._reverse else seq, item
+
+    def _swap(self, i: int, j: int):
+        """
+        Swap two entries of the backing array.
+
+        Parameters
+        ----------
+        i: int - position of one entry.
+        j: int - position of the other entry.
+
+        Returns
+        -------
+        None
+        """
+        data = self._data
+        data[i], data[j] = data[j], data[i]
+
+    def _bubble_up(self, index: int):
+        """
+        Move the entry at `index` toward the root until the min-max ordering holds.
+
+        Parameters
+        ----------
+        index: int - position of the entry to move (usually the last one).
+
+        Returns
+        -------
+        None
+        """
+        if index == 0:
+            return
+        data = self._data
+        parent = (index - 1) >> 1
+        on_min_level = _is_min_level(index)
+        if on_min_level and data[parent] < data[index]:
+            # it belongs on the max levels above
+            self._swap(index, parent)
+            self._bubble_up_among(parent, on_min=False)
+        elif not on_min_level and data[index] < data[parent]:
+            # it belongs on the min levels above
+            self._swap(index, parent)
+            self._bubble_up_among(parent, on_min=True)
+        else:
+            self._bubble_up_among(index, on_min=on_min_level)
+
+    def _bubble_up_among(self, index: int, on_min: bool):
+        """
+        Move the entry at `index` toward the root, comparing only with its grandparents,
+        which are on the same kind of level.
+
+        Parameters
+        ----------
+        index: int - position of the entry to move.
+        on_min: bool - whether `index` is on a min level.
+
+        Returns
+        -------
+        None
+        """
+        data = self._data
+        while index > 2:
+            grandparent = (index - 3) >> 2
+            if on_min:
+                out_of_order = data[index] < data[grandparent]
+            else:
+                out_of_order = data[grandparent] < data[index]
+            if not out_of_order:
+                break
+            self._swap(index, grandparent)
+            index = grandparent
+
+    def _trickle_down(self, index: int):
+        """
+        Move the entry at `index` toward the leaves until the min-max ordering holds,
+        assuming both of its subtrees are already in order.
+
+        Parameters
+        ----------
+        index: int - position of the entry to move.
+
+        Returns
+        -------
+        None
+        """
+        data = self._data
+        n = len(data)
+        on_min = _is_min_level(index)
+        while True:
+            first_child = 2 * index + 1
+            if first_child >= n:
+                return
+            # the most extreme of the (up to 2) children and (up to 4) grandchildren
+            candidates = [first_child, first_child + 1, 2 * first_child + 1, 2 * first_child + 2,
+                          2 * first_child + 3, 2 * first_child + 4]
+            best = first_child
+            for candidate in candidates[1:]:
+                if candidate >= n:
+                    break
+                if (data[candidate] < data[best]) if on_min else (data[best] < data[candidate]):
+                    best = candidate
+            if on_min:
+                out_of_order = data[best] < data[index]
+            else:
+                out_of_order = data[index] < data[best]
+            if not out_of_order:
+                return
+            self._swap(best, index)
+            if best <= first_child + 1:
+                # a child is on the opposite kind of level, and has no grandchildren below it
+                # that it could be out of order with
+                return
+            # a grandchild may now be out of order with its parent (on the other kind of level)
+            parent = (best - 1) >> 1
+            if (data[parent] < data[best]) if on_min else (data[best] < data[parent]):
+                self._swap(best, parent)
+            index = best
+
+    def _max_index(self) -> int:
+        """
+        Find the position of the greatest entry. The MinMaxHeap must not be empty.
+
+        Returns
+        -------
+        int - position in the backing array of the greatest entry.
+        """
+        data = self._data
+        if len(data) <= 2:
+            return len(data) - 1
+        return 1 if data[2] < data[1] else 2
+
+    def _pop_at(self, index: int) -> T:
+        """
+        Remove the entry at `index` (which must be the root, or the greatest entry)
+        and return its item.
+
+        Parameters
+        ----------
+        index: int - position of the entry to remove.
+
+        Returns
+        -------
+        T - the removed item.
+        """
+        data = self._data
+        last = data.pop()
+        if index == len(data):
+            return last[2]
+        entry = data[index]
+        data[index] = last
+        self._trickle_down(index)
+        return entry[2]
+
+    def _min_end_index(self, want_min: bool) -> int:
+        """
+        Find the position of one end of the MinMaxHeap, accounting for `reverse`.
+
+        Parameters
+        ----------
+        want_min: bool - `True` for the user's min end, `False` for the user's max end.
+
+        Returns
+        -------
+        int - position in the backing array.
+
+        Raises
+        ------
+        IndexError - the MinMaxHeap is empty.
+        """
+        if len(self._data) == 0:
+            raise IndexError(f"{'min' if want_min else 'max'} of empty MinMaxHeap")
+        return 0 if want_min != self._reverse else self._max_index()
+
+    def peek_min(self) -> T:
+        """
+        Return the item at the min end of the MinMaxHeap (the one a Heap would pop),
+        but leave the MinMaxHeap unchanged.
+
+        Returns
+        -------
+        T - min item (still in the MinMaxHeap).
+
+        Raises
+        ------
+        IndexError - MinMaxHeap was empty at the start of the operation; nothing to peek.
+        """
+        return self._data[self._min_end_index(True)][2]
+
+    def peek_max(self) -> T:
+        """
+        Return the item at the max end of the MinMaxHeap, but leave the MinMaxHeap unchanged.
+
+        Returns
+        -------
+        T - max item (still in the MinMaxHeap).
+
+        Raises
+        ------
+        IndexError - MinMaxHeap was empty at the start of the operation; nothing to peek.
+        """
+        return self._data[self._min_end_index(False)][2]
+
+    def pop_min(self) -> T:
+        """
+        Remove the item at the min end of the MinMaxHeap (the one a Heap would pop)
+        and return it.
+
+        Returns
+        -------
+        T - min item (no longer in the MinMaxHeap).
+
+        Raises
+        ------
+        IndexError - MinMaxHeap was empty at the start of the operation; nothing to pop.
+        """
+        return self._pop_at(self._min_end_index(True))
+
+    def pop_max(self) -> T:
+        """
+        Remove the item at the max end of the MinMaxHeap and return it.
+
+        Returns
+        -------
+        T - max item (no longer in the MinMaxHeap).
+
+        Raises
+        ------
+        IndexError - MinMaxHeap was empty at the start of the operation; nothing to pop.
+        """
+        return self._pop_at(self._min_end_index(False))
+
+    def add(self, new_item: T):
+        """
+        Add a new item to the MinMaxHeap.
+
+        Parameters
+        ----------
+        new_item: T - new item to add to the MinMaxHeap.
+
+        Returns
+        -------
+        None
+        """
+        self._data.append(self._wrap(new_item))
+        self._bubble_up(len(self._data) - 1)
+
+    def update(self, new_items: Iterable[T]):
+        """
+        Add multiple items to the MinMaxHeap by calling `MinMaxHeap.add` for each.
+
+        Parameters
+        ----------
+        new_items: Iterable[T] - items to add to the MinMaxHeap.
+
+        Returns
+        -------
+        None
+        """
+        for item in new_items:
+            self.add(item)
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Check if an item equal to `item` is in the MinMaxHeap, in O(n) time.
+
+        Parameters
+        ----------
+        item: Any - item to search for.
+
+        Returns
+        -------
+        bool - `True` if the item is in the MinMaxHeap, `False` otherwise.
+        """
+        return item in map(itemgetter(2), self._data)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items of the MinMaxHeap, in the order of the backing array (not sorted).
+        The MinMaxHeap must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[T] - items of the MinMaxHeap.
+        """
+        return map(itemgetter(2), self._data)
+
+    # the size queries are the same one-liners as every other heap's
+    # pylint: disable=duplicate-code
+    def __len__(self) -> int:
+        """
+        Check the number of elements in the MinMaxHeap.
+
+        Returns
+        -------
+        int - number of elements in the MinMaxHeap.
+        """
+        return len(self._data)
+
+    def is_empty(self) -> bool:
+        """
+        Check if the MinMaxHeap is empty or not.
+
+        Returns
+        -------
+        bool - `True` if there is no data in the MinMaxHeap, `False` otherwise.
+        """
+        return len(self._data) == 0
+
+    # pylint: enable=duplicate-code
+
+    def clear(self):
+        """
+        Empty all data from the MinMaxHeap.
+
+        Returns
+        -------
+        None
+        """
+        self._data.clear()
@@ -0,0 +1,363 @@
+from array import array
+from typing import Iterable, Iterator, Tuple, Union
+
+from .heap import _HEAPIFY_FACTOR
+
+
+Number = Union[int, float]
+
+# smallest number of slots to allocate when the backing arrays first grow
+_MIN_CAPACITY = 16
+
+
+def _to_array(values: Iterable[Number], typecode: str, negate: bool = False) -> array:
+    """
+    Convert values to an `array.array`, avoiding a per-element copy when possible.
+
+    Parameters
+    ----------
+    values: Iterable[Number] - the values to convert.
+    typecode: str - the typecode of the resulting array.
+    negate: bool - whether to negate each value.
+
+    Returns
+    -------
+    array - the converted values.
+    """
+    if negate:
+        return array(typecode, (-value for value in values))
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+class NumericHeap:
+    """
+    Compact min-heap of (priority, id) pairs, where priorities are numbers and ids are ints.
+    Priorities and ids are kept in two parallel `array.array` buffers instead of as Python objects,
+    so each entry takes 16 bytes (with the default typecode) rather than around 100.
+    The buffers grow by doubling, so adding is amortized O(log n).
+
+    Equal priorities come out in no particular order.
+    """
+    __slots__ = "_keys", "_ids", "_size", "_reverse"
+
+    def __init__(self,
+                 priorities: Iterable[Number] = None,
+                 ids: Iterable[int] = None,
+                 *,
+                 reverse: bool = False,
+                 typecode: str = "d"):
+        """
+        Construct a NumericHeap, in O(n) time.
+
+        Parameters
+        ----------
+        priorities: Iterable[Number] (optional) - initial priorities for the NumericHeap to store.
+            An `array.array` with the same typecode is copied without converting each element.
+            If `None` (default), the NumericHeap starts with no contents.
+        ids: Iterable[int] (optional) - the id to go with each of `priorities`.
+            If `None` (default), the ids are the positions of the priorities: 0, 1, 2, ...
+        reverse: bool - if "high" priorities should come out first.
+            Priorities are stored negated, so with an integer `typecode`,
+            the most negative value of that type can't be added.
+        typecode: str - `array.array` typecode for storing priorities. Defaults to "d" (float).
+            Use "q" to store integer priorities exactly.
+            Ids are always stored with typecode "q" (signed 64-bit ints).
+
+        Raises
+        ------
+        ValueError - `priorities` and `ids` have different lengths, `ids` were given without
+            `priorities`, or `typecode` is invalid.
+        """
+        self._reverse = reverse
+        self._keys = array(typecode)
+        self._ids = array("q")
+        self._size = 0
+        if priorities is not None:
+            if ids is None:
+                priorities = _to_array(priorities, typecode)
+                ids = range(len(priorities))
+            self.update(priorities, ids)
+        elif ids is not None:
+            raise ValueError("ids were given without priorities")
+
+    def _grow(self, needed: int):
+        """
+        Make sure the backing arrays have room for at least `needed` entries,
+        at least doubling their capacity when they have to grow.
+
+        Parameters
+        ----------
+        needed: int - the number of entries that must fit.
+
+        Returns
+        -------
+        None
+        """
+        capacity = len(self._keys)
+        if needed <= capacity:
+            return
+        extra = max(needed, 2 * capacity, _MIN_CAPACITY) - capacity
+        self._keys.frombytes(bytes(extra * self._keys.itemsize))
+        self._ids.frombytes(bytes(extra * self._ids.itemsize))
+
+    def _sift_up(self, pos: int, priority: Number, ident: int):
+        """
+        Place an entry at `pos` (which is treated as empty), moving it toward the root as needed.
+
+        Parameters
+        ----------
+        pos: int - the starting position.
+        priority: Number - the entry's stored (possibly negated) priority.
+        ident: int - the entry's id.
+
+        Returns
+        -------
+        None
+        """
+        keys, ids = self._keys, self._ids
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            parent_key = keys[parent]
+            if not priority < parent_key:
+                break
+            keys[pos] = parent_key
+            ids[pos] = ids[parent]
+            pos = parent
+        keys[pos] = priority
+        ids[pos] = ident
+
+    def _sift_down(self, pos: int, priority: Number, ident: int):
+        """
+        Place an entry at `pos` (which is treated as empty), moving it toward the leaves as needed.
+
+        Parameters
+        ----------
+        pos: int - the starting position.
+        priority: Number - the entry's stored (possibly negated) priority.
+        ident: int - the entry's id.
+
+        Returns
+        -------
+        None
+        """
+        keys, ids, size = self._keys, self._ids, self._size
+        child = 2 * pos + 1
+        while child < size:
+            right = child + 1
+            if right < size and keys[right] < keys[child]:
+                child = right
+            child_key = keys[child]
+            if not child_key < priority:
+                break
+            keys[pos] = child_key
+            ids[pos] = ids[child]
+            pos = child
+            child = 2 * pos + 1
+        keys[pos] = priority
+        ids[pos] = ident
+
+    def _heapify(self):
+        """
+        Restore the heap property over all entries, in O(n) time.
+
+        Returns
+        -------
+        None
+        """
+        keys, ids = self._keys, self._ids
+        for pos in reversed(range(self._size // 2)):
+            self._sift_down(pos, keys[pos], ids[pos])
+
+    @property
+    def capacity(self) -> int:
+        """
+        Get the number of entries the NumericHeap can hold before its buffers have to grow.
+
+        Returns
+        -------
+        int - the capacity of the backing arrays.
+        """
+        return len(self._keys)
+
+    def peek(self) -> Tuple[Number, int]:
+        """
+        Return the next entry from the NumericHeap but leave the NumericHeap unchanged.
+
+        Returns
+        -------
+        Tuple[Number, int] - the (priority, id) pair of the next entry (still in the NumericHeap).
+
+        Raises
+        ------
+        IndexError - NumericHeap was empty at the start of the operation; nothing to peek.
+        """
+        if self._size == 0:
+            raise IndexError("peek from empty NumericHeap")
+        priority = self._keys[0]
+        return -priority if self._reverse else priority, self._ids[0]
+
+    def pop(self) -> Tuple[Number, int]:
+        """
+        Remove the next entry from the NumericHeap and return it.
+
+        Returns
+        -------
+        Tuple[Number, int] - the (priority, id) pair of the next entry
+            (no longer in the NumericHeap).
+
+        Raises
+        ------
+        IndexError - NumericHeap was empty at the start of the operation; nothing to pop.
+        """
+        if self._size == 0:
+            raise IndexError("pop from empty NumericHeap")
+        keys, ids = self._keys, self._ids
+        priority, ident = keys[0], ids[0]
+        self._size -= 1
+        last = self._size
+        if last > 0:
+            self._sift_down(0, keys[last], ids[last])
+        return -priority if self._reverse else priority, ident
+
+    def pop_many(self, m: int) -> Tuple[array, array]:
+        """
+        Remove the next `m` entries from the NumericHeap and return them, in the order `pop` would.
+        If the NumericHeap has fewer than `m` entries, all of them are returned.
+
+        Parameters
+        ----------
+        m: int - the most entries to pop.
+
+        Returns
+        -------
+        Tuple[array, array] - the popped priorities and their ids, as two parallel arrays.
+        """
+        m = max(0, min(m, self._size))
+        popped_keys = array(self._keys.typecode)
+        popped_ids = array("q")
+        keys, ids = self._keys, self._ids
+        for _ in range(m):
+            popped_keys.append(keys[0])
+            popped_ids.append(ids[0])
+            self._size -= 1
+            last = self._size
+            if last > 0:
+                self._sift_down(0, keys[last], ids[last])
+        if self._reverse:
+            popped_keys = array(popped_keys.typecode, (-priority for priority in popped_keys))
+        return popped_keys, popped_ids
+
+    def add(self, priority: Number, ident: int):
+        """
+        Add a new entry to the NumericHeap.
+
+        Parameters
+        ----------
+        priority: Number - the new entry's priority.
+        ident: int - the new entry's id.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError, OverflowError - `priority` or `ident` can't be stored in the backing arrays
+            (the NumericHeap is left unchanged).
+        """
+        self._grow(self._size + 1)
+        pos = self._size
+        # store into the free slot first, so a value that doesn't fit the arrays
+        # raises before anything in the heap has moved
+        self._keys[pos] = -priority if self._reverse else priority
+        self._ids[pos] = ident
+        self._size += 1
+        self._sift_up(pos, self._keys[pos], ident)
+
+    def update(self, priorities: Iterable[Number], ids: Iterable[int]):
+        """
+        Add multiple entries to the NumericHeap.
+        Small batches are added one at a time, in O(k log n) time. Batches that are large
+        compared to the NumericHeap are copied in and then the whole NumericHeap is re-heapified,
+        in O(n + k) time.
+
+        Parameters
+        ----------
+        priorities: Iterable[Number] - priorities of the new entries.
+        ids: Iterable[int] - the id to go with each of `priorities`.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError - `priorities` and `ids` have different lengths.
+        """
+        size = self._size
+        new_keys = _to_array(priorities, self._keys.typecode, negate=self._reverse)
+        new_ids = _to_array(ids, "q")
+        n_new = len(new_keys)
+        if len(new_ids) != n_new:
+            raise ValueError("priorities and ids must have the same length")
+        self._grow(size + n_new)
+        total = size + n_new
+        if n_new * total.bit_length() >= _HEAPIFY_FACTOR * total:
+            self._keys[size:total] = new_keys
+            self._ids[size:total] = new_ids
+            self._size = total
+            self._heapify()
+        else:
+            for priority, ident in zip(new_keys, new_ids):
+                self._size += 1
+                self._sift_up(self._size - 1, priority, ident)
+
+    def __iter__(self) -> Iterator[Tuple[Number, int]]:
+        """
+        Iterate over the (priority, id) pairs of the NumericHeap,
+        in the order of the backing arrays (not sorted).
+        The NumericHeap must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[Tuple[Number, int]] - entries of the NumericHeap.
+        """
+        size = self._size
+        keys = self._keys[:size]
+        if self._reverse:
+            keys = (-priority for priority in keys)
+        return zip(keys, self._ids[:size])
+
+    def __len__(self) -> int:
+        """
+        Check the number of entries in the NumericHeap.
+
+        Returns
+        -------
+        int - number of entries in the NumericHeap.
+        """
+        return self._size
+
+    def is_empty(self) -> bool:
+        """
+        Check if the NumericHeap is empty or not.
+
+        Returns
+        -------
+        bool - `True` if there is no data in the NumericHeap, `False` otherwise.
+        """
+        return self._size == 0
+
+    def clear(self):
+        """
+        Empty all data from the NumericHeap, and release its buffers.
+
+        Returns
+        -------
+        None
+        """
+        self._keys = array(self._keys.typecode)
+        self._ids = array("q")
+        self._size = 0
@@ -0,0 +1,482 @@
+from itertools import count
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .heap import _ReverseKey
+from .indexed_heap import _HeapHandle
+
+
+T = TypeVar("T")
+
+# tie-breaker for elements with equal keys, shared by all PairingHeaps
+# so that merged heaps still pop ties in insertion order
+_SEQUENCE = count()
+
+# marks that no argument was given, for arguments where `None` is a legitimate value
+_MISSING = object()
+
+
+class PairingHeapHandle(_HeapHandle, Generic[T]):
+    """
+    A reference to one item in a PairingHeap, returned by `PairingHeap.add`.
+    Pass it back to `PairingHeap.change_priority` or `PairingHeap.remove` to modify that item.
+    It is also the node of the heap's tree that holds the item.
+
+    A handle stays valid until its item is popped or removed from the heap.
+    """
+    __slots__ = "_child", "_sibling", "_prev"
+
+    def __init__(self, item: T, rank: Tuple[Any, int]):
+        """
+        Construct a PairingHeapHandle. Use `PairingHeap.add` instead of calling this directly.
+
+        Parameters
+        ----------
+        item: T - the item being stored.
+        rank: Tuple[Any, int] - the item's (sort key, sequence number), compared to order the heap.
+        """
+        super().__init__(item, rank)
+        # leftmost child
+        self._child: Optional[PairingHeapHandle[T]] = None
+        # next sibling to the right
+        self._sibling: Optional[PairingHeapHandle[T]] = None
+        # the parent if this is the leftmost child, otherwise the next sibling to the left;
+        # `None` for a root, or once the item has left the heap
+        self._prev: Optional[PairingHeapHandle[T]] = None
+
+
+def _meld(a: PairingHeapHandle, b: PairingHeapHandle) -> PairingHeapHandle:
+    """
+    Combine two heap-ordered trees by making the later root the leftmost child of the earlier one.
+
+    Parameters
+    ----------
+    a: PairingHeapHandle - root of one tree.
+    b: PairingHeapHandle - root of the other tree.
+
+    Returns
+    -------
+    PairingHeapHandle - root of the combined tree.
+    """
+    # pylint: disable=protected-access
+    if b._rank < a._rank:
+        a, b = b, a
+    first = a._child
+    b._sibling = first
+    if first is not None:
+        first._prev = b
+    b._prev = a
+    a._child = b
+    return a
+
+
+def _meld_siblings(first: Optional[PairingHeapHandle]) -> Optional[PairingHeapHandle]:
+    """
+    Combine a list of sibling trees into one, using the standard two-pass pairing:
+    meld pairs from left to right, then meld the results from right to left.
+
+    Parameters
+    ----------
+    first: Optional[PairingHeapHandle] - leftmost of the siblings, or `None` if there are none.
+
+    Returns
+    -------
+    Optional[PairingHeapHandle] - root of the combined tree, or `None` if there were no siblings.
+    """
+    # pylint: disable=protected-access
+    trees: List[PairingHeapHandle] = []
+    node = first
+    while node is not None:
+        next_node = node._sibling
+        node._prev = None
+        node._sibling = None
+        trees.append(node)
+        node = next_node
+    if len(trees) == 0:
+        return None
+    pairs = [_meld(trees[i], trees[i + 1]) for i in range(0, len(trees) - 1, 2)]
+    if len(trees) % 2 == 1:
+        pairs.append(trees[-1])
+    root = pairs.pop()
+    while len(pairs) > 0:
+        root = _meld(pairs.pop(), root)
+    return root
+
+
+class PairingHeap(Generic[T]):
+    """
+    Heap built as a pairing heap: a tree where each node comes before its children,
+    and where any number of children is allowed.
+    Adding items and merging whole heaps take O(1) time; pops take O(log n) amortized time.
+    Items can also be removed or have their priority changed through handles, which makes this
+    well suited to graph searches that do many decrease-key operations.
+    Decreasing a key (moving an item toward the top) takes O(log n) amortized time, or better.
+
+    Ordering follows the same rules as Heap: each item's key is computed once,
+    ties pop in insertion order (even across merged heaps), and the items themselves are never
+    compared.
+
+    `T` represents the type of items being stored in the PairingHeap.
+    """
+    # pylint: disable=protected-access
+    __slots__ = "_root", "_count", "_key", "_reverse"
+
+    def __init__(self,
+                 data: Iterable[T] = None,
+                 *,
+                 key: Callable[[T], Any] = None,
+                 reverse: bool = False):
+        """
+        Construct a PairingHeap.
+
+        Parameters
+        ----------
+        data: Iterable[T] (optional) - initial values for the PairingHeap to store.
+            If `None` (default), the PairingHeap starts with no contents.
+            Use `add` instead to get handles for the items.
+        key: Callable[(T) -> Any] - function to determine an element's ordering value.
+            It is called once per element, when the element is added or its priority changes.
+            Returned values are compared using the "less-than" operator: `key(e1) < key(e2)`.
+            If `None` (default), the elements are compared directly.
+        reverse: bool - if "high" values should be greater priority in the PairingHeap.
+            If `False` (default), elements with lower key values are at the top of the PairingHeap.
+            If `True`, elements with higher key values are at the top of the PairingHeap.
+        """
+        self._key = key
+        self._reverse = reverse
+        self._root: Optional[PairingHeapHandle[T]] = None
+        self._count = 0
+        if data is not None:
+            self.update(data)
+
+    def _sort_key(self, item: T) -> Any:
+        """
+        Compute the value that an item is compared by.
+
+        Parameters
+        ----------
+        item: T - item to be stored.
+
+        Returns
+        -------
+        Any - the sort key for the item.
+        """
+        sort_key = item if self._key is None else self._key(item)
+        if self._reverse:
+            sort_key = _ReverseKey(sort_key)
+        return sort_key
+
+    def _check_handle(self, handle: PairingHeapHandle[T]):
+        """
+        Make sure a handle refers to an item that is still in a heap.
+        Whether it is in this heap in particular is not checked.
+
+        Parameters
+        ----------
+        handle: PairingHeapHandle[T] - handle to check.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError - `handle` has already been popped or removed.
+        """
+        if handle._prev is None and handle is not self._root:
+            raise KeyError(handle)
+
+    @staticmethod
+    def _cut(node: PairingHeapHandle[T]):
+        """
+        Detach a (non-root) node, along with its descendants, from its parent and siblings.
+
+        Parameters
+        ----------
+        node: PairingHeapHandle[T] - the node to detach.
+
+        Returns
+        -------
+        None
+        """
+        prev = node._prev
+        if prev._child is node:
+            prev._child = node._sibling
+        else:
+            prev._sibling = node._sibling
+        if node._sibling is not None:
+            node._sibling._prev = prev
+        node._prev = None
+        node._sibling = None
+
+    def _detach_children(self, node: PairingHeapHandle[T]) -> Optional[PairingHeapHandle[T]]:
+        """
+        Remove all of a node's children, combining them into a single tree.
+
+        Parameters
+        ----------
+        node: PairingHeapHandle[T] - the node whose children should be removed.
+
+        Returns
+        -------
+        Optional[PairingHeapHandle[T]] - root of the combined tree, or `None` if there were none.
+        """
+        first = node._child
+        node._child = None
+        return _meld_siblings(first)
+
+    def _add_tree(self, tree: Optional[PairingHeapHandle[T]]):
+        """
+        Meld a tree into the heap.
+
+        Parameters
+        ----------
+        tree: Optional[PairingHeapHandle[T]] - root of the tree to add, or `None` for no tree.
+
+        Returns
+        -------
+        None
+        """
+        if tree is None:
+            return
+        if self._root is None:
+            self._root = tree
+        else:
+            self._root = _meld(self._root, tree)
+
+    def peek(self) -> T:
+        """
+        Return the next item from the PairingHeap but leave the PairingHeap unchanged.
+
+        Returns
+        -------
+        T - next item (still in the PairingHeap).
+
+        Raises
+        ------
+        IndexError - PairingHeap was empty at the start of the operation; nothing to peek.
+        """
+        if self._root is None:
+            raise IndexError("peek from empty PairingHeap")
+        return self._root._item
+
+    def pop(self) -> T:
+        """
+        Remove the next item from the PairingHeap and return it.
+        Its handle is no longer valid afterward.
+
+        Returns
+        -------
+        T - next item (no longer in the PairingHeap).
+
+        Raises
+        ------
+        IndexError - PairingHeap was empty at the start of the operation; nothing to pop.
+        """
+        root = self._root
+        if root is None:
+            raise IndexError("pop from empty PairingHeap")
+        self._root = self._detach_children(root)
+        self._count -= 1
+        return root._item
+
+    def add(self, new_item: T) -> PairingHeapHandle[T]:
+        """
+        Add a new item to the PairingHeap, in O(1) time.
+
+        Parameters
+        ----------
+        new_item: T - new item to add to the PairingHeap.
+
+        Returns
+        -------
+        PairingHeapHandle[T] - handle for the new item.
+        """
+        handle = PairingHeapHandle(new_item, (self._sort_key(new_item), next(_SEQUENCE)))
+        self._add_tree(handle)
+        self._count += 1
+        return handle
+
+    def update(self, new_items: Iterable[T]) -> List[PairingHeapHandle[T]]:
+        """
+        Add multiple items to the PairingHeap by calling `PairingHeap.add` for each.
+
+        Parameters
+        ----------
+        new_items: Iterable[T] - items to add to the PairingHeap.
+
+        Returns
+        -------
+        List[PairingHeapHandle[T]] - handles for the new items, in the order they were given.
+        """
+        return [self.add(item) for item in new_items]
+
+    def merge(self, other: "PairingHeap[T]"):
+        """
+        Move all the items from another PairingHeap into this one, in O(1) time.
+        `other` is left empty, and handles for its items now refer to items in this PairingHeap.
+
+        Parameters
+        ----------
+        other: PairingHeap[T] - PairingHeap whose items should be moved.
+            It must have been made with the same `key` (the same object) and `reverse` as this one.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError - `other` has a different key or order than this PairingHeap.
+        """
+        if other._key is not self._key or other._reverse != self._reverse:
+            raise ValueError("can only merge PairingHeaps with the same key and order")
+        if other is self:
+            return
+        self._add_tree(other._root)
+        self._count += other._count
+        other._root = None
+        other._count = 0
+
+    def change_priority(self, handle: PairingHeapHandle[T], new_item: T = _MISSING):
+        """
+        Recompute the ordering of an item that is already in the PairingHeap,
+        moving it up or down as needed.
+        Works for both decreasing and increasing its priority.
+
+        Parameters
+        ----------
+        handle: PairingHeapHandle[T] - handle of the item to change.
+        new_item: T (optional) - item to store in place of the current item.
+            If not given, the current item's key is recomputed instead,
+            which is useful when the item was modified in a way that changes its key.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError - `handle` has already been popped or removed.
+        """
+        self._check_handle(handle)
+        item = handle._item if new_item is _MISSING else new_item
+        # compute the key before changing anything, in case it raises
+        sort_key = self._sort_key(item)
+        old_rank = handle._rank
+        handle._item = item
+        # keep the original sequence number, so the item doesn't lose its place among ties
+        handle._rank = sort_key, old_rank[1]
+        moved_up = handle._rank < old_rank
+        if handle is self._root:
+            if not moved_up:
+                # it may no longer come before its children
+                self._add_tree(self._detach_children(handle))
+        elif moved_up:
+            # its subtree is still in order; only its relation to its parent may be wrong
+            self._cut(handle)
+            self._add_tree(handle)
+        else:
+            # it may no longer come before its children
+            self._cut(handle)
+            self._add_tree(self._detach_children(handle))
+            self._add_tree(handle)
+
+    def remove(self, handle: PairingHeapHandle[T]) -> T:
+        """
+        Remove an item from anywhere in the PairingHeap.
+        The handle is no longer valid afterward.
+
+        Parameters
+        ----------
+        handle: PairingHeapHandle[T] - handle of the item to remove.
+
+        Returns
+        -------
+        T - the removed item.
+
+        Raises
+        ------
+        KeyError - `handle` has already been popped or removed.
+        """
+        self._check_handle(handle)
+        if handle is self._root:
+            return self.pop()
+        self._cut(handle)
+        self._add_tree(self._detach_children(handle))
+        self._count -= 1
+        return handle._item
+
+    def _iter_handles(self) -> Iterator[PairingHeapHandle[T]]:
+        """
+        Iterate over every node of the heap's tree, in no particular order.
+
+        Returns
+        -------
+        Iterator[PairingHeapHandle[T]] - every node.
+        """
+        stack = [] if self._root is None else [self._root]
+        while len(stack) > 0:
+            node = stack.pop()
+            yield node
+            if node._sibling is not None:
+                stack.append(node._sibling)
+            if node._child is not None:
+                stack.append(node._child)
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Check if an item equal to `item` is in the PairingHeap, in O(n) time.
+
+        Parameters
+        ----------
+        item: Any - item to search for.
+
+        Returns
+        -------
+        bool - `True` if the item is in the PairingHeap, `False` otherwise.
+        """
+        return any(handle._item == item for handle in self._iter_handles())
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items of the PairingHeap, in no particular order.
+        The PairingHeap must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[T] - items of the PairingHeap.
+        """
+        return (handle._item for handle in self._iter_handles())
+
+    def __len__(self) -> int:
+        """
+        Check the number of elements in the PairingHeap.
+
+        Returns
+        -------
+        int - number of elements in the PairingHeap.
+        """
+        return self._count
+
+    def is_empty(self) -> bool:
+        """
+        Check if the PairingHeap is empty or not.
+
+        Returns
+        -------
+        bool - `True` if there is no data in the PairingHeap, `False` otherwise.
+        """
+        return self._count == 0
+
+    def clear(self):
+        """
+        Empty all data from the PairingHeap. All handles become invalid.
+
+        Returns
+        -------
+        None
+        """
+        for handle in list(self._iter_handles()):
+            handle._child = handle._sibling = handle._prev = None
+        self._root = None
+        self._count = 0
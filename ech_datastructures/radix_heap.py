@@ -0,0 +1,295 @@
+from operator import itemgetter
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class RadixHeap(Generic[T]):
+    """
+    Monotone min-heap for non-negative integer keys, AKA a radix heap.
+    Each key added must be at least as large as the last key popped, as happens with
+    timers, event simulations, and Dijkstra's algorithm with integer weights.
+    In exchange, keys are never compared with each other when adding,
+    and each item is moved between buckets at most O(log C) times in total,
+    where C is the largest key.
+
+    Items are kept in buckets by the highest bit in which their key differs from the last key
+    popped. When the bucket of items equal to the last key runs out, the next non-empty bucket
+    is split up, using its smallest key as the new last key.
+
+    Equal keys come out in no particular order.
+
+    `T` represents the type of items being stored in the RadixHeap.
+    """
+    __slots__ = "_buckets", "_last", "_key", "_count"
+
+    def __init__(self, data: Iterable[T] = None, *, key: Callable[[T], int] = None):
+        """
+        Construct a RadixHeap.
+
+        Parameters
+        ----------
+        data: Iterable[T] (optional) - initial values for the RadixHeap to store.
+            If `None` (default), the RadixHeap starts with no contents.
+        key: Callable[(T) -> int] - function to determine an element's ordering value,
+            which must be a non-negative int. It is called once per element, when it is added.
+            If `None` (default), the elements must be non-negative ints themselves.
+
+        Raises
+        ------
+        TypeError - a key is not an int.
+        ValueError - a key is negative.
+        """
+        self._key = key
+        # bucket i holds (key, item) pairs where `(key ^ self._last).bit_length() == i`
+        self._buckets: List[List[Tuple[int, T]]] = [[]]
+        self._last = 0
+        self._count = 0
+        if data is not None:
+            self.update(data)
+
+    def _bucket_for(self, sort_key: int) -> List[Tuple[int, T]]:
+        """
+        Find (or make) the bucket that a key belongs in.
+
+        Parameters
+        ----------
+        sort_key: int - the key to place.
+
+        Returns
+        -------
+        List[Tuple[int, T]] - the bucket.
+        """
+        index = (sort_key ^ self._last).bit_length()
+        buckets = self._buckets
+        while len(buckets) <= index:
+            buckets.append([])
+        return buckets[index]
+
+    def _settle(self):
+        """
+        Make sure that bucket 0 (the items whose key is equal to the last key) is not empty,
+        by advancing the last key to the smallest key in the next non-empty bucket
+        and redistributing that bucket. The RadixHeap must not be empty.
+
+        Returns
+        -------
+        None
+        """
+        buckets = self._buckets
+        if len(buckets[0]) > 0:
+            return
+        index = 1
+        while len(buckets[index]) == 0:
+            index += 1
+        entries = buckets[index]
+        buckets[index] = []
+        self._last = min(entries, key=itemgetter(0))[0]
+        # every entry lands in a lower bucket than before
+        for entry in entries:
+            self._bucket_for(entry[0]).append(entry)
+
+    def _check_key(self, sort_key: Any):
+        """
+        Make sure a key can be added to the RadixHeap.
+
+        Parameters
+        ----------
+        sort_key: Any - the key to check.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError - `sort_key` is not an int.
+        ValueError - `sort_key` is less than the last key popped (or negative).
+        """
+        if not isinstance(sort_key, int):
+            raise TypeError(f"RadixHeap keys must be ints, not {type(sort_key).__name__}")
+        if sort_key < self._last:
+            raise ValueError(f"key {sort_key} is less than the last key popped ({self._last})")
+
+    @property
+    def last_key(self) -> int:
+        """
+        Get the smallest key that may be added to the RadixHeap:
+        the key of the last item popped or peeked (or 0, if there hasn't been one).
+
+        Returns
+        -------
+        int - the RadixHeap's current lower bound.
+        """
+        return self._last
+
+    def peek(self) -> T:
+        """
+        Return the next item from the RadixHeap but leave the RadixHeap unchanged.
+        Afterward, keys less than that item's key can no longer be added.
+
+        Returns
+        -------
+        T - next item (still in the RadixHeap).
+
+        Raises
+        ------
+        IndexError - RadixHeap was empty at the start of the operation; nothing to peek.
+        """
+        if self._count == 0:
+            raise IndexError("peek from empty RadixHeap")
+        self._settle()
+        return self._buckets[0][-1][1]
+
+    def pop(self) -> T:
+        """
+        Remove the next item from the RadixHeap and return it.
+
+        Returns
+        -------
+        T - next item (no longer in the RadixHeap).
+
+        Raises
+        ------
+        IndexError - RadixHeap was empty at the start of the operation; nothing to pop.
+        """
+        if self._count == 0:
+            raise IndexError("pop from empty RadixHeap")
+        self._settle()
+        self._count -= 1
+        return self._buckets[0].pop()[1]
+
+    def add(self, new_item: T):
+        """
+        Add a new item to the RadixHeap, in O(1) time.
+
+        Parameters
+        ----------
+        new_item: T - new item to add to the RadixHeap.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError - the item's key is not an int.
+        ValueError - the item's key is less than the last key popped (or negative).
+        """
+        sort_key = new_item if self._key is None else self._key(new_item)
+        self._check_key(sort_key)
+        self._bucket_for(sort_key).append((sort_key, new_item))
+        self._count += 1
+
+    def update(self, new_items: Iterable[T]):
+        """
+        Add multiple items to the RadixHeap by calling `RadixHeap.add` for each.
+
+        Parameters
+        ----------
+        new_items: Iterable[T] - items to add to the RadixHeap.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError - an item's key is not an int.
+        ValueError - an item's key is less than the last key popped (or negative).
+        """
+        for item in new_items:
+            self.add(item)
+
+    def merge(self, other: "RadixHeap[T]"):
+        """
+        Add all the items from another RadixHeap to this one, in O(k) time.
+        `other` is left unchanged.
+
+        Parameters
+        ----------
+        other: RadixHeap[T] - RadixHeap whose items should be added.
+            It must have been made with the same `key` (the same object) as this one.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError - `other` has a different key than this RadixHeap,
+            or has a key less than the last key popped from this RadixHeap.
+        """
+        # pylint: disable=protected-access
+        if other._key is not self._key:
+            raise ValueError("can only merge RadixHeaps with the same key")
+        entries = [entry for bucket in other._buckets for entry in bucket]
+        # check everything first, so that nothing is added if anything is out of range
+        if other._last < self._last:
+            for sort_key, _ in entries:
+                self._check_key(sort_key)
+        for entry in entries:
+            self._bucket_for(entry[0]).append(entry)
+        self._count += len(entries)
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Check if an item equal to `item` is in the RadixHeap, in O(n) time.
+
+        Parameters
+        ----------
+        item: Any - item to search for.
+
+        Returns
+        -------
+        bool - `True` if the item is in the RadixHeap, `False` otherwise.
+        """
+        return any(entry[1] == item for bucket in self._buckets for entry in bucket)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items of the RadixHeap, roughly (but not exactly) in order.
+        The RadixHeap must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[T] - items of the RadixHeap.
+        """
+        return (entry[1] for bucket in self._buckets for entry in bucket)
+
+    # the size queries are the same one-liners as every other heap's
+    # pylint: disable=duplicate-code
+    def __len__(self) -> int:
+        """
+        Check the number of elements in the RadixHeap.
+
+        Returns
+        -------
+        int - number of elements in the RadixHeap.
+        """
+        return self._count
+
+    def is_empty(self) -> bool:
+        """
+        Check if the RadixHeap is empty or not.
+
+        Returns
+        -------
+        bool - `True` if there is no data in the RadixHeap, `False` otherwise.
+        """
+        return self._count == 0
+
+    # pylint: enable=duplicate-code
+
+    def clear(self):
+        """
+        Empty all data from the RadixHeap, and allow any non-negative key to be added again.
+
+        Returns
+        -------
+        None
+        """
+        self._buckets = [[]]
+        self._last = 0
+        self._count = 0
@@ -0,0 +1,722 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence as SequenceABC
+from itertools import chain, islice
+from typing import Any, Callable, Generator, Generic, Iterable, Iterator, List, Optional, \
+    Tuple, TypeVar, Union
+
+
+T = TypeVar("T")
+
+# see `SortedList.update`; roughly how many single insertions cost as much as
+# re-sorting and re-chunking the whole list by one item
+_UPDATE_FACTOR = 16
+
+
+class SortedList(SequenceABC, Generic[T]):
+    """
+    A list which keeps its items in sorted order, allowing duplicates (AKA an ordered multiset).
+    Supports adding and removing items, bisection, counting, and indexing by position,
+    all in O(log(n)) time apart from the cost of shifting items within a single sublist.
+
+    The items are kept in a list of sorted sublists, each holding between `load / 2` and
+    `2 * load` items, and a Fenwick tree (binary indexed tree) over the sublist lengths
+    finds positions. Inserting shifts at most `2 * load` items, rather than the O(n)
+    of `bisect.insort` on one flat list.
+
+    Equal items (by key) stay in the order they were added.
+    Each item's key is computed only once, when the item is added.
+
+    `T` represents the type of items being stored in the SortedList.
+    """
+    __slots__ = "_lists", "_keys", "_maxes", "_index", "_len", "_key", "_load"
+
+    def __init__(self,
+                 data: Iterable[T] = None,
+                 *,
+                 key: Callable[[T], Any] = None,
+                 load: int = 1000):
+        """
+        Construct a SortedList.
+
+        Parameters
+        ----------
+        data: Iterable[T] (optional) - initial items for the SortedList to store.
+            If `None` (default), the SortedList starts with no contents.
+        key: Callable[(T) -> Any] - function to determine an item's ordering value.
+            It is called once per item, when the item is added.
+            Returned values are compared using the "less-than" operator: `key(e1) < key(e2)`.
+            If `None` (default), the items are compared directly.
+        load: int - the typical number of items in each sublist.
+            Default is 1000, which works well from thousands to many millions of items.
+
+        Raises
+        ------
+        ValueError - If `load` is less than 4.
+        """
+        if load < 4:
+            raise ValueError("load must be at least 4")
+        self._key = key
+        self._load = load
+        self._lists: List[List[T]] = []
+        # the keys of the items in `_lists`; when there is no key, this is `_lists` itself
+        self._keys: List[List[Any]] = self._lists if key is None else []
+        # the last (greatest) key of each sublist
+        self._maxes: List[Any] = []
+        # Fenwick tree over the sublist lengths; `None` when it needs to be rebuilt
+        self._index: Optional[List[int]] = None
+        self._len = 0
+        if data is not None:
+            self.update(data)
+
+    def _sort_key(self, item: T) -> Any:
+        """
+        Get the value an item is ordered by.
+
+        Parameters
+        ----------
+        item: T - the item.
+
+        Returns
+        -------
+        Any - `key(item)`, or the item itself if there is no key.
+        """
+        return item if self._key is None else self._key(item)
+
+    def _rebuild(self, items: List[T], keys: List[Any]):
+        """
+        Replace the contents of the SortedList, chunking sorted items into sublists.
+
+        Parameters
+        ----------
+        items: List[T] - the items, sorted.
+        keys: List[Any] - the keys of the items (or `items` itself, if there is no key).
+
+        Returns
+        -------
+        None
+        """
+        load = self._load
+        self._lists[:] = [items[i:i + load] for i in range(0, len(items), load)]
+        if self._key is not None:
+            self._keys[:] = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._maxes[:] = [sub_keys[-1] for sub_keys in self._keys]
+        self._index = None
+        self._len = len(items)
+
+    def _build_index(self) -> List[int]:
+        """
+        Build the Fenwick tree over the sublist lengths, in O(number of sublists) time.
+
+        Returns
+        -------
+        List[int] - the Fenwick tree, 1-based: entry `i` covers the `i & -i` sublists ending
+            at sublist `i - 1`.
+        """
+        index = [0]
+        index.extend(map(len, self._lists))
+        size = len(index)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                index[parent] += index[i]
+        self._index = index
+        return index
+
+    def _index_add(self, i: int, delta: int):
+        """
+        Record a change in the length of sublist `i` in the Fenwick tree (if it is built).
+
+        Parameters
+        ----------
+        i: int - which sublist changed.
+        delta: int - how much its length changed by.
+
+        Returns
+        -------
+        None
+        """
+        index = self._index
+        if index is None:
+            return
+        i += 1
+        size = len(index)
+        while i < size:
+            index[i] += delta
+            i += i & -i
+
+    def _position(self, i: int, j: int) -> int:
+        """
+        Convert a location (sublist `i`, offset `j`) into a position in the whole SortedList.
+
+        Parameters
+        ----------
+        i: int - which sublist.
+        j: int - the offset within that sublist.
+
+        Returns
+        -------
+        int - the position.
+        """
+        if i == 0:
+            return j
+        index = self._index if self._index is not None else self._build_index()
+        position = j
+        while i > 0:
+            position += index[i]
+            i -= i & -i
+        return position
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """
+        Convert a position in the whole SortedList into a location (sublist, offset).
+
+        Parameters
+        ----------
+        position: int - the position; must be in `[0, len(self))`.
+
+        Returns
+        -------
+        Tuple[int, int] - which sublist, and the offset within that sublist.
+        """
+        lists = self._lists
+        if position < len(lists[0]):
+            return 0, position
+        last_start = self._len - len(lists[-1])
+        if position >= last_start:
+            return len(lists) - 1, position - last_start
+        index = self._index if self._index is not None else self._build_index()
+        # descend the Fenwick tree, skipping whole groups of sublists that come before `position`
+        i = 0
+        step = 1 << (len(index) - 1).bit_length()
+        while step > 0:
+            next_i = i + step
+            if next_i < len(index) and index[next_i] <= position:
+                position -= index[next_i]
+                i = next_i
+            step >>= 1
+        return i, position
+
+    def _split(self, i: int):
+        """
+        Split sublist `i` in half.
+
+        Parameters
+        ----------
+        i: int - which sublist.
+
+        Returns
+        -------
+        None
+        """
+        load = self._load
+        for lists in (self._lists,) if self._key is None else (self._lists, self._keys):
+            lists.insert(i + 1, lists[i][load:])
+            del lists[i][load:]
+        self._maxes.insert(i, self._keys[i][-1])
+        self._index = None
+
+    def _delete(self, i: int, j: int) -> T:
+        """
+        Remove the item at a location, merging its sublist into a neighbor if it gets too short.
+
+        Parameters
+        ----------
+        i: int - which sublist.
+        j: int - the offset within that sublist.
+
+        Returns
+        -------
+        T - the removed item.
+        """
+        lists, keys, maxes = self._lists, self._keys, self._maxes
+        item = lists[i].pop(j)
+        if self._key is not None:
+            del keys[i][j]
+        self._len -= 1
+        if len(lists[i]) == 0:
+            del lists[i]
+            if self._key is not None:
+                del keys[i]
+            del maxes[i]
+            self._index = None
+            return item
+        maxes[i] = keys[i][-1]
+        self._index_add(i, -1)
+        if len(lists[i]) < self._load // 2 and len(lists) > 1:
+            # merge with the next sublist (or the previous one, for the last sublist)
+            if i == len(lists) - 1:
+                i -= 1
+            for sublists in (lists,) if self._key is None else (lists, keys):
+                sublists[i].extend(sublists[i + 1])
+                del sublists[i + 1]
+            maxes[i] = keys[i][-1]
+            del maxes[i + 1]
+            self._index = None
+            if len(lists[i]) > 2 * self._load:
+                self._split(i)
+        return item
+
+    def _find(self, item: Any) -> Optional[Tuple[int, int]]:
+        """
+        Find the location of the first item equal to `item`.
+
+        Parameters
+        ----------
+        item: Any - the item to search for.
+
+        Returns
+        -------
+        Optional[Tuple[int, int]] - which sublist, and the offset within that sublist,
+            or `None` if there is no such item.
+        """
+        sort_key = self._sort_key(item)
+        lists, keys = self._lists, self._keys
+        i = bisect_left(self._maxes, sort_key)
+        if i == len(lists):
+            return None
+        j = bisect_left(keys[i], sort_key)
+        # items with equal keys aren't necessarily equal; check each of them
+        while i < len(lists):
+            sub_keys, sub_items = keys[i], lists[i]
+            while j < len(sub_items):
+                if sort_key < sub_keys[j]:
+                    return None
+                if sub_items[j] == item:
+                    return i, j
+                j += 1
+            i += 1
+            j = 0
+        return None
+
+    def _index_to_position(self, index: int) -> int:
+        """
+        Convert a (possibly negative) index into a position in `[0, len(self))`.
+
+        Parameters
+        ----------
+        index: int - The index to convert; negative values count from the end.
+
+        Raises
+        ------
+        IndexError - If the index is out of range.
+
+        Returns
+        -------
+        int - The non-negative position.
+        """
+        position = index + self._len if index < 0 else index
+        if not 0 <= position < self._len:
+            raise IndexError("SortedList index out of range")
+        return position
+
+    def add(self, item: T):
+        """
+        Add an item to the SortedList, after any equal items.
+
+        Parameters
+        ----------
+        item: T - the item to add.
+
+        Returns
+        -------
+        None
+        """
+        sort_key = self._sort_key(item)
+        lists, keys, maxes = self._lists, self._keys, self._maxes
+        if len(maxes) == 0:
+            lists.append([item])
+            if self._key is not None:
+                keys.append([sort_key])
+            maxes.append(sort_key)
+            self._index = None
+            self._len = 1
+            return
+        i = bisect_right(maxes, sort_key)
+        if i == len(maxes):
+            # goes at the very end
+            i -= 1
+            lists[i].append(item)
+            if self._key is not None:
+                keys[i].append(sort_key)
+            maxes[i] = sort_key
+        else:
+            j = bisect_right(keys[i], sort_key)
+            lists[i].insert(j, item)
+            if self._key is not None:
+                keys[i].insert(j, sort_key)
+        self._len += 1
+        self._index_add(i, 1)
+        if len(lists[i]) > 2 * self._load:
+            self._split(i)
+
+    def update(self, items: Iterable[T]):
+        """
+        Add multiple items to the SortedList.
+        Small batches are added with `SortedList.add`. Batches that are large compared to
+        the SortedList are sorted together with the existing items, and the sublists are
+        rebuilt, which is faster since the existing items are already in order.
+
+        Parameters
+        ----------
+        items: Iterable[T] - the items to add.
+
+        Returns
+        -------
+        None
+        """
+        items = list(items)
+        if len(items) * _UPDATE_FACTOR < self._len:
+            for item in items:
+                self.add(item)
+            return
+        # existing items come first, and the sorts are stable, so equal items stay in order
+        all_items = list(chain.from_iterable(self._lists))
+        all_items.extend(items)
+        if self._key is None:
+            all_items.sort()
+            self._rebuild(all_items, all_items)
+            return
+        all_keys = list(chain.from_iterable(self._keys))
+        all_keys.extend(map(self._key, items))
+        order = sorted(range(len(all_keys)), key=all_keys.__getitem__)
+        self._rebuild([all_items[i] for i in order], [all_keys[i] for i in order])
+
+    def remove(self, item: T):
+        """
+        Remove the first item equal to `item` from the SortedList.
+
+        Parameters
+        ----------
+        item: T - the item to remove.
+
+        Raises
+        ------
+        ValueError - If there is no equal item in the SortedList.
+
+        Returns
+        -------
+        None
+        """
+        location = self._find(item)
+        if location is None:
+            raise ValueError(f"{item!r} is not in list")
+        self._delete(*location)
+
+    def discard(self, item: T):
+        """
+        Remove the first item equal to `item` from the SortedList, if there is one.
+
+        Parameters
+        ----------
+        item: T - the item to remove.
+
+        Returns
+        -------
+        None
+        """
+        location = self._find(item)
+        if location is not None:
+            self._delete(*location)
+
+    def pop(self, index: int = -1) -> T:
+        """
+        Remove and return the item at the given position.
+
+        Parameters
+        ----------
+        index: int - The position of the item; negative values count from the end.
+            Default is -1, the greatest item.
+
+        Raises
+        ------
+        IndexError - If the SortedList is empty, or the index is out of range.
+
+        Returns
+        -------
+        T - the removed item.
+        """
+        if self._len == 0:
+            raise IndexError("pop from empty SortedList")
+        return self._delete(*self._locate(self._index_to_position(index)))
+
+    def clear(self):
+        """
+        Empty all data from the SortedList.
+
+        Returns
+        -------
+        None
+        """
+        self._lists.clear()
+        self._keys.clear()
+        self._maxes.clear()
+        self._index = None
+        self._len = 0
+
+    def bisect_key_left(self, sort_key: Any) -> int:
+        """
+        Find the position of the first item whose key is not less than the given key.
+
+        Parameters
+        ----------
+        sort_key: Any - the key to compare against.
+
+        Returns
+        -------
+        int - The number of items in the SortedList whose keys are less than `sort_key`.
+        """
+        i = bisect_left(self._maxes, sort_key)
+        if i == len(self._maxes):
+            return self._len
+        return self._position(i, bisect_left(self._keys[i], sort_key))
+
+    def bisect_key_right(self, sort_key: Any) -> int:
+        """
+        Find the position just after the last item whose key is not greater than the given key.
+
+        Parameters
+        ----------
+        sort_key: Any - the key to compare against.
+
+        Returns
+        -------
+        int - The number of items in the SortedList whose keys are less than or equal to
+            `sort_key`.
+        """
+        i = bisect_right(self._maxes, sort_key)
+        if i == len(self._maxes):
+            return self._len
+        return self._position(i, bisect_right(self._keys[i], sort_key))
+
+    def bisect_left(self, item: T) -> int:
+        """
+        Find the position where the given item would be inserted, before any equal items.
+
+        Parameters
+        ----------
+        item: T - the item to compare against; it doesn't need to be in the SortedList.
+
+        Returns
+        -------
+        int - The number of items in the SortedList that come before `item`.
+        """
+        return self.bisect_key_left(self._sort_key(item))
+
+    def bisect_right(self, item: T) -> int:
+        """
+        Find the position where the given item would be inserted, after any equal items.
+
+        Parameters
+        ----------
+        item: T - the item to compare against; it doesn't need to be in the SortedList.
+
+        Returns
+        -------
+        int - The number of items in the SortedList that come before or tie with `item`.
+        """
+        return self.bisect_key_right(self._sort_key(item))
+
+    def count(self, value: Any) -> int:
+        """
+        Count the items equal to `value`, in O(log(n) + k) time where k is the number of items
+        with the same key.
+
+        Parameters
+        ----------
+        value: Any - the value to count.
+
+        Returns
+        -------
+        int - the number of equal items.
+        """
+        if self._key is None:
+            return self.bisect_right(value) - self.bisect_left(value)
+        start = self.bisect_left(value)
+        stop = self.bisect_right(value)
+        return sum(1 for other in self.islice(start, stop) if other == value)
+
+    def index(self, value: Any, start: int = 0, stop: int = None) -> int:
+        """
+        Find the position of the first item equal to `value`, in O(log(n)) time
+        (plus the number of items with the same key, but not equal).
+
+        Parameters
+        ----------
+        value: Any - the value to search for.
+        start: int - the position to start searching at. Default is 0.
+        stop: int - the position to stop searching at. If None (default), searches to the end.
+
+        Raises
+        ------
+        ValueError - If there is no equal item in the SortedList (within the given bounds).
+
+        Returns
+        -------
+        int - the position of the item.
+        """
+        start, stop, _ = slice(start, stop).indices(self._len)
+        location = self._find(value)
+        if location is not None:
+            position = self._position(*location)
+            if position < start:
+                # look further along, among the items with the same key
+                for position in range(start, min(stop, self.bisect_right(value))):
+                    if self[position] == value:
+                        return position
+            elif position < stop:
+                return position
+        raise ValueError(f"{value!r} is not in list")
+
+    def islice(self, start: int = None, stop: int = None) -> Generator[T, None, None]:
+        """
+        Iterate over the items at positions `start` (inclusive) through `stop` (exclusive),
+        in sorted order. Indexing follows the same rules as slicing a list:
+        negative values count from the end, and out-of-range values are clipped.
+
+        Parameters
+        ----------
+        start: int - The position of the first item. If None (default), starts at the beginning.
+        stop: int - The position just past the last item. If None (default), goes to the end.
+
+        Returns
+        -------
+        Generator[T, None, None] - lazily generates the items in the slice.
+        """
+        start, stop, _ = slice(start, stop).indices(self._len)
+        if start >= stop:
+            return
+        remaining = stop - start
+        i, j = self._locate(start)
+        for sub_items in islice(self._lists, i, None):
+            chunk = sub_items[j:j + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            if remaining == 0:
+                return
+            j = 0
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Check if an item equal to `item` is in the SortedList.
+
+        Parameters
+        ----------
+        item: Any - item to search for.
+
+        Returns
+        -------
+        bool - `True` if the item is in the SortedList, `False` otherwise.
+        """
+        return self._find(item) is not None
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        """
+        Get the item (or items) at the given position(s), like indexing a list.
+
+        Parameters
+        ----------
+        index: Union[int, slice] - The position of the item, or a slice of positions.
+            Negative values count from the end.
+
+        Raises
+        ------
+        IndexError - If a single index is out of range.
+
+        Returns
+        -------
+        Union[T, List[T]] - The item at the given position, or a list of items for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.islice(start, stop))
+        i, j = self._locate(self._index_to_position(index))
+        return self._lists[i][j]
+
+    def __delitem__(self, index: Union[int, slice]):
+        """
+        Remove the item (or items) at the given position(s), like deleting from a list.
+
+        Parameters
+        ----------
+        index: Union[int, slice] - The position of the item, or a slice of positions.
+            Negative values count from the end.
+
+        Raises
+        ------
+        IndexError - If a single index is out of range.
+
+        Returns
+        -------
+        None
+        """
+        if isinstance(index, slice):
+            # from the back, so that the earlier positions don't move
+            for position in sorted(range(*index.indices(self._len)), reverse=True):
+                self._delete(*self._locate(position))
+            return
+        self._delete(*self._locate(self._index_to_position(index)))
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the items, in sorted order.
+        The SortedList must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[T] - the items, in sorted order.
+        """
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        Iterate over the items, in reverse sorted order.
+        The SortedList must not be modified during iteration.
+
+        Returns
+        -------
+        Iterator[T] - the items, in reverse sorted order.
+        """
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
+
+    def __len__(self) -> int:
+        """
+        Check the number of items in the SortedList.
+
+        Returns
+        -------
+        int - number of items in the SortedList.
+        """
+        return self._len
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Check if the SortedList is equal to another object.
+        The other object will not be considered equal if it is of any other class.
+
+        Parameters
+        ----------
+        other: Any - The object to compare to.
+
+        Returns
+        -------
+        bool - True if `other` is also a SortedList and has equal items in the same order,
+            False otherwise.
+        """
+        if not isinstance(other, self.__class__):
+            return False
+        return self._len == other._len and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the SortedList.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the SortedList.
+        """
+        return f"{self.__class__.__name__}(len={self._len})"
+
+    __hash__ = None
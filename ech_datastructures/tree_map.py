@@ -1,63 +1,112 @@
-from collections.abc import Iterable as IterableABC, Mapping as MappingABC
-from itertools import chain
-from typing import Any, Generator, Generic, Iterable, List, Mapping, Optional, Tuple, TypeVar, Union
+# pylint: disable=too-many-lines
+from abc import abstractmethod
+from collections.abc import Iterable as IterableABC, ItemsView, KeysView, Mapping as MappingABC, \
+    MappingView, ValuesView
+from operator import itemgetter
+from typing import Any, Callable, Generator, Generic, Iterable, List, Mapping, Optional, Tuple, \
+    TypeVar, Union
 
 
 K = TypeVar("K")
 V = TypeVar("V")
 
+# see `TreeMap.update`; roughly how many levels of descent an insertion can do
+# in the time it takes to rebuild the tree by one key/value pair
+_REBUILD_FACTOR = 5
 
-class _TreeMapNode(Generic[K, V]):
+
+def _height(node: Optional["_TreeMapNode"]) -> int:
     """
-    Intended only as a "helper class" to TreeMap.
-    Stores a single key/value pair, as well as connections that define the tree structure.
+    Get the height of a subtree, where an empty subtree has height 0.
+
+    Parameters
+    ----------
+    node: Optional[_TreeMapNode] - The root of the subtree, or None for an empty subtree.
+
+    Returns
+    -------
+    int - The height of the subtree.
+    """
+    return 0 if node is None else node.height
+
+
+def _size(node: Optional["_TreeMapNode"]) -> int:
+    """
+    Get the number of nodes in a subtree, where an empty subtree has size 0.
+
+    Parameters
+    ----------
+    node: Optional[_TreeMapNode] - The root of the subtree, or None for an empty subtree.
+
+    Returns
+    -------
+    int - The number of nodes in the subtree.
+    """
+    return 0 if node is None else node.size
+
+
+class _TreeNode(Generic[K]):
+    """
+    Intended only as a "helper class" to TreeMap and TreeSet.
+    Stores a single key, as well as connections that define the tree structure.
+    Each node also caches the height and size of its subtree, which are kept up to date
+    through every insertion, removal, and rotation.
     """
-    __slots__ = "key", "value", "left", "right", "parent"
+    __slots__ = "key", "left", "right", "parent", "height", "size"
 
     def __init__(self,
                  key: K,
-                 value: V,
                  *,
-                 left: "_TreeMapNode[K, V]" = None,
-                 right: "_TreeMapNode[K, V]" = None,
-                 parent: "_TreeMapNode[K, V]" = None):
+                 left: "_TreeNode[K]" = None,
+                 right: "_TreeNode[K]" = None,
+                 parent: "_TreeNode[K]" = None):
         """
         Construct a node of a binary tree.
-        TODO: make it self-balancing
+        The tree is kept balanced as an AVL tree; see `rebalance`.
 
         Parameters
         ----------
         key: K - the key used for sorting and comparing this node against others.
-        value: T - the value to be stored in this node.
-        left: _TreeMapNode[K, V] - the left child of this node, default is None.
-        right: _TreeMapNode[K, V] - the right child of this node, default is None.
-        parent: _TreeMapNode[K, V] - the parent of this node, default is None.
+        left: _TreeNode[K] - the left child of this node, default is None.
+        right: _TreeNode[K] - the right child of this node, default is None.
+        parent: _TreeNode[K] - the parent of this node, default is None.
         """
         self.key = key
-        self.value = value
         self.left = left
         self.right = right
         self.parent = parent
+        self.height = 1 + max(_height(left), _height(right))
+        self.size = 1 + _size(left) + _size(right)
 
-    def __iter__(self) -> Generator["_TreeMapNode[K, V]", None, None]:
+    def __iter__(self) -> Generator["_TreeNode[K]", None, None]:
         """
         Iterate over the subtree starting at this node,
         in order from least to greatest (by key).
 
+        Uses an explicit stack rather than recursion, so each node is visited once
+        and the depth of the tree is not limited by Python's recursion limit.
+
         Returns
         -------
-        Generator[_TreeMapNode[K, V], None, None] -
+        Generator[_TreeNode[K], None, None] -
             lazily generates the nodes from least to greatest
         """
-        if self.left is not None:
-            for descendant in self.left:
-                yield descendant
-        yield self
-        if self.right is not None:
-            for descendant in self.right:
-                yield descendant
-
-    def get(self, key: K) -> Optional["_TreeMapNode[K, V]"]:
+        # ancestors whose left subtrees are in progress, but which haven't been yielded yet
+        stack: List["_TreeNode[K]"] = []
+        node: Optional["_TreeNode[K]"] = self
+        while True:
+            # walk as far left as possible, remembering the way back up
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            if len(stack) == 0:
+                return
+            node = stack.pop()
+            yield node
+            # the left subtree and the node itself are done; move on to the right subtree
+            node = node.right
+
+    def get(self, key: K) -> Optional["_TreeNode[K]"]:
         """
         Return the node for the given key if the key is in the subtree starting at this node.
         If the key is not in this subtree, None is returned.
@@ -68,133 +117,450 @@ class _TreeMapNode(Generic[K, V]):
 
         Returns
         -------
-        Optional[_TreeMapNode[K, V]] - The node with the given key,
+        Optional[_TreeNode[K]] - The node with the given key,
             None if there is no node with the given key.
         """
-        # compare the keys
-        if key == self.key:
-            # found it!
-            return self
-        if key < self.key:
-            # go left (if we can)
-            if self.left is None:
-                return None  # dead end
-            return self.left.get(key)
-        # else:  # key > self.key
-        # go right (if we can)
-        if self.right is None:
-            return None  # dead end
-        return self.right.get(key)
+        node = self
+        while node is not None:
+            # compare the keys
+            if key == node.key:
+                # found it!
+                return node
+            if key < node.key:
+                node = node.left  # go left
+            else:  # key > node.key
+                node = node.right  # go right
+        return None  # dead end
+
+    def first(self) -> "_TreeNode[K]":
+        """
+        Find the node with the least key in the subtree starting at this node.
+
+        Returns
+        -------
+        _TreeNode[K] - The leftmost node of this subtree.
+        """
+        node = self
+        while node.left is not None:
+            node = node.left
+        return node
 
-    def get_set_default(self, key: K, default: V = None) -> Optional["_TreeMapNode[K, V]"]:
+    def last(self) -> "_TreeNode[K]":
         """
-        If key is in the subtree starting at this node, return its value.
-        If not, insert key with a value of default and return None.
+        Find the node with the greatest key in the subtree starting at this node.
+
+        Returns
+        -------
+        _TreeNode[K] - The rightmost node of this subtree.
+        """
+        node = self
+        while node.right is not None:
+            node = node.right
+        return node
+
+    def successor(self) -> Optional["_TreeNode[K]"]:
+        """
+        Find the node that comes right after this one in the whole tree, using parent pointers.
+        Stepping through the whole tree this way costs amortized O(1) per step.
+
+        Returns
+        -------
+        Optional[_TreeNode[K]] - The node with the next greater key,
+            or None if this node has the greatest key in the tree.
+        """
+        if self.right is not None:
+            return self.right.first()
+        # climb until we come up out of a left subtree
+        node = self
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
+
+    def predecessor(self) -> Optional["_TreeNode[K]"]:
+        """
+        Find the node that comes right before this one in the whole tree, using parent pointers.
+        Stepping through the whole tree this way costs amortized O(1) per step.
+
+        Returns
+        -------
+        Optional[_TreeNode[K]] - The node with the next lesser key,
+            or None if this node has the least key in the tree.
+        """
+        if self.left is not None:
+            return self.left.last()
+        # climb until we come up out of a right subtree
+        node = self
+        while node.parent is not None and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+    def ceiling(self, key: K, inclusive: bool = True) -> Optional["_TreeNode[K]"]:
+        """
+        Find the node with the least key that is greater than (or equal to) the given key,
+        in the subtree starting at this node.
 
         Parameters
         ----------
-        key: K - The key to search for and retrieve a value for.
-        default: V - The value to insert if the key is not initially present.
-            None, by default.
+        key: K - The key to compare against.
+        inclusive: bool - If True (default), a node with a key equal to `key` can be returned.
+            If False, the returned node's key must be strictly greater than `key`.
 
         Returns
         -------
-        Optional[_TreeMapNode[K, V]] - The node with the given key,
-            or None if the key is not initially present and default was inserted.
+        Optional[_TreeNode[K]] - The matching node, or None if there is none.
         """
-        # compare the keys
-        if key == self.key:
-            # found it!
-            return self
-        if key < self.key:
-            # go left (if we can)
-            if self.left is None:
-                # dead end; insert here
-                self.left = _TreeMapNode(key, default, parent=self)
-            return self.left.get_set_default(key, default)
-        # else:  # key > self.key
-        # go right (if we can)
-        if self.right is None:
-            # dead end; insert here
-            self.right = _TreeMapNode(key, default, parent=self)
-        return self.right.get_set_default(key, default)
+        best = None
+        node = self
+        while node is not None:
+            if (not node.key < key) if inclusive else (key < node.key):
+                # this one works, but there may be a lesser one that still works
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best
 
-    # pylint: disable=too-many-branches
-    def remove(self, key: K) -> V:
+    def floor(self, key: K, inclusive: bool = True) -> Optional["_TreeNode[K]"]:
         """
-        If key is in the subtree starting at this node, remove it and return its value.
-        If the key is not in this subtree, a KeyError is raised.
+        Find the node with the greatest key that is less than (or equal to) the given key,
+        in the subtree starting at this node.
 
         Parameters
         ----------
-        key: K - The key to search for and remove.
+        key: K - The key to compare against.
+        inclusive: bool - If True (default), a node with a key equal to `key` can be returned.
+            If False, the returned node's key must be strictly less than `key`.
 
-        Raises
-        ------
-        KeyError - If the key is not in this subtree.
+        Returns
+        -------
+        Optional[_TreeNode[K]] - The matching node, or None if there is none.
+        """
+        best = None
+        node = self
+        while node is not None:
+            if (not key < node.key) if inclusive else (node.key < key):
+                # this one works, but there may be a greater one that still works
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def bisect(self, key: K, right: bool = False) -> int:
+        """
+        Count the nodes in the subtree starting at this node with keys less than the given key
+        (or less than or equal to it), using the cached subtree sizes.
+
+        Parameters
+        ----------
+        key: K - The key to compare against.
+        right: bool - If False (default), count keys `< key`. If True, count keys `<= key`.
 
         Returns
         -------
-        V - The value associated with the given key.
+        int - The number of keys before `key`, i.e. where `key` would be inserted in sorted order.
         """
-        # compare the keys
-        if key == self.key:
-            # found it!
-            removed = self.value
-            if self.left is None:
-                # re-point the parent to the right child of this one
-                if self.parent.left is self:
-                    self.parent.left = self.right
-                else:  # self.parent.right is self:
-                    self.parent.right = self.right
-                # re-point the right child of this one to its new parent
-                if self.right is not None:
-                    self.right.parent = self.parent
-                # even though `self` has outdated pointers, nothing now points to it
-            # self.left is not None
-            elif self.right is None:
-                # re-point the parent to the left child of this one
-                if self.parent.left is self:
-                    self.parent.left = self.left
-                else:  # self.parent.right is self
-                    self.parent.right = self.left
-                # re-point the left child of this one to its new parent
-                if self.left is not None:
-                    self.left.parent = self.parent
-                # even though `self` has outdated pointers, nothing now points to it
-            # neither self.left nor self.right is None
+        count = 0
+        node = self
+        while node is not None:
+            if (not key < node.key) if right else (node.key < key):
+                # this node and everything to its left come before the key
+                count += _size(node.left) + 1
+                node = node.right
             else:
-                # go find the "in-order predecessor
-                current = self.left
-                while current.right is not None:
-                    current = current.right
-                # put its value into the current one
-                self.key = current.key
-                self.value = current.value
-                # remove the lower one
-                current.remove(current.key)
-                # even thought that call to current.remove is recursive,
-                # we know it's already at the node it needs to remove,
-                # and that that node has no right child,
-                # so it will not recurse again
-            return removed
-        if key < self.key:
-            if self.left is None:
-                # dead end
-                raise KeyError(key)
-            # keep walking
-            return self.left.remove(key)
-        # else:  # key > self.key
-        if self.right is None:
-            # dead end
-            raise KeyError(key)
-        # keep walking
-        return self.right.remove(key)
+                node = node.left
+        return count
+
+    def select(self, index: int) -> "_TreeNode[K]":
+        """
+        Find the node at a given position (in sorted order) in the subtree starting at this node,
+        using the cached subtree sizes.
+
+        Parameters
+        ----------
+        index: int - The position of the node to find; must be in `[0, self.size)`.
+
+        Returns
+        -------
+        _TreeNode[K] - The node at the given position.
+        """
+        node = self
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def insert(self, key: K) -> Tuple["_TreeNode[K]", bool]:
+        """
+        If key is in the subtree starting at this node, return its node.
+        If not, insert a new node (of the same class as this one) for key and return it.
+        The tree is NOT rebalanced here; if a node was inserted,
+        the caller should call `rebalance` on the new node.
+
+        Parameters
+        ----------
+        key: K - The key to search for, or insert.
+
+        Returns
+        -------
+        Tuple[_TreeNode[K], bool] - The node with the given key, and
+            True if the key was not initially present and a node was inserted, False otherwise.
+        """
+        node = self
+        while True:
+            # compare the keys
+            if key == node.key:
+                # found it!
+                return node, False
+            if key < node.key:
+                # go left (if we can)
+                if node.left is None:
+                    # dead end; insert here
+                    node.left = self.__class__(key, parent=node)
+                    return node.left, True
+                node = node.left
+            else:  # key > node.key
+                # go right (if we can)
+                if node.right is None:
+                    # dead end; insert here
+                    node.right = self.__class__(key, parent=node)
+                    return node.right, True
+                node = node.right
+
+    def take_contents(self, other: "_TreeNode[K]"):
+        """
+        Copy the contents (but not the connections) of another node into this one.
+
+        Parameters
+        ----------
+        other: _TreeNode[K] - The node to copy from.
+
+        Returns
+        -------
+        None
+        """
+        self.key = other.key
 
-    def set(self, key: K, value: V) -> bool:
+    def detach(self) -> Optional["_TreeNode[K]"]:
+        """
+        Remove this node from its tree, then rebalance the tree.
+        If this node has two children, the contents of its in-order predecessor are moved into
+        this node, and the predecessor's node is the one actually unlinked from the tree.
+
+        Returns
+        -------
+        Optional[_TreeNode[K]] - The root of the tree after the removal,
+            or None if the tree is now empty.
+        """
+        node = self
+        if node.left is not None and node.right is not None:
+            # go find the in-order predecessor
+            predecessor = node.left
+            while predecessor.right is not None:
+                predecessor = predecessor.right
+            # put its contents into this node, then unlink the predecessor instead;
+            # the predecessor has no right child, so it's one of the easy cases below
+            node.take_contents(predecessor)
+            node = predecessor
+        # node has at most one child; splice that child (if any) into the node's place
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        if child is not None:
+            child.parent = parent
+        if parent is None:
+            # removed the root; the child (which is at most a leaf) is the new root
+            return child
+        if parent.left is node:
+            parent.left = child
+        else:  # parent.right is node
+            parent.right = child
+        # even though `node` has outdated pointers, nothing now points to it
+        return parent.rebalance()
+
+    def refresh(self):
+        """
+        Recompute the cached `height` and `size` of this node from its children.
+
+        Returns
+        -------
+        None
+        """
+        self.height = 1 + max(_height(self.left), _height(self.right))
+        self.size = 1 + _size(self.left) + _size(self.right)
+
+    def balance_factor(self) -> int:
+        """
+        Compare the heights of the two subtrees of this node.
+
+        Returns
+        -------
+        int - Height of the left subtree minus height of the right subtree.
+            Anything outside [-1, 1] violates the AVL balance condition.
+        """
+        return _height(self.left) - _height(self.right)
+
+    def rotate_left(self) -> "_TreeNode[K]":
+        """
+        Rotate the subtree starting at this node to the left:
+        this node's right child takes this node's place, and this node becomes its left child.
+
+        Returns
+        -------
+        _TreeNode[K] - The new root of the subtree (formerly the right child).
+        """
+        pivot = self.right
+        # the pivot's left subtree moves across to be this node's right subtree
+        self.right = pivot.left
+        if pivot.left is not None:
+            pivot.left.parent = self
+        # the pivot takes this node's place under the parent
+        pivot.parent = self.parent
+        if self.parent is not None:
+            if self.parent.left is self:
+                self.parent.left = pivot
+            else:  # self.parent.right is self
+                self.parent.right = pivot
+        # this node goes under the pivot
+        pivot.left = self
+        self.parent = pivot
+        # this node is now below the pivot, so it must be refreshed first
+        self.refresh()
+        pivot.refresh()
+        return pivot
+
+    def rotate_right(self) -> "_TreeNode[K]":
+        """
+        Rotate the subtree starting at this node to the right:
+        this node's left child takes this node's place, and this node becomes its right child.
+
+        Returns
+        -------
+        _TreeNode[K] - The new root of the subtree (formerly the left child).
+        """
+        pivot = self.left
+        # the pivot's right subtree moves across to be this node's left subtree
+        self.left = pivot.right
+        if pivot.right is not None:
+            pivot.right.parent = self
+        # the pivot takes this node's place under the parent
+        pivot.parent = self.parent
+        if self.parent is not None:
+            if self.parent.left is self:
+                self.parent.left = pivot
+            else:  # self.parent.right is self
+                self.parent.right = pivot
+        # this node goes under the pivot
+        pivot.right = self
+        self.parent = pivot
+        # this node is now below the pivot, so it must be refreshed first
+        self.refresh()
+        pivot.refresh()
+        return pivot
+
+    def rebalance(self) -> "_TreeNode[K]":
+        """
+        Walk from this node up to the root of its tree, refreshing each node's cached height
+        and size, and rotating wherever the AVL balance condition is violated.
+        Should be called on the lowest node whose subtree changed shape after an insertion or
+        removal, which keeps every operation on the tree O(log(n)).
+
+        Returns
+        -------
+        _TreeNode[K] - The root of the whole tree, which may have changed.
+        """
+        node = self
+        while True:
+            node.refresh()
+            balance = node.balance_factor()
+            if balance > 1:  # left side is too tall
+                if node.left.balance_factor() < 0:
+                    # left-right case; straighten it out into the left-left case first
+                    node.left.rotate_left()
+                node = node.rotate_right()
+            elif balance < -1:  # right side is too tall
+                if node.right.balance_factor() > 0:
+                    # right-left case; straighten it out into the right-right case first
+                    node.right.rotate_right()
+                node = node.rotate_left()
+            if node.parent is None:
+                return node
+            node = node.parent
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the node.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the node.
+        """
+        return f"{self.__class__.__name__}(key={self.key})"
+
+
+class _TreeMapNode(_TreeNode, Generic[K, V]):
+    """
+    Intended only as a "helper class" to TreeMap.
+    A tree node which also stores the value for its key.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self,
+                 key: K,
+                 value: V = None,
+                 *,
+                 left: "_TreeMapNode[K, V]" = None,
+                 right: "_TreeMapNode[K, V]" = None,
+                 parent: "_TreeMapNode[K, V]" = None):
+        """
+        Construct a node of a binary tree, holding a key/value pair.
+        See `_TreeNode`.
+
+        Parameters
+        ----------
+        key: K - the key used for sorting and comparing this node against others.
+        value: V - the value to be stored in this node, default is None.
+        left: _TreeMapNode[K, V] - the left child of this node, default is None.
+        right: _TreeMapNode[K, V] - the right child of this node, default is None.
+        parent: _TreeMapNode[K, V] - the parent of this node, default is None.
+        """
+        super().__init__(key, left=left, right=right, parent=parent)
+        self.value = value
+
+    def get_set_default(self, key: K, default: V = None) -> Tuple["_TreeMapNode[K, V]", bool]:
+        """
+        If key is in the subtree starting at this node, return its node.
+        If not, insert key with a value of default and return the new node.
+        The tree is NOT rebalanced here; if a node was inserted,
+        the caller should call `rebalance` on the new node.
+
+        Parameters
+        ----------
+        key: K - The key to search for and retrieve a value for.
+        default: V - The value to insert if the key is not initially present.
+            None, by default.
+
+        Returns
+        -------
+        Tuple[_TreeMapNode[K, V], bool] - The node with the given key, and
+            True if the key was not initially present and default was inserted, False otherwise.
+        """
+        node, is_new = self.insert(key)
+        if is_new:
+            node.value = default
+        return node, is_new
+
+    def set(self, key: K, value: V) -> Optional["_TreeMapNode[K, V]"]:
         """
         Set the given key's value to the given value, in the subtree starting at this node.
         Can be used to overwrite the value of an existing key, or to insert a new key/value pair.
+        The tree is NOT rebalanced here; if a node was inserted,
+        the caller should call `rebalance` on the new node.
 
         Parameters
         ----------
@@ -203,27 +569,22 @@ class _TreeMapNode(Generic[K, V]):
 
         Returns
         -------
-        bool - True if the key was newly added, False if the key was already present.
+        Optional[_TreeMapNode[K, V]] - The newly added node,
+            or None if the key was already present (and its value was overwritten).
         """
-        # compare the keys
-        if key == self.key:
-            # in-place replacement
-            self.value = value
-            return False
-        if key < self.key:
-            if self.left is None:
-                # found the spot to add it
-                self.left = _TreeMapNode(key, value, parent=self)
-                return True
-            # keep walking
-            return self.left.set(key, value)
-        # else:  # key > self.key
-        if self.right is None:
-            # found the spot to add it
-            self.right = _TreeMapNode(key, value, parent=self)
-            return True
-        # keep walking
-        return self.right.set(key, value)
+        node, is_new = self.get_set_default(key, value)
+        if is_new:
+            return node
+        # else: in-place replacement
+        node.value = value
+        return None
+
+    def take_contents(self, other: "_TreeMapNode[K, V]"):
+        """
+        See `_TreeNode.take_contents`.
+        """
+        super().take_contents(other)
+        self.value = other.value
 
     def __repr__(self) -> str:
         """
@@ -237,24 +598,622 @@ class _TreeMapNode(Generic[K, V]):
         return f"{self.__class__.__name__}(key={self.key}, value={self.value})"
 
 
-class TreeMap(MappingABC, Generic[K, V]):
+def _to_pairs(data: Union[Mapping[K, V], Iterable[Tuple[K, V]]]) -> List[Tuple[K, V]]:
+    """
+    Collect the key/value pairs of a Mapping or of an Iterable of pairs into a list.
+
+    Parameters
+    ----------
+    data: Union[Mapping[K, V], Iterable[Tuple[K, V]]] -
+        A Mapping object or Iterable object to provide key/value pairs.
+
+    Raises
+    ------
+    TypeError - If `data` is neither a Mapping nor an Iterable.
+
+    Returns
+    -------
+    List[Tuple[K, V]] - The key/value pairs, in the order `data` gave them.
+    """
+    if isinstance(data, MappingABC):
+        return list(data.items())
+    if isinstance(data, IterableABC):
+        # unpacking checks that each element is a pair, and normalizes them all to tuples
+        # pylint: disable=unnecessary-comprehension
+        return [(key, value) for key, value in data]
+    raise TypeError(f"`data` must be a Mapping or Iterable "
+                    f"(actual class is {data.__class__})")
+
+
+def _is_sorted(pairs: List[Tuple[K, V]]) -> bool:
+    """
+    Check in linear time if a list of key/value pairs is sorted by key
+    (ascending; equal keys are allowed).
+
+    Parameters
+    ----------
+    pairs: List[Tuple[K, V]] - The key/value pairs to check.
+
+    Returns
+    -------
+    bool - True if no key is less than the key before it, False otherwise.
+    """
+    for i in range(1, len(pairs)):
+        if pairs[i][0] < pairs[i - 1][0]:
+            return False
+    return True
+
+
+def _dedupe_sorted(pairs: List[Tuple[K, V]]) -> List[Tuple[K, V]]:
+    """
+    Remove pairs with duplicate keys from a list of key/value pairs which is sorted by key.
+    Like when building a `dict`, the last value given for a key is the one that is kept.
+
+    Parameters
+    ----------
+    pairs: List[Tuple[K, V]] - The key/value pairs, sorted by key.
+
+    Returns
+    -------
+    List[Tuple[K, V]] - The pairs, sorted by key with no duplicate keys.
+        This is `pairs` itself if there were no duplicates.
+    """
+    deduped = None
+    for i in range(1, len(pairs)):
+        if pairs[i][0] == pairs[i - 1][0]:
+            if deduped is None:
+                # first duplicate found; start copying
+                deduped = pairs[:i - 1]
+        elif deduped is not None:
+            deduped.append(pairs[i - 1])
+    if deduped is None:
+        return pairs
+    deduped.append(pairs[-1])
+    return deduped
+
+
+def _sorted_unique_pairs(pairs: List[Tuple[K, V]]) -> List[Tuple[K, V]]:
+    """
+    Sort a list of key/value pairs by key (unless it's already sorted) and remove duplicate keys.
+    Like when building a `dict`, the last value given for a key is the one that is kept.
+
+    Parameters
+    ----------
+    pairs: List[Tuple[K, V]] - The key/value pairs. May be sorted in place.
+
+    Returns
+    -------
+    List[Tuple[K, V]] - The pairs, sorted by key with no duplicate keys.
+    """
+    if not _is_sorted(pairs):
+        pairs.sort(key=itemgetter(0))  # stable, so the last duplicate stays last
+    return _dedupe_sorted(pairs)
+
+
+def _should_rebuild(n_existing: int, n_new: int) -> bool:
+    """
+    Decide if it's faster to add a batch of new pairs to a tree by rebuilding the whole tree,
+    or by inserting the pairs one at a time.
+
+    Parameters
+    ----------
+    n_existing: int - The number of pairs already in the tree.
+    n_new: int - The number of pairs in the new batch.
+
+    Returns
+    -------
+    bool - True if the tree should be rebuilt, False if the pairs should be inserted one by one.
+    """
+    # inserting each new pair costs about log2(n + k) steps of descent,
+    # while a rebuild costs about (n + k) steps that are each a few times more expensive
+    total = n_existing + n_new
+    return n_new * total.bit_length() >= _REBUILD_FACTOR * total
+
+
+def _merge_sorted(old_pairs: Iterable[Tuple[K, V]],
+                  new_pairs: List[Tuple[K, V]]) -> List[Tuple[K, V]]:
+    """
+    Merge two sequences of key/value pairs, each sorted by key with no duplicate keys,
+    into a single sorted list in linear time.
+    Where both have the same key, the value from `new_pairs` is kept.
+
+    Parameters
+    ----------
+    old_pairs: Iterable[Tuple[K, V]] - The existing key/value pairs, sorted by key.
+    new_pairs: List[Tuple[K, V]] - The key/value pairs to merge in, sorted by key.
+
+    Returns
+    -------
+    List[Tuple[K, V]] - The merged pairs, sorted by key with no duplicate keys.
+    """
+    merged: List[Tuple[K, V]] = []
+    i = 0
+    n_new = len(new_pairs)
+    for pair in old_pairs:
+        # take all the new pairs that come before the old one
+        while i < n_new and new_pairs[i][0] < pair[0]:
+            merged.append(new_pairs[i])
+            i += 1
+        if i < n_new and new_pairs[i][0] == pair[0]:
+            # same key in both; the new value wins
+            merged.append(new_pairs[i])
+            i += 1
+        else:
+            merged.append(pair)
+    merged.extend(new_pairs[i:])
+    return merged
+
+
+def _update_pairs(target: Any,
+                  existing: Iterable[Tuple[K, V]],
+                  other: Union[Mapping[K, V], Iterable[Tuple[K, V]]],
+                  kwargs: Mapping[K, V]):
+    """
+    Write a batch of key/value pairs into a sorted map, as `update` does.
+    A small batch is inserted one pair at a time. A large one is sorted, merged with the
+    existing contents, and handed to the map's `_build` to rebuild it in O(n + k) time.
+
+    Parameters
+    ----------
+    target: Any - The map to update: a TreeMap or BTreeMap.
+    existing: Iterable[Tuple[K, V]] - The map's current pairs, sorted by key.
+        Only iterated if the map is rebuilt, so it should be lazy.
+    other: Union[Mapping[K, V], Iterable[Tuple[K, V]]] - The new key/value pairs.
+    kwargs: Mapping[K, V] - More new key/value pairs, written after those in `other`.
+
+    Returns
+    -------
+    None
+    """
+    # pylint: disable=protected-access
+    pairs = _to_pairs(other)
+    pairs.extend(kwargs.items())
+    if not _should_rebuild(len(target), len(pairs)):
+        for key, value in pairs:
+            target[key] = value
+        return
+    pairs = _sorted_unique_pairs(pairs)
+    if len(target) > 0:
+        pairs = _merge_sorted(existing, pairs)
+    target._build(pairs)
+
+
+def _make_map_node(pair: Tuple[K, V],
+                   left: Optional[_TreeMapNode[K, V]],
+                   right: Optional[_TreeMapNode[K, V]]) -> _TreeMapNode[K, V]:
+    """
+    Node factory for `_build_balanced`, for a TreeMap.
+
+    Parameters
+    ----------
+    pair: Tuple[K, V] - The key/value pair for the node.
+    left: Optional[_TreeMapNode[K, V]] - The node's left subtree.
+    right: Optional[_TreeMapNode[K, V]] - The node's right subtree.
+
+    Returns
+    -------
+    _TreeMapNode[K, V] - The new node.
+    """
+    key, value = pair
+    return _TreeMapNode(key, value, left=left, right=right)
+
+
+def _build_balanced(entries: List[Any],
+                    make_node: Callable[[Any, Optional[_TreeNode], Optional[_TreeNode]], _TreeNode],
+                    start: int = 0,
+                    stop: int = None) -> Optional[_TreeNode]:
+    """
+    Build a perfectly balanced tree in linear time.
+    Recursion only goes as deep as the resulting tree, which is about log2(n).
+
+    Parameters
+    ----------
+    entries: List[Any] - What to store in the nodes (keys, or key/value pairs),
+        sorted by key with no duplicate keys.
+    make_node: Callable[[Any, Optional[_TreeNode], Optional[_TreeNode]], _TreeNode] -
+        Creates a node from an entry and the node's left and right subtrees.
+    start: int - Index of the first entry to include, default is 0.
+    stop: int - Index just past the last entry to include, default is `len(entries)`.
+
+    Returns
+    -------
+    Optional[_TreeNode] - The root of the new tree, or None if there are no entries.
+    """
+    if stop is None:
+        stop = len(entries)
+    if start >= stop:
+        return None
+    mid = (start + stop) // 2
+    left = _build_balanced(entries, make_node, start, mid)
+    right = _build_balanced(entries, make_node, mid + 1, stop)
+    node = make_node(entries[mid], left, right)
+    if left is not None:
+        left.parent = node
+    if right is not None:
+        right.parent = node
+    return node
+
+
+def _iter_range(root: Optional[_TreeNode[K]],
+                lo: Optional[K] = None,
+                hi: Optional[K] = None,
+                inclusive: Tuple[bool, bool] = (True, True),
+                reverse: bool = False) -> Generator[_TreeNode[K], None, None]:
+    """
+    Iterate over the nodes of a tree with keys between `lo` and `hi`, from least to greatest
+    (or from greatest to least, if `reverse` is True). See `TreeMap.irange`.
+
+    Parameters
+    ----------
+    root: Optional[_TreeNode[K]] - The root of the tree, or None for an empty tree.
+
+    Returns
+    -------
+    Generator[_TreeNode[K], None, None] - lazily generates the nodes in the range.
+    """
+    if root is None:
+        return
+    lo_inclusive, hi_inclusive = inclusive
+    if reverse:
+        # one descent to find the end of the range...
+        node = root.last() if hi is None else root.floor(hi, hi_inclusive)
+        # ...then step back until we pass the start of it
+        while node is not None:
+            if lo is not None and ((node.key < lo) if lo_inclusive else (not lo < node.key)):
+                return
+            yield node
+            node = node.predecessor()
+        return
+    # one descent to find the start of the range...
+    node = root.first() if lo is None else root.ceiling(lo, lo_inclusive)
+    # ...then step along until we pass the end of it
+    while node is not None:
+        if hi is not None and ((hi < node.key) if hi_inclusive else (not node.key < hi)):
+            return
+        yield node
+        node = node.successor()
+
+
+class _SortedTree(Generic[K]):
+    """
+    Intended only as a "helper class" to TreeMap and TreeSet.
+    Holds the AVL tree they are both backed by, and the navigation, rank/select, and iteration
+    methods that only need the tree's keys.
+    Subclasses need to list this class before any `collections.abc` base, so that its
+    `__iter__`, `__reversed__`, and `__len__` take precedence.
+
+    `K` represents the type of keys.
+    """
+    __slots__ = "_root", "_count"
+
+    # what to call the collection in error messages
+    _NAME = "tree"
+
+    def __init__(self):
+        """
+        Start with an empty tree.
+        """
+        self._root: Optional[_TreeNode[K]] = None
+        self._count = 0
+
+    def _find_node(self, key: K) -> Optional[_TreeNode[K]]:
+        """
+        Find the node for a key, if the key is in the tree.
+
+        Parameters
+        ----------
+        key: K - The key to search for.
+
+        Returns
+        -------
+        Optional[_TreeNode[K]] - The node with the given key, or None if there is no such node.
+        """
+        return None if self._root is None else self._root.get(key)
+
+    def _detach(self, node: _TreeNode[K]):
+        """
+        Remove a node from the tree.
+        The node's contents may be overwritten, so read anything needed from it first.
+
+        Parameters
+        ----------
+        node: _TreeNode[K] - The node to remove.
+
+        Returns
+        -------
+        None
+        """
+        self._root = node.detach()
+        self._count -= 1
+
+    def _remove(self, key: K):
+        """
+        Remove a key from the tree.
+
+        Parameters
+        ----------
+        key: K - The key to remove.
+
+        Raises
+        ------
+        KeyError - If the key is not in the tree.
+
+        Returns
+        -------
+        None
+        """
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        self._detach(node)
+
+    def _irange_nodes(self,
+                      lo: Optional[K] = None,
+                      hi: Optional[K] = None,
+                      inclusive: Tuple[bool, bool] = (True, True),
+                      reverse: bool = False) -> Generator[_TreeNode[K], None, None]:
+        """
+        Iterate over the nodes with keys between `lo` and `hi`, from least to greatest
+        (or from greatest to least, if `reverse` is True). See `irange`.
+
+        Returns
+        -------
+        Generator[_TreeNode[K], None, None] - lazily generates the nodes in the range.
+        """
+        return _iter_range(self._root, lo, hi, inclusive, reverse)
+
+    def irange(self,
+               lo: Optional[K] = None,
+               hi: Optional[K] = None,
+               inclusive: Tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Generator[K, None, None]:
+        """
+        Iterate over the keys between `lo` and `hi`, from least to greatest
+        (or from greatest to least, if `reverse` is True).
+        Finding the start of the range takes O(log(n)), and then each key is O(1) (amortized),
+        so iterating over k keys is O(log(n) + k).
+
+        Parameters
+        ----------
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range, if present. Default is `(True, True)`.
+        reverse: bool - If True, iterate in descending order. Default is False.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys in the range.
+        """
+        for node in self._irange_nodes(lo, hi, inclusive, reverse):
+            yield node.key
+
+    def _index_to_position(self, index: int) -> int:
+        """
+        Convert a (possibly negative) index into a position in `[0, len(self))`.
+
+        Parameters
+        ----------
+        index: int - The index to convert; negative values count from the end.
+
+        Raises
+        ------
+        IndexError - If the index is out of range.
+
+        Returns
+        -------
+        int - The non-negative position.
+        """
+        position = index + self._count if index < 0 else index
+        if not 0 <= position < self._count:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        return position
+
+    def bisect_left(self, key: K) -> int:
+        """
+        Find the position where the given key is, or would be inserted, in sorted order;
+        if the key is present, the returned position is that of the key.
+        Takes O(log(n)) time.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be present.
+
+        Returns
+        -------
+        int - The number of keys that are less than `key`.
+        """
+        return 0 if self._root is None else self._root.bisect(key)
+
+    def bisect_right(self, key: K) -> int:
+        """
+        Find the position where the given key would be inserted in sorted order;
+        if the key is present, the returned position is just after that of the key.
+        Takes O(log(n)) time.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be present.
+
+        Returns
+        -------
+        int - The number of keys that are less than or equal to `key`.
+        """
+        return 0 if self._root is None else self._root.bisect(key, right=True)
+
+    def index(self, key: K) -> int:
+        """
+        Find the position (rank) of the given key among all the keys, in sorted order.
+        Takes O(log(n)) time.
+
+        Parameters
+        ----------
+        key: K - The key to search for.
+
+        Raises
+        ------
+        ValueError - If the key is not present.
+
+        Returns
+        -------
+        int - The number of keys that are less than `key`.
+        """
+        position = self.bisect_left(key)
+        if position == self._count or self._root.select(position).key != key:
+            raise ValueError(f"{key!r} is not in {self._NAME}")
+        return position
+
+    def islice(self, start: int = None, stop: int = None) -> Generator[K, None, None]:
+        """
+        Iterate over the keys at positions `start` (inclusive) through `stop` (exclusive),
+        in sorted order. Indexing follows the same rules as slicing a list:
+        negative values count from the end, and out-of-range values are clipped.
+        Finding the start takes O(log(n)), so iterating over k keys is O(log(n) + k).
+
+        Parameters
+        ----------
+        start: int - The position of the first key. If None (default), starts at the beginning.
+        stop: int - The position just past the last key. If None (default), goes to the end.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys in the slice.
+        """
+        start, stop, _ = slice(start, stop).indices(self._count)
+        if start >= stop:
+            return
+        node = self._root.select(start)
+        for _ in range(stop - start):
+            yield node.key
+            node = node.successor()
+
+    def __iter__(self) -> Generator[K, None, None]:
+        """
+        Iterate over the keys, in order from least to greatest.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys from least to greatest
+        """
+        if self._root is None:
+            return  # just terminate
+        for node in self._root:
+            yield node.key
+
+    def __reversed__(self) -> Generator[K, None, None]:
+        """
+        Iterate over the keys, in order from greatest to least.
+
+        Returns
+        -------
+        Generator[K, None, None] - lazily generates the keys from greatest to least
+        """
+        for node in self._irange_nodes(reverse=True):
+            yield node.key
+
+    def __len__(self) -> int:
+        """
+        Return the number of keys.
+
+        Returns
+        -------
+        int - The number of keys (for a map, key/value pairs).
+        """
+        return self._count
+
+
+# pylint: disable=too-many-public-methods
+class TreeMap(_SortedTree, MappingABC, Generic[K, V]):
     """
-    A dictionary/map object, backed by a binary tree.
+    A dictionary/map object, backed by a self-balancing (AVL) binary tree.
     Naturally keeps items sorted by keys.
+    Lookups, insertions, and removals are all O(log(n)), even if keys are inserted in order.
 
     `K` represents the type of keys.
     `V` represents the type of values.
 
     Keys are ordered using `<` and `>`, and key (in)equality is checked using `==` and `!=`.
     """
-    __slots__ = "_root", "_count"
+    __slots__ = ("_version",)
 
-    def __init__(self):
+    _NAME = "map"
+
+    def __init__(self, data: Union[Mapping[K, V], Iterable[Tuple[K, V]]] = None):
         """
         Construct a TreeMap.
+        If initial data is given, it is sorted (unless it's already sorted) and then the
+        tree is built in a single pass, rather than inserting the pairs one at a time.
+        For already-sorted data, this takes O(n) time.
+
+        Parameters
+        ----------
+        data: Union[Mapping[K, V], Iterable[Tuple[K, V]]] (optional) -
+            initial key/value pairs for the TreeMap to store, as a Mapping object or
+            an Iterable of key/value pairs. If a key is given more than once,
+            the last value given for it is kept.
+            If `None` (default), the TreeMap starts with no contents.
         """
-        self._root: Optional[_TreeMapNode[K, V]] = None
-        self._count = 0
+        super().__init__()
+        # incremented whenever keys are added or removed, to detect stale cursors
+        self._version = 0
+        if data is not None:
+            self._build(_sorted_unique_pairs(_to_pairs(data)))
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[Tuple[K, V]]) -> "TreeMap[K, V]":
+        """
+        Construct a TreeMap from key/value pairs which are already sorted by key,
+        in O(n) time. If a key is given more than once, the last value given for it is kept.
+
+        Parameters
+        ----------
+        pairs: Iterable[Tuple[K, V]] - The key/value pairs, sorted by key.
+
+        Raises
+        ------
+        ValueError - If the pairs are not sorted by key.
+
+        Returns
+        -------
+        TreeMap[K, V] - A new TreeMap containing the given pairs.
+        """
+        pairs = _to_pairs(pairs)
+        if not _is_sorted(pairs):
+            raise ValueError("pairs are not sorted by key")
+        tree = cls()
+        tree._build(_dedupe_sorted(pairs))
+        return tree
+
+    def _build(self, pairs: List[Tuple[K, V]]):
+        """
+        Replace the contents of the map, building a perfectly balanced tree in O(n) time.
+
+        Parameters
+        ----------
+        pairs: List[Tuple[K, V]] - The key/value pairs, sorted by key with no duplicate keys.
+
+        Returns
+        -------
+        None
+        """
+        self._root = _build_balanced(pairs, _make_map_node)
+        self._count = len(pairs)
+        self._version += 1
+
+    def _detach(self, node: _TreeMapNode[K, V]):
+        """
+        Remove a node from the tree, invalidating any cursors. See `_SortedTree._detach`.
+
+        Parameters
+        ----------
+        node: _TreeMapNode[K, V] - The node to remove.
+
+        Returns
+        -------
+        None
+        """
+        super()._detach(node)
+        self._version += 1
 
     def clear(self):
         """
@@ -266,6 +1225,7 @@ class TreeMap(MappingABC, Generic[K, V]):
         """
         self._root = None
         self._count = 0
+        self._version += 1
 
     def get(self, key: K, default: V = None) -> V:
         """
@@ -280,57 +1240,226 @@ class TreeMap(MappingABC, Generic[K, V]):
 
         Returns
         -------
-        V - The value associated with the given key, or `default` if the key is not present.
+        V - The value associated with the given key, or `default` if the key is not present.
+        """
+        # go looking
+        result_node: Optional[_TreeMapNode[K, V]] = \
+            None if self._root is None else self._root.get(key)
+        # did we find it?
+        if result_node is None:
+            if default is None:
+                raise KeyError(key)
+            # else:
+            return default
+        # else:
+        return result_node.value
+
+    def cursor(self, key: Optional[K] = None) -> "TreeMapCursor[K, V]":
+        """
+        Get a cursor that can step forward and backward through the map's items,
+        starting at the least key that is greater than or equal to the given key.
+        Finding the starting point takes O(log(n)), and each step is O(1) (amortized).
+
+        Parameters
+        ----------
+        key: Optional[K] - Where to start; it doesn't need to be in the map.
+            If None (default), the cursor starts at the least key in the map.
+
+        Returns
+        -------
+        TreeMapCursor[K, V] - A new cursor over the map. If there is no key at or after `key`,
+            the cursor starts out of range (see `TreeMapCursor.is_valid`).
+        """
+        if self._root is None:
+            node = None
+        elif key is None:
+            node = self._root.first()
+        else:
+            node = self._root.ceiling(key)
+        return TreeMapCursor(self, node)
+
+    def floor_key(self, key: K) -> Optional[K]:
+        """
+        Find the greatest key in the map that is less than or equal to the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the map.
+
+        Returns
+        -------
+        Optional[K] - The greatest key `<= key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.floor(key)
+        return None if node is None else node.key
+
+    def ceiling_key(self, key: K) -> Optional[K]:
+        """
+        Find the least key in the map that is greater than or equal to the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the map.
+
+        Returns
+        -------
+        Optional[K] - The least key `>= key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.ceiling(key)
+        return None if node is None else node.key
+
+    def lower_key(self, key: K) -> Optional[K]:
+        """
+        Find the greatest key in the map that is strictly less than the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the map.
+
+        Returns
+        -------
+        Optional[K] - The greatest key `< key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.floor(key, inclusive=False)
+        return None if node is None else node.key
+
+    def higher_key(self, key: K) -> Optional[K]:
+        """
+        Find the least key in the map that is strictly greater than the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the map.
+
+        Returns
+        -------
+        Optional[K] - The least key `> key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.ceiling(key, inclusive=False)
+        return None if node is None else node.key
+
+    def first(self) -> Tuple[K, V]:
+        """
+        Get the (key, value) pair with the least key, without removing it.
+
+        Raises
+        ------
+        KeyError - If the map is empty.
+
+        Returns
+        -------
+        Tuple[K, V] - The (key, value) pair with the least key.
+        """
+        if self._root is None:
+            raise KeyError("map is empty")
+        node = self._root.first()
+        return node.key, node.value
+
+    def last(self) -> Tuple[K, V]:
+        """
+        Get the (key, value) pair with the greatest key, without removing it.
+
+        Raises
+        ------
+        KeyError - If the map is empty.
+
+        Returns
+        -------
+        Tuple[K, V] - The (key, value) pair with the greatest key.
+        """
+        if self._root is None:
+            raise KeyError("map is empty")
+        node = self._root.last()
+        return node.key, node.value
+
+    def peekitem(self, index: int = -1) -> Tuple[K, V]:
+        """
+        Get the (key, value) pair at the given position in sorted order, without removing it.
+        Takes O(log(n)) time.
+
+        Parameters
+        ----------
+        index: int - The position of the item; negative values count from the end.
+            Default is -1, the item with the greatest key.
+
+        Raises
+        ------
+        IndexError - If the index is out of range.
+
+        Returns
+        -------
+        Tuple[K, V] - The (key, value) pair at the given position.
         """
-        # go looking
-        result_node: Optional[_TreeMapNode[K, V]] = \
-            None if self._root is None else self._root.get(key)
-        # did we find it?
-        if result_node is None:
-            if default is None:
-                raise KeyError(key)
-            # else:
-            return default
-        # else:
-        return result_node.value
-
-    def items(self) -> List[Tuple[K, V]]:
+        position = self._index_to_position(index)
+        node = self._root.select(position)
+        return node.key, node.value
+
+    def items(self,
+              lo: Optional[K] = None,
+              hi: Optional[K] = None,
+              inclusive: Tuple[bool, bool] = (True, True)) -> "TreeMapItemsView[K, V]":
         """
-        Return a new view of the map’s items ((key, value) pairs),
-        sorted by keys.
+        Return a new view of the map’s items ((key, value) pairs), sorted by keys.
+        Optionally, the view only includes the items with keys in a given range; see `irange`.
+        The view reads from the map lazily, so it reflects any later changes to the map.
+
+        Parameters
+        ----------
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range. Default is `(True, True)`.
 
         Returns
         -------
-        List[Tuple[K, V]] - A list of tuples, each being a (key, value) pair.
-            sorted by keys.
+        TreeMapItemsView[K, V] - A view of the (key, value) pairs, sorted by keys.
         """
-        if self._root is None:
-            return []
-        return [(node.key, node.value) for node in self._root]
+        return TreeMapItemsView(self, lo, hi, inclusive)
 
-    def keys(self) -> List[K]:
+    def keys(self,
+             lo: Optional[K] = None,
+             hi: Optional[K] = None,
+             inclusive: Tuple[bool, bool] = (True, True)) -> "TreeMapKeysView[K]":
         """
         Return a new view of the map's keys, sorted.
+        Optionally, the view only includes the keys in a given range; see `irange`.
+        The view reads from the map lazily, so it reflects any later changes to the map.
+
+        Parameters
+        ----------
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range. Default is `(True, True)`.
 
         Returns
         -------
-        List[K] - A list of keys, sorted.
+        TreeMapKeysView[K] - A view of the keys, sorted.
         """
-        if self._root is None:
-            return []
-        return [node.key for node in self._root]
+        return TreeMapKeysView(self, lo, hi, inclusive)
 
-    def values(self) -> List[V]:
+    def values(self,
+               lo: Optional[K] = None,
+               hi: Optional[K] = None,
+               inclusive: Tuple[bool, bool] = (True, True)) -> "TreeMapValuesView[V]":
         """
         Return a new view of the map’s values, sorted by their keys (which are not given here).
+        Optionally, the view only includes the values whose keys are in a given range;
+        see `irange`.
+        The view reads from the map lazily, so it reflects any later changes to the map.
+
+        Parameters
+        ----------
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range. Default is `(True, True)`.
 
         Returns
         -------
-        List[V] - A list of values, sorted by keys (which are not given here).
+        TreeMapValuesView[V] - A view of the values, sorted by their keys.
         """
-        if self._root is None:
-            return []
-        return [node.value for node in self._root]
+        return TreeMapValuesView(self, lo, hi, inclusive)
 
     def pop(self, key: K, default: V = None) -> V:
         """
@@ -351,52 +1480,16 @@ class TreeMap(MappingABC, Generic[K, V]):
         -------
         V - The value associated with the given key, or `default` if the key is not present.
         """
-        try:
-            if self._root is None:  # nothing to remove
-                raise KeyError(key)
-            # we need to check if we're removing the root;
-            # removing the root is special
-            if key == self._root.key:
-                removed_value = self._root.value
-                if self._root.left is None:
-                    # re-point the root to the right child of the old root
-                    self._root = self._root.right
-                    # re-point the right child (the new root) to its new parent (None)
-                    if self._root is not None:
-                        self._root.parent = None
-                # self.left is not None
-                elif self._root.right is None:
-                    # re-point the root to the left child of the old root
-                    self._root = self._root.left
-                    # re-point the left child (the new root) to its new parent (None)
-                    if self._root is not None:
-                        self._root.parent = None
-                # neither self.left nor self.right is None
-                else:
-                    # go find the "in-order predecessor"
-                    current = self._root.left
-                    while current.right is not None:
-                        current = current.right
-                    # put its value into the current one
-                    self._root.key = current.key
-                    self._root.value = current.value
-                    # remove the lower one
-                    current.remove(current.key)
-                    # even thought that call to current.remove is recursive,
-                    # we know it's already at the node it needs to remove,
-                    # and that that node has no right child,
-                    # so it will not recurse again
-            else:  # not any special situation
-                removed_value = self._root.remove(key)
-        except KeyError:  # couldn't find it
+        node = self._find_node(key)
+        if node is None:  # couldn't find it
             if default is None:
-                # pylint: disable=raise-missing-from
                 raise KeyError(key)
             # else:
             return default
-        else:  # we did find it
-            self._count -= 1
-            return removed_value
+        # else: we did find it
+        removed_value = node.value
+        self._detach(node)
+        return removed_value
 
     def popitem(self) -> Tuple[K, V]:
         """
@@ -444,10 +1537,13 @@ class TreeMap(MappingABC, Generic[K, V]):
         if self._root is None:
             self._root = _TreeMapNode(key, default)
             self._count += 1
+            self._version += 1
             return default
-        result_node = self._root.get_set_default(key, default)
-        if result_node is None:  # used the default
+        result_node, is_new = self._root.get_set_default(key, default)
+        if is_new:  # used the default
+            self._root = result_node.rebalance()
             self._count += 1
+            self._version += 1
             return default
         # else: just getting a value, not setting
         return result_node.value
@@ -458,7 +1554,9 @@ class TreeMap(MappingABC, Generic[K, V]):
         update() accepts either another Mapping object or an Iterable of key/value pairs
         (as tuples or other iterables of length two). If keyword arguments are specified,
         the map is then updated with those key/value pairs: `m.update(red=1, blue=2)`
-        Iterates over `other`, repeatedly calling __setitem__
+        If the batch of new pairs is small compared to the map, each pair is inserted
+        individually, taking O(k*log(n)) time. If it is large, the (sorted) batch is instead
+        merged with the existing contents and the tree is rebuilt, taking O(n + k) time.
 
         Parameters
         ----------
@@ -471,15 +1569,7 @@ class TreeMap(MappingABC, Generic[K, V]):
         -------
         None
         """
-        if isinstance(other, MappingABC):
-            tup_iter = other.items()
-        elif isinstance(other, IterableABC):
-            tup_iter = other
-        else:
-            raise TypeError(f"`new_pairs` must be a Mapping or Iterable "
-                            f"(actual class is {other.__class__})")
-        for key, value in chain(tup_iter, kwargs.items()):
-            self.__setitem__(key, value)
+        _update_pairs(self, ((node.key, node.value) for node in self._root or ()), other, kwargs)
 
     def __contains__(self, key: K) -> bool:
         """
@@ -495,7 +1585,7 @@ class TreeMap(MappingABC, Generic[K, V]):
         """
         if self._root is None:
             return False
-        return key in self._root
+        return self._root.get(key) is not None
 
     def __delitem__(self, key: K):
         """
@@ -514,16 +1604,7 @@ class TreeMap(MappingABC, Generic[K, V]):
         -------
         None
         """
-        try:
-            if self._root is None:
-                raise KeyError(key)
-            result = self._root.remove(key)
-        except KeyError:
-            # pylint: disable=raise-missing-from
-            raise KeyError(key)
-        else:
-            self._count -= 1
-            return result
+        self._remove(key)
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -596,59 +1677,452 @@ class TreeMap(MappingABC, Generic[K, V]):
         """
         if self._root is None:
             self._root = _TreeMapNode(key, value)
-            is_new = True
-        else:
-            is_new = self._root.set(key, value)
-        if is_new:
             self._count += 1
+            self._version += 1
+            return
+        new_node = self._root.set(key, value)
+        if new_node is not None:
+            self._root = new_node.rebalance()
+            self._count += 1
+            self._version += 1
 
-    def __iter__(self) -> Generator[K, None, None]:
+    def __ne__(self, other: Any) -> bool:
         """
-        Iterate over the map, in order from least to greatest (by keys).
+        Calls __eq__ and negates the result. See __eq__.
+
+        Parameters
+        ----------
+        other: Any - The object to compare to.
 
         Returns
         -------
-        Generator[K, None, None] - lazily generates the keys from least to greatest
+        bool - False if `other` is also a TreeMap and has the same key/value pairs,
+            True otherwise.
         """
-        if self._root is None:
-            return  # just terminate
-        for node in self._root:
-            yield node.key
+        return not self.__eq__(other)
 
-    def __len__(self) -> int:
+    def __repr__(self) -> str:
         """
-        Return the number of items in the map.
+        Give a simple string representation of the map.
+        For debugging purposes.
 
         Returns
         -------
-        int - The number of key/value pairs in the map.
+        str - A simple string value to represent the map.
         """
-        return self._count
+        return f"{self.__class__.__name__}(len={self.__len__()})"
 
-    def __ne__(self, other: Any) -> bool:
+    __hash__ = None
+
+
+class TreeMapCursor(Generic[K, V]):
+    """
+    A position in a TreeMap that can step to the next or previous item
+    in amortized O(1) time, using the tree's parent pointers.
+    Create one with `TreeMap.cursor`.
+
+    Values can be read and written through the cursor.
+    Adding or removing keys in the map invalidates the cursor; using it afterward
+    raises a RuntimeError.
+    """
+    # pylint: disable=protected-access
+    __slots__ = "_map", "_node", "_version"
+
+    def __init__(self, tree_map: TreeMap[K, V], node: Optional[_TreeMapNode[K, V]]):
         """
-        Calls __eq__ and negates the result. See __eq__.
+        Construct a TreeMapCursor. Use `TreeMap.cursor` instead of calling this directly.
 
         Parameters
         ----------
-        other: Any - The object to compare to.
+        tree_map: TreeMap[K, V] - The map the cursor moves through.
+        node: Optional[_TreeMapNode[K, V]] - The node to start at, or None for out of range.
+        """
+        self._map = tree_map
+        self._node = node
+        self._version = tree_map._version
+
+    def _current(self) -> _TreeMapNode[K, V]:
+        """
+        Get the node the cursor is at, after making sure the cursor is still usable.
+
+        Raises
+        ------
+        RuntimeError - If keys were added to or removed from the map since the cursor was made.
+        IndexError - If the cursor is out of range.
 
         Returns
         -------
-        bool - False if `other` is also a TreeMap and has the same key/value pairs,
-            True otherwise.
+        _TreeMapNode[K, V] - The current node.
         """
-        return not self.__eq__(other)
+        if self._version != self._map._version:
+            raise RuntimeError("TreeMap changed size since the cursor was created")
+        if self._node is None:
+            raise IndexError("cursor is out of range")
+        return self._node
+
+    def is_valid(self) -> bool:
+        """
+        Check if the cursor is at an item, i.e. it has not stepped past either end of the map.
+
+        Returns
+        -------
+        bool - True if the cursor is at an item, False if it is out of range.
+        """
+        return self._node is not None and self._version == self._map._version
+
+    @property
+    def key(self) -> K:
+        """
+        Get the key of the item at the cursor.
+
+        Returns
+        -------
+        K - The current key.
+        """
+        return self._current().key
+
+    @property
+    def value(self) -> V:
+        """
+        Get the value of the item at the cursor.
+
+        Returns
+        -------
+        V - The current value.
+        """
+        return self._current().value
+
+    @value.setter
+    def value(self, value: V):
+        """
+        Overwrite the value of the item at the cursor.
+
+        Parameters
+        ----------
+        value: V - The new value.
+
+        Returns
+        -------
+        None
+        """
+        self._current().value = value
+
+    @property
+    def item(self) -> Tuple[K, V]:
+        """
+        Get the (key, value) pair at the cursor.
+
+        Returns
+        -------
+        Tuple[K, V] - The current (key, value) pair.
+        """
+        node = self._current()
+        return node.key, node.value
+
+    def next(self) -> bool:
+        """
+        Step to the item with the next greater key.
+
+        Raises
+        ------
+        RuntimeError - If keys were added to or removed from the map since the cursor was made.
+        IndexError - If the cursor is already out of range.
+
+        Returns
+        -------
+        bool - True if the cursor is now at an item,
+            False if it stepped past the greatest key (and is now out of range).
+        """
+        self._node = self._current().successor()
+        return self._node is not None
+
+    def prev(self) -> bool:
+        """
+        Step to the item with the next lesser key.
+
+        Raises
+        ------
+        RuntimeError - If keys were added to or removed from the map since the cursor was made.
+        IndexError - If the cursor is already out of range.
+
+        Returns
+        -------
+        bool - True if the cursor is now at an item,
+            False if it stepped past the least key (and is now out of range).
+        """
+        self._node = self._current().predecessor()
+        return self._node is not None
 
     def __repr__(self) -> str:
         """
-        Give a simple string representation of the map.
+        Give a simple string representation of the cursor.
         For debugging purposes.
 
         Returns
         -------
-        str - A simple string value to represent the map.
+        str - A simple string value to represent the cursor.
         """
-        return f"{self.__class__.__name__}(len={self.__len__()})"
+        if self.is_valid():
+            return f"{self.__class__.__name__}(key={self._node.key})"
+        return f"{self.__class__.__name__}(out of range)"
 
-    __hash__ = None
+
+class _TreeMapView(MappingView):
+    """
+    Intended only as a "helper class" to the TreeMap views.
+    A lazy view of a TreeMap, optionally restricted to the keys in a range.
+    Nothing is copied; iteration, reversal, length, and positional indexing
+    all read directly from the tree.
+    """
+    # pylint: disable=protected-access
+    __slots__ = "_lo", "_hi", "_inclusive"
+
+    def __init__(self,
+                 mapping: TreeMap,
+                 lo: Optional[K] = None,
+                 hi: Optional[K] = None,
+                 inclusive: Tuple[bool, bool] = (True, True)):
+        """
+        Construct a view of a TreeMap.
+
+        Parameters
+        ----------
+        mapping: TreeMap - The map to view.
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range. Default is `(True, True)`.
+        """
+        super().__init__(mapping)
+        self._lo = lo
+        self._hi = hi
+        self._inclusive = inclusive
+
+    @staticmethod
+    @abstractmethod
+    def _extract(node: _TreeMapNode) -> Any:
+        """
+        Get whatever this view shows for a single node (key, value, or item).
+
+        Parameters
+        ----------
+        node: _TreeMapNode - The node to get the contents of.
+
+        Returns
+        -------
+        Any - The contents of the node as shown by this view.
+        """
+
+    def _in_range(self, key: K) -> bool:
+        """
+        Check if a key is within the range of this view.
+
+        Parameters
+        ----------
+        key: K - The key to check.
+
+        Returns
+        -------
+        bool - True if the key is within the range, False if not.
+        """
+        lo_inclusive, hi_inclusive = self._inclusive
+        if self._lo is not None and \
+                ((key < self._lo) if lo_inclusive else (not self._lo < key)):
+            return False
+        if self._hi is not None and \
+                ((self._hi < key) if hi_inclusive else (not key < self._hi)):
+            return False
+        return True
+
+    def _bounds(self) -> Tuple[int, int]:
+        """
+        Find the positions of the range of this view within the whole map, in O(log(n)).
+
+        Returns
+        -------
+        Tuple[int, int] - The position of the first key in the range (inclusive),
+            and the position just past the last key in the range (exclusive).
+        """
+        tree = self._mapping
+        if self._lo is None:
+            start = 0
+        elif self._inclusive[0]:
+            start = tree.bisect_left(self._lo)
+        else:
+            start = tree.bisect_right(self._lo)
+        if self._hi is None:
+            stop = len(tree)
+        elif self._inclusive[1]:
+            stop = tree.bisect_right(self._hi)
+        else:
+            stop = tree.bisect_left(self._hi)
+        return start, max(start, stop)
+
+    def __len__(self) -> int:
+        """
+        Count the number of entries in the view, in O(log(n)).
+
+        Returns
+        -------
+        int - The number of entries in the view.
+        """
+        start, stop = self._bounds()
+        return stop - start
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        """
+        Iterate over the view, in order from least to greatest (by keys).
+
+        Returns
+        -------
+        Generator[Any, None, None] - lazily generates the entries of the view.
+        """
+        for node in self._mapping._irange_nodes(self._lo, self._hi, self._inclusive):
+            yield self._extract(node)
+
+    def __reversed__(self) -> Generator[Any, None, None]:
+        """
+        Iterate over the view, in order from greatest to least (by keys).
+
+        Returns
+        -------
+        Generator[Any, None, None] - lazily generates the entries of the view, in reverse.
+        """
+        for node in self._mapping._irange_nodes(self._lo, self._hi, self._inclusive,
+                                                reverse=True):
+            yield self._extract(node)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """
+        Get the entry (or entries) at the given position(s) in the view, like indexing a list.
+        A single entry takes O(log(n)), and a slice of k entries takes O(log(n) + k).
+
+        Parameters
+        ----------
+        index: Union[int, slice] - The position of the entry, or a slice of positions.
+            Negative values count from the end.
+
+        Raises
+        ------
+        IndexError - If a single index is out of range.
+
+        Returns
+        -------
+        Any - The entry at the given position, or a list of entries for a slice.
+        """
+        start, stop = self._bounds()
+        if isinstance(index, slice):
+            slice_start, slice_stop, step = index.indices(stop - start)
+            if step != 1:
+                return [self[i] for i in range(slice_start, slice_stop, step)]
+            entries = []
+            if slice_start < slice_stop:
+                node = self._mapping._root.select(start + slice_start)
+                for _ in range(slice_stop - slice_start):
+                    entries.append(self._extract(node))
+                    node = node.successor()
+            return entries
+        position = index + (stop - start) if index < 0 else index
+        if not 0 <= position < stop - start:
+            raise IndexError("TreeMap view index out of range")
+        return self._extract(self._mapping._root.select(start + position))
+
+
+class TreeMapKeysView(_TreeMapView, KeysView):
+    """
+    A lazy view of the keys of a TreeMap (optionally within a range), sorted.
+    Returned by `TreeMap.keys`.
+    Supports everything a `dict` keys view does, plus reversal and positional indexing.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def _extract(node: _TreeMapNode) -> Any:
+        """
+        See `_TreeMapView._extract`.
+        """
+        return node.key
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Check if a key is in the view, in O(log(n)).
+
+        Parameters
+        ----------
+        key: Any - The key to search for.
+
+        Returns
+        -------
+        bool - True if the key is in the view, False if not.
+        """
+        return self._in_range(key) and key in self._mapping
+
+
+class TreeMapValuesView(_TreeMapView, ValuesView):
+    """
+    A lazy view of the values of a TreeMap (optionally within a range), sorted by their keys.
+    Returned by `TreeMap.values`.
+    Supports everything a `dict` values view does, plus reversal and positional indexing.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def _extract(node: _TreeMapNode) -> Any:
+        """
+        See `_TreeMapView._extract`.
+        """
+        return node.value
+
+    def __contains__(self, value: Any) -> bool:
+        """
+        Check if a value is in the view. This requires a linear scan.
+
+        Parameters
+        ----------
+        value: Any - The value to search for.
+
+        Returns
+        -------
+        bool - True if the value is in the view, False if not.
+        """
+        for v in self:
+            if v is value or v == value:
+                return True
+        return False
+
+
+class TreeMapItemsView(_TreeMapView, ItemsView):
+    """
+    A lazy view of the (key, value) pairs of a TreeMap (optionally within a range),
+    sorted by keys. Returned by `TreeMap.items`.
+    Supports everything a `dict` items view does, plus reversal and positional indexing.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def _extract(node: _TreeMapNode) -> Any:
+        """
+        See `_TreeMapView._extract`.
+        """
+        return node.key, node.value
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Check if a (key, value) pair is in the view, in O(log(n)).
+
+        Parameters
+        ----------
+        item: Any - The (key, value) pair to search for.
+
+        Returns
+        -------
+        bool - True if the pair is in the view, False if not.
+        """
+        key, value = item
+        if not self._in_range(key):
+            return False
+        try:
+            v = self._mapping[key]
+        except KeyError:
+            return False
+        return v is value or v == value
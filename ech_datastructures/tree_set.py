@@ -0,0 +1,745 @@
+from collections.abc import MutableSet, Set as SetABC
+from itertools import islice
+from typing import Any, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from .tree_map import TreeMapKeysView, _SortedTree, _TreeNode, _build_balanced, \
+    _should_rebuild
+
+
+K = TypeVar("K")
+
+
+def _sorted_unique(keys: List[K]) -> List[K]:
+    """
+    Sort a list of keys (unless it's already sorted) and remove duplicates.
+    Where keys are equal, the first one given is kept.
+
+    Parameters
+    ----------
+    keys: List[K] - The keys. May be sorted in place.
+
+    Returns
+    -------
+    List[K] - The keys, sorted with no duplicates.
+    """
+    for i in range(1, len(keys)):
+        if keys[i] < keys[i - 1]:
+            keys.sort()  # stable, so the first duplicate stays first
+            break
+    unique = keys[:1]
+    for key in islice(keys, 1, None):
+        if key != unique[-1]:
+            unique.append(key)
+    return unique
+
+
+def _merge(left: List[K],
+           right: List[K],
+           keep_left: bool,
+           keep_both: bool,
+           keep_right: bool) -> List[K]:
+    """
+    Merge two lists of keys, each sorted with no duplicates, into a single sorted list
+    in O(n + m) time, keeping only the kinds of keys asked for.
+    Where both lists have a key, the one from `left` is kept.
+
+    Parameters
+    ----------
+    left: List[K] - The first list of keys, sorted.
+    right: List[K] - The second list of keys, sorted.
+    keep_left: bool - Whether to keep keys that are only in `left`.
+    keep_both: bool - Whether to keep keys that are in both lists.
+    keep_right: bool - Whether to keep keys that are only in `right`.
+
+    Returns
+    -------
+    List[K] - The merged keys, sorted with no duplicates.
+    """
+    merged: List[K] = []
+    i = j = 0
+    n_left, n_right = len(left), len(right)
+    while i < n_left and j < n_right:
+        left_key, right_key = left[i], right[j]
+        if left_key < right_key:
+            if keep_left:
+                merged.append(left_key)
+            i += 1
+        elif right_key < left_key:
+            if keep_right:
+                merged.append(right_key)
+            j += 1
+        else:
+            if keep_both:
+                merged.append(left_key)
+            i += 1
+            j += 1
+    if keep_left:
+        merged.extend(left[i:])
+    if keep_right:
+        merged.extend(right[j:])
+    return merged
+
+
+def _make_set_node(key: K,
+                   left: Optional[_TreeNode[K]],
+                   right: Optional[_TreeNode[K]]) -> _TreeNode[K]:
+    """
+    Node factory for `_build_balanced`, for a TreeSet.
+
+    Parameters
+    ----------
+    key: K - The key for the node.
+    left: Optional[_TreeNode[K]] - The node's left subtree.
+    right: Optional[_TreeNode[K]] - The node's right subtree.
+
+    Returns
+    -------
+    _TreeNode[K] - The new node.
+    """
+    return _TreeNode(key, left=left, right=right)
+
+
+# pylint: disable=too-many-public-methods
+class TreeSet(_SortedTree, MutableSet, Generic[K]):
+    """
+    A set object, backed by a self-balancing (AVL) binary tree.
+    Naturally keeps keys sorted, and supports range queries and rank/select by position.
+    Lookups, insertions, and removals are all O(log(n)).
+
+    Union, intersection, difference, and symmetric difference walk both sets in order and merge
+    them, then build the resulting tree in a single pass, so they take O(n + m) time.
+
+    `K` represents the type of keys.
+
+    Keys are ordered using `<`, and key (in)equality is checked using `==` and `!=`.
+    """
+    # pylint: disable=protected-access
+    __slots__ = ()
+
+    _NAME = "set"
+
+    def __init__(self, data: Iterable[K] = None):
+        """
+        Construct a TreeSet.
+        If initial data is given, it is sorted (unless it's already sorted) and then the
+        tree is built in a single pass, rather than inserting the keys one at a time.
+        For already-sorted data, this takes O(n) time.
+
+        Parameters
+        ----------
+        data: Iterable[K] (optional) - initial keys for the TreeSet to store.
+            If a key is given more than once, the first one given is kept.
+            If `None` (default), the TreeSet starts with no contents.
+        """
+        super().__init__()
+        if data is not None:
+            self._build(_sorted_unique(list(data)))
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[K]) -> "TreeSet[K]":
+        """
+        Construct a TreeSet from keys which are already sorted, in O(n) time.
+        If a key is given more than once, the first one given is kept.
+
+        Parameters
+        ----------
+        keys: Iterable[K] - The keys, sorted.
+
+        Raises
+        ------
+        ValueError - If the keys are not sorted.
+
+        Returns
+        -------
+        TreeSet[K] - A new TreeSet containing the given keys.
+        """
+        keys = list(keys)
+        for i in range(1, len(keys)):
+            if keys[i] < keys[i - 1]:
+                raise ValueError("keys are not sorted")
+        return cls._from_unique(_sorted_unique(keys))
+
+    @classmethod
+    def _from_unique(cls, keys: List[K]) -> "TreeSet[K]":
+        """
+        Construct a TreeSet from keys which are sorted with no duplicates, in O(n) time.
+
+        Parameters
+        ----------
+        keys: List[K] - The keys, sorted with no duplicates.
+
+        Returns
+        -------
+        TreeSet[K] - A new TreeSet containing the given keys.
+        """
+        tree = cls()
+        tree._build(keys)
+        return tree
+
+    def _build(self, keys: List[K]):
+        """
+        Replace the contents of the set, building a perfectly balanced tree in O(n) time.
+
+        Parameters
+        ----------
+        keys: List[K] - The keys, sorted with no duplicates.
+
+        Returns
+        -------
+        None
+        """
+        self._root = _build_balanced(keys, _make_set_node)
+        self._count = len(keys)
+
+    def _sorted_keys(self) -> List[K]:
+        """
+        List the keys of the set in sorted order, in O(n) time.
+
+        Returns
+        -------
+        List[K] - The keys, sorted.
+        """
+        return [] if self._root is None else [node.key for node in self._root]
+
+    @staticmethod
+    def _keys_of(other: Iterable[K]) -> List[K]:
+        """
+        List the keys of another TreeSet (in O(n) time), or of any Iterable (sorting them).
+
+        Parameters
+        ----------
+        other: Iterable[K] - The keys.
+
+        Returns
+        -------
+        List[K] - The keys, sorted with no duplicates.
+        """
+        if isinstance(other, TreeSet):
+            return other._sorted_keys()
+        return _sorted_unique(list(other))
+
+    def add(self, key: K):  # pylint: disable=arguments-renamed
+        """
+        Add a key to the set, if it isn't already present.
+
+        Parameters
+        ----------
+        key: K - The key to add.
+
+        Returns
+        -------
+        None
+        """
+        if self._root is None:
+            self._root = _TreeNode(key)
+            self._count = 1
+            return
+        node, is_new = self._root.insert(key)
+        if is_new:
+            self._root = node.rebalance()
+            self._count += 1
+
+    def discard(self, key: K):  # pylint: disable=arguments-renamed
+        """
+        Remove a key from the set, if it is present.
+
+        Parameters
+        ----------
+        key: K - The key to remove.
+
+        Returns
+        -------
+        None
+        """
+        node = self._find_node(key)
+        if node is not None:
+            self._detach(node)
+
+    def remove(self, key: K):  # pylint: disable=arguments-renamed
+        """
+        Remove a key from the set.
+
+        Parameters
+        ----------
+        key: K - The key to remove.
+
+        Raises
+        ------
+        KeyError - If the key is not in the set.
+
+        Returns
+        -------
+        None
+        """
+        self._remove(key)
+
+    def pop(self, index: int = -1) -> K:
+        """
+        Remove and return the key at the given position in sorted order.
+        Takes O(log(n)) time.
+
+        Parameters
+        ----------
+        index: int - The position of the key; negative values count from the end.
+            Default is -1, the greatest key.
+
+        Raises
+        ------
+        KeyError - If the set is empty.
+        IndexError - If the index is out of range.
+
+        Returns
+        -------
+        K - The removed key.
+        """
+        if self._root is None:
+            raise KeyError("set is empty")
+        node = self._root.select(self._index_to_position(index))
+        key = node.key
+        self._detach(node)
+        return key
+
+    def clear(self):
+        """
+        Empty all data from the TreeSet.
+
+        Returns
+        -------
+        None
+        """
+        self._root = None
+        self._count = 0
+
+    def first(self) -> K:
+        """
+        Get the least key, without removing it.
+
+        Raises
+        ------
+        KeyError - If the set is empty.
+
+        Returns
+        -------
+        K - The least key.
+        """
+        if self._root is None:
+            raise KeyError("set is empty")
+        return self._root.first().key
+
+    def last(self) -> K:
+        """
+        Get the greatest key, without removing it.
+
+        Raises
+        ------
+        KeyError - If the set is empty.
+
+        Returns
+        -------
+        K - The greatest key.
+        """
+        if self._root is None:
+            raise KeyError("set is empty")
+        return self._root.last().key
+
+    def floor(self, key: K) -> Optional[K]:
+        """
+        Find the greatest key in the set that is less than or equal to the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the set.
+
+        Returns
+        -------
+        Optional[K] - The greatest key `<= key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.floor(key)
+        return None if node is None else node.key
+
+    def ceiling(self, key: K) -> Optional[K]:
+        """
+        Find the least key in the set that is greater than or equal to the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the set.
+
+        Returns
+        -------
+        Optional[K] - The least key `>= key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.ceiling(key)
+        return None if node is None else node.key
+
+    def lower(self, key: K) -> Optional[K]:
+        """
+        Find the greatest key in the set that is strictly less than the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the set.
+
+        Returns
+        -------
+        Optional[K] - The greatest key `< key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.floor(key, inclusive=False)
+        return None if node is None else node.key
+
+    def higher(self, key: K) -> Optional[K]:
+        """
+        Find the least key in the set that is strictly greater than the given key.
+
+        Parameters
+        ----------
+        key: K - The key to compare against; it doesn't need to be in the set.
+
+        Returns
+        -------
+        Optional[K] - The least key `> key`, or None if there is no such key.
+        """
+        node = None if self._root is None else self._root.ceiling(key, inclusive=False)
+        return None if node is None else node.key
+
+    def subset(self,
+               lo: Optional[K] = None,
+               hi: Optional[K] = None,
+               inclusive: Tuple[bool, bool] = (True, True)) -> "TreeSetView[K]":
+        """
+        Return a view of the keys between `lo` and `hi`, sorted.
+        The view reads from the set lazily, so it reflects any later changes to the set.
+
+        Parameters
+        ----------
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range. Default is `(True, True)`.
+
+        Returns
+        -------
+        TreeSetView[K] - A view of the keys in the range, sorted.
+        """
+        return TreeSetView(self, lo, hi, inclusive)
+
+    def union(self, *others: Iterable[K]) -> "TreeSet[K]":
+        """
+        Return a new TreeSet with the keys from this set and all the others.
+        Takes O(n + m) time for another TreeSet, or O(n + m*log(m)) for another Iterable,
+        which has to be sorted first.
+
+        Parameters
+        ----------
+        others: Iterable[K] - The keys to include along with this set's.
+
+        Returns
+        -------
+        TreeSet[K] - A new TreeSet.
+        """
+        keys = self._sorted_keys()
+        for other in others:
+            keys = _merge(keys, self._keys_of(other), True, True, True)
+        return self._from_unique(keys)
+
+    def intersection(self, *others: Iterable[K]) -> "TreeSet[K]":
+        """
+        Return a new TreeSet with the keys that are in this set and all the others.
+        Takes O(n + m) time for another TreeSet, or O(n + m*log(m)) for another Iterable,
+        which has to be sorted first.
+
+        Parameters
+        ----------
+        others: Iterable[K] - The keys to intersect with this set's.
+
+        Returns
+        -------
+        TreeSet[K] - A new TreeSet.
+        """
+        keys = self._sorted_keys()
+        for other in others:
+            keys = _merge(keys, self._keys_of(other), False, True, False)
+        return self._from_unique(keys)
+
+    def difference(self, *others: Iterable[K]) -> "TreeSet[K]":
+        """
+        Return a new TreeSet with the keys that are in this set but none of the others.
+        Takes O(n + m) time for another TreeSet, or O(n + m*log(m)) for another Iterable,
+        which has to be sorted first.
+
+        Parameters
+        ----------
+        others: Iterable[K] - The keys to leave out of the result.
+
+        Returns
+        -------
+        TreeSet[K] - A new TreeSet.
+        """
+        keys = self._sorted_keys()
+        for other in others:
+            keys = _merge(keys, self._keys_of(other), True, False, False)
+        return self._from_unique(keys)
+
+    def symmetric_difference(self, other: Iterable[K]) -> "TreeSet[K]":
+        """
+        Return a new TreeSet with the keys that are in either this set or the other, but not both.
+        Takes O(n + m) time for another TreeSet, or O(n + m*log(m)) for another Iterable,
+        which has to be sorted first.
+
+        Parameters
+        ----------
+        other: Iterable[K] - The keys to compare with this set's.
+
+        Returns
+        -------
+        TreeSet[K] - A new TreeSet.
+        """
+        return self._from_unique(
+            _merge(self._sorted_keys(), self._keys_of(other), True, False, True))
+
+    def update(self, *others: Iterable[K]):
+        """
+        Add the keys from all the others to this set.
+        If a batch of new keys is small compared to the set, each key is inserted
+        individually, taking O(m*log(n)) time. If it is large, the (sorted) batch is instead
+        merged with the existing contents and the tree is rebuilt, taking O(n + m) time.
+
+        Parameters
+        ----------
+        others: Iterable[K] - The keys to add.
+
+        Returns
+        -------
+        None
+        """
+        for other in others:
+            keys = self._keys_of(other)
+            if _should_rebuild(self._count, len(keys)):
+                self._build(_merge(self._sorted_keys(), keys, True, True, True))
+            else:
+                for key in keys:
+                    self.add(key)
+
+    def intersection_update(self, *others: Iterable[K]):
+        """
+        Remove the keys from this set that are not in all the others, in O(n + m) time.
+
+        Parameters
+        ----------
+        others: Iterable[K] - The keys to intersect with this set's.
+
+        Returns
+        -------
+        None
+        """
+        self._build(self.intersection(*others)._sorted_keys())
+
+    def difference_update(self, *others: Iterable[K]):
+        """
+        Remove the keys in any of the others from this set.
+        If a batch of keys is small compared to the set, each key is removed
+        individually, taking O(m*log(n)) time. If it is large, the sets are merged
+        and the tree is rebuilt, taking O(n + m) time.
+
+        Parameters
+        ----------
+        others: Iterable[K] - The keys to remove.
+
+        Returns
+        -------
+        None
+        """
+        for other in others:
+            keys = self._keys_of(other)
+            if _should_rebuild(self._count, len(keys)):
+                self._build(_merge(self._sorted_keys(), keys, True, False, False))
+            else:
+                for key in keys:
+                    self.discard(key)
+
+    def symmetric_difference_update(self, other: Iterable[K]):
+        """
+        Keep only the keys that are in either this set or the other, but not both,
+        in O(n + m) time.
+
+        Parameters
+        ----------
+        other: Iterable[K] - The keys to compare with this set's.
+
+        Returns
+        -------
+        None
+        """
+        self._build(_merge(self._sorted_keys(), self._keys_of(other), True, False, True))
+
+    def __or__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `union`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `intersection`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `difference`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        return self.difference(other)
+
+    def __xor__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `symmetric_difference`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        return self.symmetric_difference(other)
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __ior__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `update`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __iand__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `intersection_update`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `difference_update`. Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other: Any) -> "TreeSet[K]":
+        """
+        See `symmetric_difference_update`.
+        Like the builtin `set`, the operator only accepts other sets.
+        """
+        if not isinstance(other, SetABC):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Check if a key is present in the set.
+
+        Parameters
+        ----------
+        key: Any - The key to search for.
+
+        Returns
+        -------
+        bool - True if the key is in the set, False if not.
+        """
+        return self._find_node(key) is not None
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Check if the set is equal to another set.
+        Two TreeSets are compared in a single in-order pass, using `!=` on the keys;
+        any other set is compared like `collections.abc.Set` does.
+
+        Parameters
+        ----------
+        other: Any - The object to compare to.
+
+        Returns
+        -------
+        bool - True if `other` is a set with the same keys, False otherwise.
+        """
+        if not isinstance(other, TreeSet):
+            return super().__eq__(other)
+        if self._count != other._count:
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[K, List[K]]:
+        """
+        Get the key (or keys) at the given position(s) in sorted order, like indexing a list.
+        A single key takes O(log(n)), and a slice of k keys takes O(log(n) + k).
+
+        Parameters
+        ----------
+        index: Union[int, slice] - The position of the key, or a slice of positions.
+            Negative values count from the end.
+
+        Raises
+        ------
+        IndexError - If a single index is out of range.
+
+        Returns
+        -------
+        Union[K, List[K]] - The key at the given position, or a list of keys for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.islice(start, stop))
+        position = self._index_to_position(index)
+        return self._root.select(position).key
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the set.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the set.
+        """
+        return f"{self.__class__.__name__}(len={self._count})"
+
+    __hash__ = None
+
+
+class TreeSetView(TreeMapKeysView):
+    """
+    A lazy view of the keys of a TreeSet within a range, sorted. Returned by `TreeSet.subset`.
+    Supports everything a `dict` keys view does, plus reversal and positional indexing.
+    """
+    __slots__ = ()
+
+    def __init__(self,
+                 tree_set: TreeSet,
+                 lo: Optional[K] = None,
+                 hi: Optional[K] = None,
+                 inclusive: Tuple[bool, bool] = (True, True)):
+        """
+        Construct a view of a TreeSet.
+
+        Parameters
+        ----------
+        tree_set: TreeSet - The set to view.
+        lo: Optional[K] - The lower bound of the range. If None (default), there is no lower bound.
+        hi: Optional[K] - The upper bound of the range. If None (default), there is no upper bound.
+        inclusive: Tuple[bool, bool] - Whether `lo` and `hi` (respectively) are themselves
+            included in the range. Default is `(True, True)`.
+        """
+        super().__init__(tree_set, lo, hi, inclusive)
@@ -0,0 +1,889 @@
+from array import array
+from collections.abc import Mapping as MappingABC, MutableMapping
+from typing import Any, Dict, Generator, Generic, Iterable, List, Mapping, Optional, Tuple, \
+    TypeVar, Union
+
+from .tree_map import _dedupe_sorted, _is_sorted, _sorted_unique_pairs, _to_pairs
+
+
+V = TypeVar("V")
+
+
+class _Missing:
+    """
+    Type of `_MISSING`, which marks a node with no value (`None` is a valid value).
+    Copying or unpickling it gives back the same object, so copied Tries still recognize it.
+    """
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        """
+        Tell `copy` and `pickle` to refer to the module-level instance by name.
+
+        Returns
+        -------
+        str - the instance's name in this module.
+        """
+        return "_MISSING"
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the marker.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - The marker's name.
+        """
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def _check_key(key: Any):
+    """
+    Make sure a key can be stored in a Trie.
+
+    Parameters
+    ----------
+    key: Any - The key to check.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    TypeError - If `key` is not a str.
+    """
+    if not isinstance(key, str):
+        raise TypeError(f"Trie keys must be strings, not {type(key).__name__}")
+
+
+def _common_prefix_length(label: str, key: str, pos: int) -> int:
+    """
+    Count how many characters at the start of `label` match `key` starting at `pos`.
+
+    Parameters
+    ----------
+    label: str - The edge label to compare.
+    key: str - The key being looked up.
+    pos: int - Where in `key` to start comparing.
+
+    Returns
+    -------
+    int - The length of the common prefix.
+    """
+    if key.startswith(label, pos):
+        return len(label)
+    limit = min(len(label), len(key) - pos)
+    i = 0
+    while i < limit and label[i] == key[pos + i]:
+        i += 1
+    return i
+
+
+class _TrieNode(Generic[V]):
+    """
+    Intended only as a "helper class" to Trie.
+    A node of a radix tree: chains of nodes with a single child and no value are collapsed,
+    so each node's `label` is the whole substring on the edge from its parent.
+    Each node also caches the number of keys in its subtree.
+    """
+    __slots__ = "label", "children", "value", "size"
+
+    def __init__(self, label: str, value: Any = _MISSING):
+        """
+        Construct a node of a radix tree, with no children.
+
+        Parameters
+        ----------
+        label: str - The characters on the edge from this node's parent.
+        value: Any - The value stored at this node, or `_MISSING` if no key ends here.
+        """
+        self.label = label
+        # maps the first character of each child's label to the child; None if there are none
+        self.children: Optional[Dict[str, "_TrieNode[V]"]] = None
+        self.value = value
+        self.size = 0 if value is _MISSING else 1
+
+    def add_child(self, child: "_TrieNode[V]"):
+        """
+        Attach a node as a child of this one, keyed by the first character of its label.
+
+        Parameters
+        ----------
+        child: _TrieNode[V] - The new child. Its label must not be empty.
+
+        Returns
+        -------
+        None
+        """
+        if self.children is None:
+            self.children = {}
+        self.children[child.label[0]] = child
+
+    def iter_items(self, path: str) -> Generator[Tuple[str, V], None, None]:
+        """
+        Iterate over the keys and values in the subtree starting at this node, in sorted order.
+        Uses an explicit stack rather than recursion, so long keys are not limited by
+        Python's recursion limit.
+
+        Parameters
+        ----------
+        path: str - The key that this node represents (all labels from the root to here).
+
+        Returns
+        -------
+        Generator[Tuple[str, V], None, None] - lazily generates the (key, value) pairs.
+        """
+        stack = [(self, path)]
+        while len(stack) > 0:
+            node, path = stack.pop()
+            if node.value is not _MISSING:
+                yield path, node.value
+            if node.children is not None:
+                # reversed, so that the least child is popped first
+                for first in sorted(node.children, reverse=True):
+                    child = node.children[first]
+                    stack.append((child, path + child.label))
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the node.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the node.
+        """
+        return f"{self.__class__.__name__}(label={self.label!r}, size={self.size})"
+
+
+def _build_radix(pairs: List[Tuple[str, V]]) -> _TrieNode[V]:
+    """
+    Build a radix tree from key/value pairs in time linear in the total length of the keys.
+    Keeps a stack of the nodes along the path to the previous key; each key only needs the
+    part of that path it shares with the previous key (their common prefix), plus one new leaf.
+
+    Parameters
+    ----------
+    pairs: List[Tuple[str, V]] - The key/value pairs, sorted by key with no duplicate keys.
+
+    Returns
+    -------
+    _TrieNode[V] - The root of the new tree.
+    """
+    root: _TrieNode[V] = _TrieNode("")
+    # nodes along the path to the previous key, each with the length of the key prefix it ends at
+    stack: List[Tuple[_TrieNode[V], int]] = [(root, 0)]
+    previous = ""
+    for key, value in pairs:
+        _check_key(key)
+        common = _common_prefix_length(previous, key, 0) if len(stack) > 1 else 0
+        popped = None
+        while stack[-1][1] > common:
+            popped = stack.pop()[0]
+        parent, depth = stack[-1]
+        if depth < common:
+            # the new key branches off partway along the edge to `popped`; split that edge
+            cut = common - depth
+            middle: _TrieNode[V] = _TrieNode(popped.label[:cut])
+            middle.size = popped.size
+            popped.label = popped.label[cut:]
+            middle.add_child(popped)
+            parent.add_child(middle)  # replaces `popped`, which had the same first character
+            stack.append((middle, common))
+            parent = middle
+        for node, _ in stack:
+            node.size += 1
+        if len(key) == common:
+            # only possible for the empty key, which is stored at the root
+            parent.value = value
+        else:
+            leaf = _TrieNode(key[common:], value)
+            parent.add_child(leaf)
+            stack.append((leaf, len(key)))
+        previous = key
+    return root
+
+
+class Trie(MutableMapping, Generic[V]):
+    """
+    A dictionary/map object with string keys, backed by a radix tree (AKA a Patricia trie).
+    Keys are iterated in sorted order, and keys that share a prefix can be found quickly:
+    iterating over them, counting them, or finding the longest key that is a prefix of a string.
+    Lookups, insertions, and removals take O(length of the key) time, regardless of the number
+    of keys.
+
+    Chains of nodes with only one child are collapsed into a single node with a longer label,
+    so there are fewer than 2 nodes per key. For a compact, read-only copy, see `freeze`.
+
+    `V` represents the type of values.
+    """
+    # pylint: disable=protected-access
+    __slots__ = "_root", "_count"
+
+    def __init__(self, data: Union[Mapping[str, V], Iterable[Tuple[str, V]]] = None):
+        """
+        Construct a Trie.
+        If initial data is given, it is sorted (unless it's already sorted) and then the
+        tree is built in a single pass, rather than inserting the pairs one at a time.
+
+        Parameters
+        ----------
+        data: Union[Mapping[str, V], Iterable[Tuple[str, V]]] (optional) -
+            initial key/value pairs for the Trie to store, as a Mapping object or
+            an Iterable of key/value pairs. If a key is given more than once,
+            the last value given for it is kept.
+            If `None` (default), the Trie starts with no contents.
+
+        Raises
+        ------
+        TypeError - If a key is not a str.
+        """
+        self._root: _TrieNode[V] = _TrieNode("")
+        self._count = 0
+        if data is not None:
+            self._build(_sorted_unique_pairs(_to_pairs(data)))
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[Tuple[str, V]]) -> "Trie[V]":
+        """
+        Construct a Trie from key/value pairs which are already sorted by key,
+        in time linear in the total length of the keys.
+        If a key is given more than once, the last value given for it is kept.
+
+        Parameters
+        ----------
+        pairs: Iterable[Tuple[str, V]] - The key/value pairs, sorted by key.
+
+        Raises
+        ------
+        ValueError - If the pairs are not sorted by key.
+        TypeError - If a key is not a str.
+
+        Returns
+        -------
+        Trie[V] - A new Trie containing the given pairs.
+        """
+        pairs = _to_pairs(pairs)
+        if not _is_sorted(pairs):
+            raise ValueError("pairs are not sorted by key")
+        trie = cls()
+        trie._build(_dedupe_sorted(pairs))
+        return trie
+
+    def _build(self, pairs: List[Tuple[str, V]]):
+        """
+        Replace the contents of the Trie, building the tree in a single pass.
+
+        Parameters
+        ----------
+        pairs: List[Tuple[str, V]] - The key/value pairs, sorted by key with no duplicate keys.
+
+        Returns
+        -------
+        None
+        """
+        self._root = _build_radix(pairs)
+        self._count = len(pairs)
+
+    def _walk(self, prefix: str) -> Optional[Tuple[_TrieNode[V], str]]:
+        """
+        Find the highest node whose key starts with `prefix`.
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for.
+
+        Returns
+        -------
+        Optional[Tuple[_TrieNode[V], str]] - The node, and the key it represents
+            (which may extend past `prefix`), or `None` if no key starts with `prefix`.
+        """
+        node = self._root
+        pos = 0
+        while pos < len(prefix):
+            child = None if node.children is None else node.children.get(prefix[pos])
+            if child is None:
+                return None
+            label = child.label
+            if not prefix.startswith(label, pos):
+                # the prefix must end partway along this edge
+                if label.startswith(prefix[pos:]):
+                    return child, prefix[:pos] + label
+                return None
+            node = child
+            pos += len(label)
+        return node, prefix
+
+    def _find(self, key: Any) -> Optional[_TrieNode[V]]:
+        """
+        Find the node for a key, if the key is in the Trie.
+
+        Parameters
+        ----------
+        key: Any - The key to search for.
+
+        Returns
+        -------
+        Optional[_TrieNode[V]] - The node with the given key,
+            None if there is no node with the given key.
+        """
+        if not isinstance(key, str):
+            return None
+        found = self._walk(key)
+        if found is None or len(found[1]) != len(key) or found[0].value is _MISSING:
+            return None
+        return found[0]
+
+    def iter_prefix(self, prefix: str) -> Generator[str, None, None]:
+        """
+        Iterate over the keys that start with `prefix`, in sorted order.
+        Finding the first one takes O(length of the prefix), and then each key takes
+        about O(length of the key).
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for. The empty string matches every key.
+
+        Returns
+        -------
+        Generator[str, None, None] - lazily generates the keys.
+        """
+        for key, _ in self.iter_prefix_items(prefix):
+            yield key
+
+    def iter_prefix_items(self, prefix: str) -> Generator[Tuple[str, V], None, None]:
+        """
+        Iterate over the (key, value) pairs whose keys start with `prefix`, sorted by keys.
+        See `iter_prefix`.
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for. The empty string matches every key.
+
+        Returns
+        -------
+        Generator[Tuple[str, V], None, None] - lazily generates the (key, value) pairs.
+        """
+        found = self._walk(prefix)
+        if found is not None:
+            yield from found[0].iter_items(found[1])
+
+    def count_prefix(self, prefix: str) -> int:
+        """
+        Count the keys that start with `prefix`, in O(length of the prefix) time.
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for. The empty string matches every key.
+
+        Returns
+        -------
+        int - The number of keys that start with `prefix`.
+        """
+        found = self._walk(prefix)
+        return 0 if found is None else found[0].size
+
+    def longest_prefix(self, query: str) -> Tuple[str, V]:
+        """
+        Find the longest key that is a prefix of `query` (including `query` itself),
+        in O(length of the query) time. This is the lookup a routing table does.
+
+        Parameters
+        ----------
+        query: str - The string to match against.
+
+        Raises
+        ------
+        KeyError - If no key is a prefix of `query`.
+
+        Returns
+        -------
+        Tuple[str, V] - The longest matching key, and its value.
+        """
+        node = self._root
+        best = None if node.value is _MISSING else ("", node.value)
+        pos = 0
+        while pos < len(query) and node.children is not None:
+            child = node.children.get(query[pos])
+            if child is None or not query.startswith(child.label, pos):
+                break
+            node = child
+            pos += len(child.label)
+            if node.value is not _MISSING:
+                best = query[:pos], node.value
+        if best is None:
+            raise KeyError(query)
+        return best
+
+    def freeze(self) -> "FrozenTrie[V]":
+        """
+        Make a compact, read-only copy of the Trie, which keeps the whole tree in a few flat
+        arrays rather than one object per node. See `FrozenTrie`.
+
+        Returns
+        -------
+        FrozenTrie[V] - A read-only copy of the Trie.
+        """
+        return FrozenTrie(self)
+
+    def clear(self):
+        """
+        Empty all data from the Trie.
+
+        Returns
+        -------
+        None
+        """
+        self._root = _TrieNode("")
+        self._count = 0
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Check if a key is present in the Trie.
+
+        Parameters
+        ----------
+        key: Any - The key to search for.
+
+        Returns
+        -------
+        bool - True if the key is in the Trie, False if not.
+        """
+        return self._find(key) is not None
+
+    def __getitem__(self, key: str) -> V:
+        """
+        Return the value associated with the given key.
+
+        Parameters
+        ----------
+        key: str - The key to search for and retrieve a value for.
+
+        Raises
+        ------
+        KeyError - If the key is not in the Trie.
+
+        Returns
+        -------
+        V - The value associated with the given key.
+        """
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key: str, value: V):
+        """
+        Set the given key's value to the given value.
+        Can be used to overwrite the value of an existing key, or to insert a new key/value pair.
+
+        Parameters
+        ----------
+        key: str - The key where the value should be written.
+        value: V - The value to be written.
+
+        Raises
+        ------
+        TypeError - If the key is not a str.
+
+        Returns
+        -------
+        None
+        """
+        _check_key(key)
+        node = self._root
+        path = [node]
+        pos = 0
+        while pos < len(key):
+            child = None if node.children is None else node.children.get(key[pos])
+            if child is None:
+                # dead end; the rest of the key becomes a new leaf
+                node.add_child(_TrieNode(key[pos:], value))
+                break
+            common = _common_prefix_length(child.label, key, pos)
+            if common < len(child.label):
+                # the key leaves (or ends) partway along this edge; split it
+                middle: _TrieNode[V] = _TrieNode(child.label[:common])
+                middle.size = child.size
+                child.label = child.label[common:]
+                middle.add_child(child)
+                node.add_child(middle)  # replaces `child`, which had the same first character
+                child = middle
+            node = child
+            path.append(node)
+            pos += common
+        else:
+            is_new = node.value is _MISSING
+            node.value = value
+            if not is_new:
+                return
+        for node in path:
+            node.size += 1
+        self._count += 1
+
+    def __delitem__(self, key: str):
+        """
+        Remove the key and its value from the Trie.
+        Nodes left with no value and only one child are merged with that child,
+        so the tree stays as small as if the key had never been added.
+
+        Parameters
+        ----------
+        key: str - The key to search for and remove.
+
+        Raises
+        ------
+        KeyError - If the key is not in the Trie.
+
+        Returns
+        -------
+        None
+        """
+        if not isinstance(key, str):
+            raise KeyError(key)
+        node = self._root
+        path = []
+        pos = 0
+        while pos < len(key):
+            child = None if node.children is None else node.children.get(key[pos])
+            if child is None or not key.startswith(child.label, pos):
+                raise KeyError(key)
+            path.append(node)
+            node = child
+            pos += len(child.label)
+        if node.value is _MISSING:
+            raise KeyError(key)
+        node.value = _MISSING
+        node.size -= 1
+        for ancestor in path:
+            ancestor.size -= 1
+        self._count -= 1
+        if node.children is None and len(path) > 0:
+            # nothing left below this node; unlink it
+            parent = path.pop()
+            del parent.children[node.label[0]]
+            if len(parent.children) == 0:
+                parent.children = None
+            node = parent
+        if len(path) > 0 and node.value is _MISSING and node.children is not None \
+                and len(node.children) == 1:
+            # collapse the chain; the node keeps its place under its parent
+            (child,) = node.children.values()
+            node.label += child.label
+            node.children = child.children
+            node.value = child.value
+
+    def __iter__(self) -> Generator[str, None, None]:
+        """
+        Iterate over the keys, in sorted order.
+
+        Returns
+        -------
+        Generator[str, None, None] - lazily generates the keys in sorted order.
+        """
+        for key, _ in self._root.iter_items(""):
+            yield key
+
+    def __len__(self) -> int:
+        """
+        Return the number of keys in the Trie.
+
+        Returns
+        -------
+        int - The number of key/value pairs in the Trie.
+        """
+        return self._count
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the Trie.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the Trie.
+        """
+        return f"{self.__class__.__name__}(len={self._count})"
+
+
+class FrozenTrie(MappingABC, Generic[V]):
+    """
+    A compact, read-only copy of a Trie. Create one with `Trie.freeze`.
+    Supports the same lookups as Trie, with the same time complexity.
+
+    Instead of one object (and one dict of children) per node, the nodes are numbered in
+    breadth-first order so that each node's children are consecutive, and the whole tree
+    is kept in a few flat arrays: every edge label concatenated into one string, offsets into
+    that string, offsets to each node's first child, the first character of each node's label
+    (to find children with `str.find`), each subtree's key count, and a list of values.
+
+    `V` represents the type of values.
+    """
+    __slots__ = "_labels", "_label_offsets", "_child_offsets", "_first_chars", "_sizes", \
+        "_values"
+
+    def __init__(self, trie: Trie[V]):
+        """
+        Pack a Trie into a FrozenTrie, in O(n) time.
+
+        Parameters
+        ----------
+        trie: Trie[V] - The Trie to copy.
+        """
+        # pylint: disable=protected-access
+        nodes = [trie._root]
+        labels = []
+        self._label_offsets = array("q", [0])
+        self._child_offsets = array("q")
+        for node in nodes:  # grows as the loop goes, giving breadth-first order
+            labels.append(node.label)
+            self._label_offsets.append(self._label_offsets[-1] + len(node.label))
+            self._child_offsets.append(len(nodes))
+            if node.children is not None:
+                nodes.extend(node.children[first] for first in sorted(node.children))
+        self._child_offsets.append(len(nodes))
+        self._labels = "".join(labels)
+        # the root has no label; give it a placeholder, which is never searched
+        self._first_chars = "".join(label[:1] or "\0" for label in labels)
+        self._sizes = array("q", (node.size for node in nodes))
+        self._values: List[Any] = [node.value for node in nodes]
+
+    def _label(self, i: int) -> str:
+        """
+        Get the label of node `i`.
+
+        Parameters
+        ----------
+        i: int - The node number.
+
+        Returns
+        -------
+        str - The node's label.
+        """
+        return self._labels[self._label_offsets[i]:self._label_offsets[i + 1]]
+
+    def _child(self, i: int, first: str) -> int:
+        """
+        Find the child of node `i` whose label starts with `first`.
+
+        Parameters
+        ----------
+        i: int - The node number.
+        first: str - The first character of the child's label.
+
+        Returns
+        -------
+        int - The child's node number, or -1 if there is no such child.
+        """
+        return self._first_chars.find(first, self._child_offsets[i], self._child_offsets[i + 1])
+
+    def _walk(self, prefix: str) -> Optional[Tuple[int, str]]:
+        """
+        Find the highest node whose key starts with `prefix`. See `Trie._walk`.
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for.
+
+        Returns
+        -------
+        Optional[Tuple[int, str]] - The node number, and the key it represents
+            (which may extend past `prefix`), or `None` if no key starts with `prefix`.
+        """
+        i = 0
+        pos = 0
+        while pos < len(prefix):
+            i = self._child(i, prefix[pos])
+            if i < 0:
+                return None
+            label = self._label(i)
+            if not prefix.startswith(label, pos):
+                if label.startswith(prefix[pos:]):
+                    return i, prefix[:pos] + label
+                return None
+            pos += len(label)
+        return i, prefix
+
+    def _iter_items(self, i: int, path: str) -> Generator[Tuple[str, V], None, None]:
+        """
+        Iterate over the keys and values in the subtree starting at node `i`, in sorted order.
+
+        Parameters
+        ----------
+        i: int - The node number.
+        path: str - The key that node `i` represents.
+
+        Returns
+        -------
+        Generator[Tuple[str, V], None, None] - lazily generates the (key, value) pairs.
+        """
+        child_offsets, values = self._child_offsets, self._values
+        stack = [(i, path)]
+        while len(stack) > 0:
+            i, path = stack.pop()
+            if values[i] is not _MISSING:
+                yield path, values[i]
+            # reversed, so that the least child is popped first
+            for child in reversed(range(child_offsets[i], child_offsets[i + 1])):
+                stack.append((child, path + self._label(child)))
+
+    def iter_prefix(self, prefix: str) -> Generator[str, None, None]:
+        """
+        Iterate over the keys that start with `prefix`, in sorted order.
+        Finding the first one takes O(length of the prefix), and then each key takes
+        about O(length of the key).
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for. The empty string matches every key.
+
+        Returns
+        -------
+        Generator[str, None, None] - lazily generates the keys.
+        """
+        for key, _ in self.iter_prefix_items(prefix):
+            yield key
+
+    def iter_prefix_items(self, prefix: str) -> Generator[Tuple[str, V], None, None]:
+        """
+        Iterate over the (key, value) pairs whose keys start with `prefix`, sorted by keys.
+        See `iter_prefix`.
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for. The empty string matches every key.
+
+        Returns
+        -------
+        Generator[Tuple[str, V], None, None] - lazily generates the (key, value) pairs.
+        """
+        found = self._walk(prefix)
+        if found is not None:
+            yield from self._iter_items(*found)
+
+    def count_prefix(self, prefix: str) -> int:
+        """
+        Count the keys that start with `prefix`, in O(length of the prefix) time,
+        using the key counts stored for each subtree.
+
+        Parameters
+        ----------
+        prefix: str - The prefix to search for. The empty string matches every key.
+
+        Returns
+        -------
+        int - The number of keys that start with `prefix`.
+        """
+        found = self._walk(prefix)
+        return 0 if found is None else self._sizes[found[0]]
+
+    def longest_prefix(self, query: str) -> Tuple[str, V]:
+        """
+        Find the longest key that is a prefix of `query` (including `query` itself),
+        in O(length of the query) time.
+
+        Parameters
+        ----------
+        query: str - The string to match against.
+
+        Raises
+        ------
+        KeyError - If no key is a prefix of `query`.
+
+        Returns
+        -------
+        Tuple[str, V] - The longest matching key, and its value.
+        """
+        values = self._values
+        best = None if values[0] is _MISSING else ("", values[0])
+        i = 0
+        pos = 0
+        while pos < len(query):
+            i = self._child(i, query[pos])
+            if i < 0:
+                break
+            label = self._label(i)
+            if not query.startswith(label, pos):
+                break
+            pos += len(label)
+            if values[i] is not _MISSING:
+                best = query[:pos], values[i]
+        if best is None:
+            raise KeyError(query)
+        return best
+
+    def __contains__(self, key: Any) -> bool:
+        """
+        Check if a key is present in the FrozenTrie.
+
+        Parameters
+        ----------
+        key: Any - The key to search for.
+
+        Returns
+        -------
+        bool - True if the key is in the FrozenTrie, False if not.
+        """
+        if not isinstance(key, str):
+            return False
+        found = self._walk(key)
+        return found is not None and len(found[1]) == len(key) \
+            and self._values[found[0]] is not _MISSING
+
+    def __getitem__(self, key: str) -> V:
+        """
+        Return the value associated with the given key.
+
+        Parameters
+        ----------
+        key: str - The key to search for and retrieve a value for.
+
+        Raises
+        ------
+        KeyError - If the key is not in the FrozenTrie.
+
+        Returns
+        -------
+        V - The value associated with the given key.
+        """
+        found = self._walk(key) if isinstance(key, str) else None
+        if found is None or len(found[1]) != len(key) or self._values[found[0]] is _MISSING:
+            raise KeyError(key)
+        return self._values[found[0]]
+
+    def __iter__(self) -> Generator[str, None, None]:
+        """
+        Iterate over the keys, in sorted order.
+
+        Returns
+        -------
+        Generator[str, None, None] - lazily generates the keys in sorted order.
+        """
+        for key, _ in self._iter_items(0, ""):
+            yield key
+
+    def __len__(self) -> int:
+        """
+        Return the number of keys in the FrozenTrie.
+
+        Returns
+        -------
+        int - The number of key/value pairs in the FrozenTrie.
+        """
+        return self._sizes[0]
+
+    def __repr__(self) -> str:
+        """
+        Give a simple string representation of the FrozenTrie.
+        For debugging purposes.
+
+        Returns
+        -------
+        str - A simple string value to represent the FrozenTrie.
+        """
+        return f"{self.__class__.__name__}(len={len(self)})"
@@ -36,7 +36,7 @@ setup(
              "util utils utility utilities",
     python_requires=">=3.8",
     packages=find_packages(
-        exclude=["tests"]
+        exclude=["tests", "benchmarks"]
     ),
     # install_requires=[],
 )
@@ -0,0 +1,155 @@
+import random
+from typing import Any, List, Tuple
+
+import pytest
+
+from ech_datastructures import BTreeMap, TreeMap
+from ech_datastructures.b_tree_map import _BTreeBranch, _BTreeLeaf
+
+
+def assert_valid(tree: BTreeMap):
+    """
+    Check the structural invariants of the backing B+ tree: node fill, separator keys,
+    uniform leaf depth, and the links between leaves.
+    """
+    fanout = tree._max
+    leaves: List[_BTreeLeaf] = []
+    # (node, depth, lower bound, upper bound)
+    stack: List[Tuple[Any, int, Any, Any]] = [(tree._root, 0, None, None)]
+    while len(stack) > 0:
+        node, depth, lo, hi = stack.pop()
+        is_root = node is tree._root
+        if depth == tree._height:
+            assert isinstance(node, _BTreeLeaf), "all leaves should be at the same depth"
+            assert len(node.keys) == len(node.values)
+            assert len(node.keys) <= fanout, "leaf is overfull"
+            if not is_root:
+                assert len(node.keys) >= fanout // 2, "leaf is underfull"
+            assert node.keys == sorted(node.keys)
+            for key in node.keys:
+                assert lo is None or not key < lo, "key is below its separator"
+                assert hi is None or key < hi, "key is above its separator"
+            leaves.append(node)
+            continue
+        assert isinstance(node, _BTreeBranch), "branches should only be above the leaves"
+        assert len(node.children) == len(node.keys) + 1
+        assert len(node.children) <= fanout, "branch is overfull"
+        assert len(node.children) >= (2 if is_root else fanout // 2), "branch is underfull"
+        bounds = [lo] + node.keys + [hi]
+        # push in reverse, so leaves come off the stack in order
+        for i in reversed(range(len(node.children))):
+            stack.append((node.children[i], depth + 1, bounds[i], bounds[i + 1]))
+    assert sum(len(leaf.keys) for leaf in leaves) == len(tree)
+    for prev, leaf in zip(leaves, leaves[1:]):
+        assert prev.next is leaf and leaf.prev is prev, "leaf links are broken"
+    assert leaves[0].prev is None and leaves[-1].next is None
+
+
+def assert_empty(tree: BTreeMap):
+    assert len(tree) == 0
+    with pytest.raises(KeyError):
+        del tree[1]
+    with pytest.raises(KeyError):
+        print(tree[2])
+    assert 3 not in tree
+    with pytest.raises(KeyError):
+        tree.pop(4)
+    assert tree.get(5, "potato") == "potato"
+    with pytest.raises(KeyError):
+        tree.popitem()
+    assert list(tree) == []
+    assert list(tree.items()) == []
+
+
+def test_empty():
+    assert_empty(BTreeMap())
+    with pytest.raises(ValueError):
+        BTreeMap(fanout=3)
+
+
+@pytest.mark.parametrize("fanout", [4, 5, 8, 64])
+def test_random_operations(fanout: int):
+    random.seed(fanout)
+    tree = BTreeMap(fanout=fanout)
+    expected = {}
+    for step in range(4000):
+        key = random.randrange(600)
+        action = random.random()
+        if action < 0.5:
+            tree[key] = step
+            expected[key] = step
+        elif action < 0.6:
+            assert tree.setdefault(key, step) == expected.setdefault(key, step)
+        elif key in expected:
+            assert tree.pop(key) == expected.pop(key)
+        else:
+            assert key not in tree
+            with pytest.raises(KeyError):
+                del tree[key]
+        if step % 200 == 0:
+            assert_valid(tree)
+    assert_valid(tree)
+    assert list(tree.items()) == sorted(expected.items())
+    assert list(reversed(tree)) == sorted(expected, reverse=True)
+    assert list(reversed(tree.values())) == [v for _, v in sorted(expected.items(), reverse=True)]
+    assert list(tree.keys()) == sorted(expected)
+    assert list(reversed(tree.keys())) == sorted(expected, reverse=True)
+    assert list(reversed(tree.items())) == sorted(expected.items(), reverse=True)
+    assert tree.keys() == expected.keys()
+    while len(tree) > 0:
+        key, value = tree.popitem()
+        assert key == max(expected)
+        assert expected.pop(key) == value
+    assert_valid(tree)
+    assert_empty(tree)
+
+
+@pytest.mark.parametrize("n", [0, 1, 4, 5, 17, 100, 1000])
+def test_bulk_build(n: int):
+    pairs = [(i, str(i)) for i in range(n)]
+    tree = BTreeMap.from_sorted(pairs, fanout=4)
+    assert_valid(tree)
+    assert list(tree.items()) == pairs
+    shuffled = random.sample(pairs, n)
+    assert BTreeMap(shuffled, fanout=4) == tree
+    assert BTreeMap(dict(shuffled), fanout=4) == tree
+    with pytest.raises(ValueError):
+        BTreeMap.from_sorted([(2, "b"), (1, "a")])
+
+
+def test_update():
+    tree = BTreeMap({x: "old" for x in range(0, 300, 3)}, fanout=6)
+    expected = dict(tree.items())
+    for batch in ([(1, "a")], [(x, "new") for x in range(0, 300, 2)]):
+        tree.update(batch)
+        expected.update(batch)
+        assert_valid(tree)
+        assert list(tree.items()) == sorted(expected.items())
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_irange(reverse: bool):
+    keys = list(range(0, 300, 3))
+    tree = BTreeMap.from_sorted([(x, x) for x in keys], fanout=4)
+    for lo, hi in [(None, None), (10, 20), (9, 21), (-5, 5), (290, 400), (60, 40), (None, 50)]:
+        for inclusive in [(True, True), (True, False), (False, True), (False, False)]:
+            expected = [
+                x for x in keys
+                if (lo is None or (lo <= x if inclusive[0] else lo < x))
+                and (hi is None or (x <= hi if inclusive[1] else x < hi))
+            ]
+            if reverse:
+                expected.reverse()
+            assert list(tree.irange(lo, hi, inclusive, reverse)) == expected
+    assert list(BTreeMap().irange(1, 5, reverse=reverse)) == []
+
+
+def test_matches_tree_map():
+    random.seed(5)
+    pairs = [(random.random(), i) for i in range(500)]
+    b_tree = BTreeMap(pairs, fanout=8)
+    tree = TreeMap(pairs)
+    assert list(b_tree.items()) == list(tree.items())
+    assert b_tree.first() == tree.first()
+    assert b_tree.last() == tree.last()
+    assert b_tree != tree, "maps of different classes are never equal"
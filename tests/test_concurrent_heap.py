@@ -0,0 +1,190 @@
+import asyncio
+import queue
+import random
+import threading
+
+import pytest
+
+from ech_datastructures import AsyncHeap, ConcurrentHeap
+
+
+class Tagged:
+    """Items that compare equal by priority but can be told apart by tag."""
+    def __init__(self, priority: int, tag: int):
+        self.priority = priority
+        self.tag = tag
+
+    def __lt__(self, other: "Tagged") -> bool:
+        return self.priority < other.priority
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Tagged) and self.priority == other.priority
+
+    __hash__ = None
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_put_get_order(kwargs: dict):
+    vals = [5, -4, 7, 8, -4, 6, 2, -7, 1]
+    q = ConcurrentHeap(**kwargs)
+    for val in vals:
+        q.put(val)
+    assert q.qsize() == len(vals)
+    expected = sorted(vals, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    assert [q.get() for _ in range(len(vals))] == expected
+    assert q.empty()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": lambda t: t.priority}])
+def test_equal_items_fifo(kwargs: dict):
+    q = ConcurrentHeap(**kwargs)
+    for tag in range(10):
+        q.put(Tagged(1, tag))
+    q.put(Tagged(0, 10))
+    tags = [q.get().tag for _ in range(11)]
+    equal_tags = [tag for tag in tags if tag != 10]
+    assert equal_tags == list(range(10)), "equal items should come out in the order they were put"
+
+
+def test_key_called_outside_lock():
+    lock_held = []
+
+    def key(x):
+        lock_held.append(q.mutex.locked())
+        return x[0]
+
+    q = ConcurrentHeap(key=key)
+    q.put((2, "b"))
+    q.put((1, "a"))
+    assert q.get() == (1, "a")
+    assert lock_held == [False, False], "the lock should not be held while computing keys"
+
+
+def test_nowait_and_timeouts():
+    q = ConcurrentHeap(maxsize=2, key=len)
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+    with pytest.raises(queue.Empty):
+        q.get_many(3, timeout=0.01)
+    q.put_nowait("ccc")
+    q.put("a")
+    assert q.full()
+    with pytest.raises(queue.Full):
+        q.put_nowait("bb")
+    with pytest.raises(queue.Full):
+        q.put("bb", timeout=0.01)
+    assert q.get_many(5, block=False) == ["a", "ccc"]
+    with pytest.raises(ValueError):
+        q.get_many(0)
+
+
+def test_get_many():
+    q = ConcurrentHeap(key=lambda x: x[0])
+    vals = [(p, i) for i, p in enumerate([3, 1, 2, 1, 3, 2])]
+    for val in vals:
+        q.put(val)
+    assert q.get_many(1) == [(1, 1)]
+    assert q.get_many(3) == [(1, 3), (2, 2), (2, 5)]
+    assert q.get_many(10) == [(3, 0), (3, 4)]
+    assert q.empty()
+
+
+def test_threads():
+    n_producers, n_consumers, per_producer = 4, 3, 500
+    q: ConcurrentHeap[int] = ConcurrentHeap(maxsize=50)
+    done = threading.Event()
+    consumed = []
+    consumed_lock = threading.Lock()
+
+    def produce(seed: int):
+        rng = random.Random(seed)
+        for _ in range(per_producer):
+            q.put(rng.randrange(1000))
+
+    def consume():
+        while not done.is_set():
+            try:
+                items = q.get_many(7, timeout=0.01)
+            except queue.Empty:
+                continue
+            with consumed_lock:
+                consumed.extend(items)
+            for _ in items:
+                q.task_done()
+
+    consumers = [threading.Thread(target=consume) for _ in range(n_consumers)]
+    producers = [threading.Thread(target=produce, args=(i,)) for i in range(n_producers)]
+    for thread in consumers + producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    q.join()
+    done.set()
+    for thread in consumers:
+        thread.join()
+    expected = []
+    for seed in range(n_producers):
+        rng = random.Random(seed)
+        expected.extend(rng.randrange(1000) for _ in range(per_producer))
+    assert sorted(consumed) == sorted(expected)
+    assert q.empty()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_async_put_get_order(kwargs: dict):
+    vals = [5, -4, 7, 8, -4, 6, 2, -7, 1]
+    expected = sorted(vals, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+
+    async def run():
+        q = AsyncHeap(**kwargs)
+        for val in vals:
+            await q.put(val)
+        assert q.qsize() == len(vals)
+        got = [await q.get()]
+        got.extend(await q.get_many(3))
+        while not q.empty():
+            got.append(q.get_nowait())
+        return got
+
+    assert asyncio.run(run()) == expected
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": lambda t: t.priority}])
+def test_async_equal_items_fifo(kwargs: dict):
+    async def run():
+        q = AsyncHeap(**kwargs)
+        for tag in range(10):
+            await q.put(Tagged(1, tag))
+        return [item.tag for item in await q.get_many(10)]
+
+    assert asyncio.run(run()) == list(range(10)), "equal items should come out in the order they were put"
+
+
+def test_async_producer_consumer():
+    async def run():
+        q: AsyncHeap[int] = AsyncHeap(maxsize=5, reverse=True)
+        consumed = []
+
+        async def produce():
+            for i in range(100):
+                await q.put(i)
+
+        async def consume():
+            while True:
+                items = await q.get_many(4)
+                consumed.extend(items)
+                for _ in items:
+                    q.task_done()
+
+        consumer = asyncio.ensure_future(consume())
+        await produce()
+        await q.join()
+        consumer.cancel()
+        with pytest.raises(ValueError):
+            await q.get_many(0)
+        return consumed
+
+    consumed = asyncio.run(run())
+    assert sorted(consumed) == list(range(100))
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from ech_datastructures import DisjointSet
+
+
+def assert_valid(ds: DisjointSet):
+    assert len(ds._items) == len(ds._ids) == len(ds._parent) == len(ds._rank) == len(ds)
+    for ident, item in enumerate(ds._items):
+        assert ds._ids[item] == ident
+        parent = ds._parent[ident]
+        if parent != ident:
+            assert ds._rank[parent] > ds._rank[ident], "ranks should increase toward the root"
+    roots = [i for i in range(len(ds)) if ds._parent[i] == i]
+    assert len(roots) == ds.n_components
+
+
+def test_empty():
+    ds = DisjointSet()
+    assert len(ds) == 0 and ds.n_components == 0
+    assert list(ds) == [] and ds.components() == []
+    assert "a" not in ds
+    with pytest.raises(KeyError):
+        ds.find("a")
+    with pytest.raises(KeyError):
+        ds.connected("a", "b")
+
+
+def test_union_find():
+    ds = DisjointSet("abcdef")
+    assert ds.n_components == 6 and "c" in ds
+    assert ds.union("a", "b") and ds.union("c", "d") and ds.union("b", "d")
+    assert not ds.union("a", "c"), "already connected"
+    assert ds.connected("a", "d") and not ds.connected("a", "e")
+    assert ds.find("a") == ds.find("d") != ds.find("e")
+    assert ds.union("e", "g"), "new items should be added"
+    assert ds.components() == [["a", "b", "c", "d"], ["e", "g"], ["f"]]
+    assert ds.n_components == 3 and len(ds) == 7
+    ds.add("a")
+    assert len(ds) == 7
+    assert_valid(ds)
+    ds.clear()
+    assert len(ds) == 0 and ds.n_components == 0
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_random_unions(bulk: bool):
+    rng = random.Random(24)
+    n = 500
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(400)]
+    ds = DisjointSet(range(n))
+    if bulk:
+        n_joined = ds.union_many(pairs)
+    else:
+        n_joined = sum(ds.union(a, b) for a, b in pairs)
+    assert_valid(ds)
+    # reference: label components with a simple flood fill
+    neighbors = {i: set() for i in range(n)}
+    for a, b in pairs:
+        neighbors[a].add(b)
+        neighbors[b].add(a)
+    label = {}
+    for start in range(n):
+        if start not in label:
+            stack = [start]
+            label[start] = start
+            while stack:
+                for other in neighbors[stack.pop()]:
+                    if other not in label:
+                        label[other] = start
+                        stack.append(other)
+    expected = {}
+    for i in range(n):
+        expected.setdefault(label[i], []).append(i)
+    assert ds.components() == list(expected.values())
+    assert ds.n_components == len(expected) == n - n_joined
+    for a, b in pairs[:50]:
+        assert ds.connected(a, b)
+
+
+def test_union_many_adds_items():
+    ds = DisjointSet()
+    assert ds.union_many([("x", "y"), ("y", "z"), ("x", "z"), ("p", "p")]) == 2
+    assert ds.n_components == 2 and list(ds) == ["x", "y", "z", "p"]
+    assert_valid(ds)
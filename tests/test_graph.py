@@ -0,0 +1,190 @@
+import random
+from collections import deque
+
+import pytest
+
+from ech_datastructures import DisjointSet, Graph
+from ech_datastructures.graph import FrozenGraph, _GraphBase
+
+
+def reference_distances(edges, directed: bool, source):
+    """Bellman-Ford, as a slow but simple reference."""
+    dist = {source: 0}
+    for _ in range(len(edges) + 1):
+        changed = False
+        for a, b, w in edges:
+            for u, v in ((a, b),) if directed else ((a, b), (b, a)):
+                if u in dist and (v not in dist or dist[u] + w < dist[v]):
+                    dist[v] = dist[u] + w
+                    changed = True
+        if not changed:
+            break
+    return dist
+
+
+def random_graph(seed: int, directed: bool, n: int = 60, m: int = 150) -> Graph:
+    rng = random.Random(seed)
+    graph = Graph(directed=directed)
+    for node in range(n):
+        graph.add_node(node)
+    for _ in range(m):
+        graph.add_edge(rng.randrange(n), rng.randrange(n), rng.randrange(1, 20))
+    return graph
+
+
+def edge_list(graph: Graph):
+    return [(a, b, w) for a in graph for b, w in graph.neighbors(a)]
+
+
+def test_empty_graph():
+    graph = Graph()
+    assert len(graph) == 0 and graph.n_edges == 0 and list(graph) == []
+    assert "a" not in graph and not graph.has_edge("a", "b")
+    with pytest.raises(KeyError):
+        graph.neighbors("a")
+    with pytest.raises(KeyError):
+        graph.dijkstra("a")
+    with pytest.raises(KeyError):
+        graph.remove_edge("a", "b")
+    assert graph.minimum_spanning_tree() == []
+    frozen = graph.freeze()
+    assert len(frozen) == 0 and frozen.n_edges == 0 and "a" not in frozen
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_edges(directed: bool):
+    graph = Graph([("a", "b"), ("b", "c", 2.5), ("c", "c")], directed=directed)
+    assert list(graph) == ["a", "b", "c"] and graph.n_edges == 3
+    assert graph.weight("a", "b") == 1 and graph.weight("b", "c") == 2.5
+    assert graph.has_edge("c", "a") is False
+    assert graph.has_edge("b", "a") is not directed
+    graph.add_edge("a", "b", 4)
+    assert graph.n_edges == 3 and graph.weight("a", "b") == 4, "re-adding should replace"
+    frozen = graph.freeze()
+    assert isinstance(frozen, FrozenGraph) and frozen.directed is directed
+    assert list(frozen) == list(graph) and frozen.n_edges == 3
+    assert frozen.weight("a", "b") == 4 and frozen.has_edge("c", "c")
+    assert frozen.has_edge("b", "a") is not directed and not frozen.has_edge("a", "z")
+    with pytest.raises(KeyError):
+        frozen.weight("a", "c")
+    graph.remove_edge("c", "c")
+    graph.remove_node("b")
+    assert list(graph) == ["a", "c"] and graph.n_edges == 0
+    assert graph.neighbors("a") == [] and graph.neighbors("c") == []
+    assert frozen.n_edges == 3, "frozen copy should not see later changes"
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("frozen", [False, True])
+def test_dijkstra(directed: bool, frozen: bool):
+    graph = random_graph(25, directed)
+    edges = edge_list(graph)
+    if frozen:
+        graph = graph.freeze()
+    for source in (0, 7, 31):
+        expected = reference_distances(edges, True, source)
+        assert graph.dijkstra(source) == expected
+        for target in (1, 2, 59):
+            if target in expected:
+                length, path = graph.shortest_path(source, target)
+                assert length == expected[target]
+                assert path[0] == source and path[-1] == target
+                assert sum(graph.weight(a, b) for a, b in zip(path, path[1:])) == length
+            else:
+                with pytest.raises(ValueError):
+                    graph.shortest_path(source, target)
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_a_star_grid(frozen: bool):
+    size = 20
+    rng = random.Random(8)
+    walls = {(rng.randrange(size), rng.randrange(size)) for _ in range(80)} - {(0, 0), (19, 19)}
+    graph = Graph()
+    for x in range(size):
+        for y in range(size):
+            if (x, y) in walls:
+                continue
+            graph.add_node((x, y))
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < size and ny < size and (nx, ny) not in walls:
+                    graph.add_edge((x, y), (nx, ny))
+    if frozen:
+        graph = graph.freeze()
+    expected = graph.dijkstra((0, 0))
+    goal = (size - 1, size - 1)
+
+    def manhattan(node):
+        return abs(goal[0] - node[0]) + abs(goal[1] - node[1])
+
+    length, path = graph.shortest_path((0, 0), goal, heuristic=manhattan)
+    assert length == expected[goal] == len(path) - 1
+    assert graph.bfs((0, 0)) == {node: int(d) for node, d in expected.items()}
+
+
+def test_negative_weights():
+    graph = Graph([("a", "b", -1)], directed=True)
+    with pytest.raises(ValueError):
+        graph.dijkstra("a")
+    assert graph.dijkstra("b") == {"b": 0}
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("frozen", [False, True])
+def test_bfs(directed: bool, frozen: bool):
+    graph = random_graph(3, directed, m=80)
+    # reference: hop counts with a hand-rolled queue
+    expected = {0: 0}
+    queue = deque([0])
+    while queue:
+        node = queue.popleft()
+        for other, _ in graph.neighbors(node):
+            if other not in expected:
+                expected[other] = expected[node] + 1
+                queue.append(other)
+    if frozen:
+        graph = graph.freeze()
+    assert graph.bfs(0) == expected
+    if not frozen:
+        # a FrozenGraph sorts each node's neighbors, so may reach nodes in a different order
+        assert list(graph.bfs(0)) == list(expected), "nodes should be in the order reached"
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_minimum_spanning_tree(frozen: bool):
+    graph = random_graph(7, False, n=40, m=70)
+    edges = edge_list(graph)
+    # reference: Kruskal's algorithm
+    ds = DisjointSet(graph)
+    expected_weight = 0
+    for a, b, w in sorted(edges, key=lambda edge: edge[2]):
+        if ds.union(a, b):
+            expected_weight += w
+    if frozen:
+        graph = graph.freeze()
+    tree = graph.minimum_spanning_tree()
+    assert len(tree) == len(graph) - ds.n_components
+    assert sum(w for _, _, w in tree) == expected_weight
+    forest = DisjointSet(graph)
+    for a, b, w in tree:
+        assert graph.weight(a, b) == w
+        assert forest.union(a, b), "tree edges should not form a cycle"
+    with pytest.raises(ValueError):
+        Graph(directed=True).minimum_spanning_tree()
+
+
+def test_none_node():
+    graph = Graph([(None, 1, 2), (1, 2, 3)])
+    assert graph.dijkstra(1) == {1: 0, None: 2, 2: 3}
+    assert graph.shortest_path(2, None) == (5, [2, 1, None])
+
+
+def test_base_is_abstract():
+    class Partial(_GraphBase):
+        __slots__ = ()
+
+        def _handle(self, node):
+            return node
+
+    with pytest.raises(TypeError):
+        Partial(False)  # pylint: disable=abstract-class-instantiated
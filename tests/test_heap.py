@@ -1,10 +1,14 @@
 import copy
+import random
 from collections import Counter
+from decimal import Decimal
+from fractions import Fraction
+from operator import itemgetter
 from typing import Sequence
 
 import pytest
 
-from ech_datastructures import Heap
+from ech_datastructures import Heap, nlargest, nsmallest
 
 
 def assert_empty(h: Heap):
@@ -165,3 +169,357 @@ def test_pop_add():
     assert h.pop_add(5) == 2
     assert len(h) == 10
     assert h.peek() == 3
+
+
+def test_key_called_once_per_item():
+    calls = []
+
+    def key(x):
+        calls.append(x)
+        return -x
+
+    vals = list(range(50))
+    h = Heap(vals, key=key)
+    h.update(range(50, 100))
+    h.add(100)
+    assert h.add_pop(-1) == 100
+    assert h.pop_add(101) == 99
+    pop_order = []
+    while not h.is_empty():
+        pop_order.append(h.pop())
+    assert pop_order == [101] + list(range(98, -2, -1))
+    assert sorted(calls) == list(range(-1, 102)), "the key should be computed exactly once per item"
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_non_comparable_payloads(reverse: bool):
+    vals = [{"priority": p, "name": str(i)} for i, p in enumerate([3, 1, 2, 1, 3, 2, 1])]
+    h = Heap(vals, key=lambda x: x["priority"], reverse=reverse)
+    h.add({"priority": 2, "name": "late"})
+    pop_order = []
+    while not h.is_empty():
+        pop_order.append(h.pop())
+    priorities = [x["priority"] for x in pop_order]
+    assert priorities == sorted(priorities, reverse=reverse)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_ties_pop_in_insertion_order(reverse: bool):
+    vals = [(p, i) for i, p in enumerate([2, 1, 2, 1, 1, 2, 3, 1])]
+    h = Heap(key=lambda x: x[0], reverse=reverse)
+    h.update(vals)
+    pop_order = [h.pop() for _ in range(len(vals))]
+    assert pop_order == sorted(vals, key=lambda x: x[0], reverse=reverse), "ties should pop in insertion order"
+
+
+def test_reverse_mixed_numbers():
+    vals = [3, 1.5, 7, Fraction(5, 2), -1, 2.5, True, Decimal("4.25")]
+    h = Heap(vals[:3], reverse=True)
+    h.update(vals[3:])
+    assert Counter(h.data) == Counter(vals)
+    pop_order = []
+    while not h.is_empty():
+        pop_order.append(h.pop())
+    assert pop_order == sorted(vals, reverse=True)
+    assert Counter(map(type, pop_order)) == Counter(map(type, vals)), "items should come back out unchanged"
+
+
+def test_reverse_strings():
+    words = ["potato", "zoological", "alphabet", "MEGALODON", "uNStAbLE", "alphabet"]
+    h = Heap(words, reverse=True)
+    assert h.add_pop("zzz") == "zzz"
+    assert h.pop_add("a") == "zoological"
+    assert [h.pop() for _ in range(len(h))] == sorted(words[:1] + words[2:] + ["a"], reverse=True)
+    assert_empty(h)
+
+
+def test_reverse_key_mixed_numbers():
+    vals = [("a", 3), ("b", 1), ("c", Fraction(7, 2)), ("d", 2.0), ("e", 3), ("f", Decimal("0.5"))]
+    h = Heap(vals[:2], key=lambda x: x[1], reverse=True)
+    for val in vals[2:]:
+        h.add(val)
+    pop_order = []
+    while not h.is_empty():
+        pop_order.append(h.pop())
+    assert pop_order == sorted(vals, key=lambda x: x[1], reverse=True), "values did not pop in the correct order"
+
+
+@pytest.mark.parametrize("n_old, n_new", [(0, 10), (100, 1), (100, 100), (1000, 5), (10, 1000)])
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_update_sizes(n_old: int, n_new: int, kwargs: dict):
+    rng = random.Random(n_old * 7 + n_new)
+    old = [rng.randrange(-500, 500) for _ in range(n_old)]
+    new = [rng.randrange(-500, 500) for _ in range(n_new)]
+    h = Heap(old, **kwargs)
+    h.update(x for x in new)  # not sized
+    h.update(new)
+    pop_order = [h.pop() for _ in range(len(h))]
+    expected = sorted(old + new + new, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    assert pop_order == expected
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_update_key_raises(reverse: bool):
+    def key(x):
+        if x is None:
+            raise ValueError("no key")
+        return x
+
+    rng = random.Random(13)
+    old = [rng.randrange(100) for _ in range(20)]
+    h = Heap(old, key=key, reverse=reverse)
+    with pytest.raises(ValueError):
+        h.update([rng.randrange(100) for _ in range(40)] + [None])
+    assert len(h) == len(old), "a failed update should not add anything"
+    assert [h.pop() for _ in range(len(h))] == sorted(old, reverse=reverse)
+
+
+def test_update_generalizes_mid_batch():
+    # the Fraction key isn't negatable, so the stored entries change representation partway
+    # through the batch; ties should still pop in insertion order
+    vals = [("a", 1), ("b", 2)]
+    new = [(str(i), i % 3) for i in range(30)] + [("f", Fraction(1))] + [("z", 1)] * 10
+    h = Heap(vals, key=itemgetter(1), reverse=True)
+    h.update(new)
+    assert [h.pop() for _ in range(len(h))] == sorted(vals + new, key=itemgetter(1), reverse=True)
+
+
+@pytest.mark.parametrize("sizes", [(10, 10), (1000, 3), (3, 1000)])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_merge(sizes: tuple, reverse: bool):
+    key = itemgetter(0)
+    vals1 = [(i % 7, "one", i) for i in range(sizes[0])]
+    vals2 = [(i % 5, "two", i) for i in range(sizes[1])]
+    h1 = Heap(vals1, key=key, reverse=reverse)
+    h2 = Heap(vals2, key=key, reverse=reverse)
+    h3 = h1 | h2
+    assert len(h1) == len(vals1) and len(h2) == len(vals2), "| should not change its operands"
+    h1.merge(h2)
+    assert len(h2) == len(vals2), "merge should not change the other heap"
+    h2 |= h1
+    # ties keep their order within each heap, and the merged heap's come after
+    expected = sorted(vals1 + vals2, key=key, reverse=reverse)
+    assert [h3.pop() for _ in range(len(h3))] == expected
+    assert [h1.pop() for _ in range(len(h1))] == expected
+    assert [h2.pop() for _ in range(len(h2))] == sorted(vals2 + vals1 + vals2, key=key, reverse=reverse)
+
+
+def test_merge_generalized():
+    # one reversed heap still stores negated numbers while the other has switched to the general form
+    h1 = Heap([3, 1, 4, 1, 5], reverse=True)
+    h2 = Heap([Fraction(9, 2), 2, 6], reverse=True)
+    h3 = h1 | h2
+    h2.merge(h1)
+    h2.add(-1)
+    expected = sorted([3, 1, 4, 1, 5, Fraction(9, 2), 2, 6], reverse=True)
+    assert [h3.pop() for _ in range(len(h3))] == expected
+    assert [h2.pop() for _ in range(len(h2))] == expected + [-1]
+    h1.merge(h1)
+    assert [h1.pop() for _ in range(len(h1))] == [5, 5, 4, 4, 3, 3, 1, 1, 1, 1]
+
+
+def test_merge_mismatch():
+    with pytest.raises(ValueError):
+        Heap([1, 2]).merge(Heap([3], reverse=True))
+    with pytest.raises(ValueError):
+        Heap([1, 2], key=abs).merge(Heap([3]))
+    with pytest.raises(TypeError):
+        _ = Heap([1, 2]) | [3]
+
+
+def test_copy():
+    h = Heap([(1, "a"), (2, "b")], key=itemgetter(0))
+    h2 = h.copy()
+    h2.add((1, "c"))
+    h.add((0, "d"))
+    assert [h.pop() for _ in range(len(h))] == [(0, "d"), (1, "a"), (2, "b")]
+    assert [h2.pop() for _ in range(len(h2))] == [(1, "a"), (1, "c"), (2, "b")]
+
+
+@pytest.mark.parametrize("arity", [2, 3])
+def test_deepcopy(arity: int):
+    h = Heap([[3], [1], [2]], key=itemgetter(0), arity=arity)
+    h2 = copy.deepcopy(h)
+    assert h2.arity == arity
+    h2.add([0])
+    h2.peek().append("x")
+    assert [h.pop() for _ in range(len(h))] == [[1], [2], [3]]
+    assert [h2.pop() for _ in range(len(h2))] == [[0, "x"], [1], [2], [3]]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_maxsize(reverse: bool):
+    rng = random.Random(14)
+    vals = [rng.randrange(100) for _ in range(500)]
+    h = Heap(vals[:200], reverse=reverse, maxsize=10)
+    assert h.maxsize == 10
+    assert len(h) == 10
+    h.update(vals[200:400])
+    for val in vals[400:]:
+        h.add(val)
+        assert len(h) == 10
+    # a min-heap keeps the largest items, and pops them smallest first
+    expected = sorted(vals, reverse=not reverse)[:10][::-1]
+    assert [h.pop() for _ in range(len(h))] == expected
+    assert_empty(h)
+
+
+def test_maxsize_keeps_earliest_ties():
+    key = itemgetter(0)
+    vals = [(p, i) for i, p in enumerate([5, 3, 5, 1, 5, 4, 5, 2])]
+    h = Heap(vals, key=key, maxsize=3)
+    assert [h.pop() for _ in range(len(h))] == [(5, 4), (5, 2), (5, 0)]
+    h = Heap(key=key, reverse=True, maxsize=3)
+    h.update(vals)
+    assert h.pop() == (3, 1)
+    h2 = Heap([(0, "x"), (9, "y")], key=key, reverse=True, maxsize=1)
+    h2.merge(h)
+    assert list(h2.data) == [(0, "x")]
+    h3 = h | Heap([(1, "z"), (2, "w")], key=key, reverse=True)
+    assert h3.maxsize == 3
+    assert [h3.pop() for _ in range(len(h3))] == [(2, 7), (1, "z"), (1, 3)]
+
+
+def test_maxsize_invalid():
+    with pytest.raises(ValueError):
+        Heap(maxsize=0)
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 50, 100])
+@pytest.mark.parametrize("key", [None, lambda x: x % 10])
+def test_nlargest_nsmallest(n: int, key):
+    rng = random.Random(n)
+    vals = [rng.randrange(1000) for _ in range(60)]
+    assert nlargest(n, vals, key=key) == sorted(vals, key=key, reverse=True)[:n]
+    assert nsmallest(n, iter(vals), key=key) == sorted(vals, key=key)[:n]
+
+
+@pytest.mark.parametrize("m", [0, 1, 10, 60, 99, 100, 150])
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_pop_many(m: int, kwargs: dict):
+    rng = random.Random(m)
+    vals = [rng.randrange(-50, 50) for _ in range(100)]
+    h = Heap(vals, **kwargs)
+    expected = sorted(vals, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    assert h.pop_many(m) == expected[:m]
+    assert len(h) == max(0, 100 - m)
+    # the heap should still work normally afterward
+    h.add(expected[-1])
+    assert [h.pop() for _ in range(len(h))] == expected[m:] + [expected[-1]]
+
+
+def test_drain():
+    h = Heap([5, 1, 4, 2], reverse=True)
+    drained = []
+    for item in h.drain():
+        drained.append(item)
+        if item == 4:
+            h.add(3)
+    assert drained == [5, 4, 3, 2, 1]
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_peek_k_sorted_view(kwargs: dict):
+    rng = random.Random(15)
+    vals = [rng.randrange(-50, 50) for _ in range(200)]
+    h = Heap(vals, **kwargs)
+    before = list(h.data)
+    expected = sorted(vals, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    for k in (0, 1, 7, 200, 300):
+        assert h.peek_k(k) == expected[:k]
+    assert list(h.sorted_view()) == expected
+    assert list(h.data) == before, "peeking should not change the heap"
+    assert [h.pop() for _ in range(len(h))] == expected
+    assert list(h.sorted_view()) == []
+    assert h.peek_k(5) == []
+
+
+def test_sorted_view_modified():
+    h = Heap(range(10))
+    view = h.sorted_view()
+    assert next(view) == 0
+    h.add(-1)
+    with pytest.raises(RuntimeError):
+        next(view)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_data_view_contains_iter(kwargs: dict):
+    vals = [5, -4, 7, 8, -4, 6, 2, -7, 1]
+    h = Heap(vals, **kwargs)
+    view = h.data
+    assert len(view) == len(vals)
+    assert Counter(view) == Counter(vals)
+    assert Counter(h) == Counter(vals)
+    assert view[:] == list(view) == [view[i] for i in range(len(view))]
+    assert view[-1] == view[len(view) - 1]
+    assert view[0] == h.peek()
+    with pytest.raises(IndexError):
+        _ = view[len(vals)]
+    for val in vals:
+        assert val in h
+        assert val in view
+    for val in (0, 3, -5, 100, "x", None):
+        assert val not in h
+    h.add(3)
+    assert len(view) == len(vals) + 1, "the view should reflect changes to the heap"
+    assert 3 in view
+    assert Counter(view) == Counter(vals + [3])
+    with pytest.raises(TypeError):
+        view[0] = 1
+
+
+def test_contains_generalized():
+    h = Heap([1.5, 2], reverse=True)
+    assert 2 in h and True not in h and "2" not in h
+    # bool isn't stored negated, so this switches to the general representation
+    h.add(True)
+    assert True in h and 1.5 in h and "2" not in h
+
+
+def assert_heap_property(h: Heap):
+    data, arity = h._data, h.arity
+    for i in range(1, len(data)):
+        assert not data[i] < data[(i - 1) // arity], "child comes before its parent"
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4, 8])
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}])
+def test_arity(arity: int, kwargs: dict):
+    rng = random.Random(arity)
+    vals = [rng.randrange(-500, 500) for _ in range(300)]
+    h = Heap(vals[:100], arity=arity, **kwargs)
+    assert h.arity == arity
+    assert_heap_property(h)
+    h.update(vals[100:110])
+    h.update(vals[110:200])
+    for val in vals[200:]:
+        h.add(val)
+    assert_heap_property(h)
+    expected = sorted(vals, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    assert h.peek_k(20) == expected[:20]
+    assert h.pop_many(10) == expected[:10]
+    assert h.add_pop(expected[0]) == expected[0]
+    assert h.pop_add(expected[-1]) == expected[10]
+    assert_heap_property(h)
+    h2 = h.copy()
+    assert h2.arity == arity
+    h2.merge(Heap([expected[11]], **kwargs))
+    # merged items come after equal ones already in the heap
+    expected2 = sorted(expected[11:] + expected[-1:] + expected[11:12],
+                       key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    assert list(h2.sorted_view()) == expected2
+    assert [h.pop() for _ in range(len(h))] == expected[11:] + expected[-1:]
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("arity", [3, 4])
+def test_arity_maxsize(arity: int):
+    vals = list(range(100))
+    random.Random(arity).shuffle(vals)
+    h = Heap(vals, maxsize=10, arity=arity)
+    assert [h.pop() for _ in range(len(h))] == list(range(90, 100))
+    with pytest.raises(ValueError):
+        Heap(arity=1)
@@ -0,0 +1,124 @@
+import random
+from typing import Dict
+
+import pytest
+
+from ech_datastructures import IndexedHeap
+from ech_datastructures.indexed_heap import IndexedHeapHandle
+
+
+def assert_valid(h: IndexedHeap):
+    """
+    Check the heap property, and that every handle knows its own position.
+    """
+    for i, handle in enumerate(h._data):
+        assert handle._index == i, "handle has the wrong position"
+        assert handle in h
+        if i > 0:
+            assert not handle._rank < h._data[(i - 1) // 2]._rank, "child comes before its parent"
+
+
+def assert_empty(h: IndexedHeap):
+    assert len(h) == 0, "empty heap should have length 0"
+    assert h.is_empty(), "empty heap should be marked as empty"
+    with pytest.raises(IndexError):
+        h.peek()
+    with pytest.raises(IndexError):
+        h.peek_handle()
+    with pytest.raises(IndexError):
+        h.pop()
+
+
+def test_empty_heap():
+    h = IndexedHeap()
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_heapify_pop_all(reverse: bool):
+    vals = [5, 4, 7, 8, 4, 6, 2, 7, 1]
+    h = IndexedHeap(vals, reverse=reverse)
+    assert_valid(h)
+    pop_order = [h.pop() for _ in range(len(vals))]
+    assert pop_order == sorted(vals, reverse=reverse), "values did not pop in the correct order"
+    assert_empty(h)
+
+
+def test_handles():
+    h = IndexedHeap(key=lambda x: x[0])
+    handles = h.update([(3, "a"), (1, "b"), (2, "c")])
+    assert [handle.item for handle in handles] == [(3, "a"), (1, "b"), (2, "c")]
+    assert all(handle in h for handle in handles)
+    assert h.peek_handle() is handles[1]
+    assert h.pop() == (1, "b")
+    assert handles[1] not in h, "popped items should no longer be in the heap"
+    with pytest.raises(KeyError):
+        h.remove(handles[1])
+    with pytest.raises(KeyError):
+        h.change_priority(handles[1], (0, "b"))
+    assert handles[0] not in IndexedHeap([(3, "a")]), "handles belong to one heap only"
+    assert "a" not in h
+    assert h.remove(handles[2]) == (2, "c")
+    assert handles[2] not in h
+    h.clear()
+    assert handles[0] not in h
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_change_priority(reverse: bool):
+    h = IndexedHeap(key=lambda x: x["priority"], reverse=reverse)
+    tasks = [{"name": name, "priority": i} for i, name in enumerate("abcdefgh")]
+    handles = [h.add(task) for task in tasks]
+    # mutate in place, then tell the heap
+    tasks[3]["priority"] = -10 if not reverse else 100
+    h.change_priority(handles[3])
+    assert h.peek() is tasks[3]
+    # replace the item entirely
+    h.change_priority(handles[3], {"name": "d2", "priority": 4.5})
+    assert handles[3].item["name"] == "d2"
+    with pytest.raises(KeyError):
+        h.change_priority(handles[3], {"name": "d3"})  # key raises
+    assert handles[3].item["name"] == "d2", "a failed change should keep the old item"
+    assert_valid(h)
+    pop_order = [h.pop()["priority"] for _ in range(len(tasks))]
+    assert pop_order == sorted([0, 1, 2, 4, 4.5, 5, 6, 7], reverse=reverse)
+
+
+def test_ties_pop_in_insertion_order():
+    h = IndexedHeap(key=lambda x: x[0])
+    vals = [(p, i) for i, p in enumerate([2, 1, 2, 1, 1, 2, 3, 1])]
+    handles = h.update(vals)
+    h.change_priority(handles[0])
+    pop_order = [h.pop() for _ in range(len(vals))]
+    assert pop_order == sorted(vals, key=lambda x: x[0]), "ties should pop in insertion order"
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_random_ops(reverse: bool):
+    rng = random.Random(12)
+    h: IndexedHeap[int] = IndexedHeap(reverse=reverse)
+    expected: Dict[IndexedHeapHandle, int] = {}
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.4 or len(expected) == 0:
+            val = rng.randrange(500)
+            expected[h.add(val)] = val
+        elif op < 0.6:
+            handle = rng.choice(list(expected))
+            val = rng.randrange(500)
+            h.change_priority(handle, val)
+            expected[handle] = val
+        elif op < 0.8:
+            handle = rng.choice(list(expected))
+            assert h.remove(handle) == expected.pop(handle)
+            assert handle not in h
+        else:
+            best = h.peek_handle()
+            assert best.item == (max if reverse else min)(expected.values())
+            assert h.pop() == expected.pop(best)
+        assert len(h) == len(expected)
+    assert_valid(h)
+    pop_order = [h.pop() for _ in range(len(h))]
+    assert pop_order == sorted(expected.values(), reverse=reverse)
+    assert_empty(h)
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from ech_datastructures import MinMaxHeap
+from ech_datastructures.min_max_heap import _is_min_level
+
+
+def assert_empty(h: MinMaxHeap):
+    assert len(h) == 0, "empty heap should have length 0"
+    assert h.is_empty(), "empty heap should be marked as empty"
+    for method in (h.peek_min, h.peek_max, h.pop_min, h.pop_max):
+        with pytest.raises(IndexError):
+            method()
+
+
+def assert_valid(h: MinMaxHeap):
+    data = h._data
+    for i in range(1, len(data)):
+        ancestor = (i - 1) >> 1
+        while True:
+            if _is_min_level(ancestor):
+                assert not data[i] < data[ancestor], f"entry {i} is less than min-level ancestor {ancestor}"
+            else:
+                assert not data[ancestor] < data[i], f"entry {i} is greater than max-level ancestor {ancestor}"
+            if ancestor == 0:
+                break
+            ancestor = (ancestor - 1) >> 1
+
+
+def test_levels():
+    assert [_is_min_level(i) for i in range(16)] == [True] + [False] * 2 + [True] * 4 + [False] * 8 + [True]
+
+
+def test_empty_heap():
+    assert_empty(MinMaxHeap())
+    assert_empty(MinMaxHeap([]))
+
+
+def test_both_ends():
+    vals = [5, 4, 7, 8, 4, 6, 2, 7, 1]
+    h = MinMaxHeap(vals)
+    assert_valid(h)
+    assert len(h) == len(vals)
+    assert sorted(h) == sorted(vals)
+    assert 8 in h and 3 not in h
+    assert h.peek_min() == 1
+    assert h.peek_max() == 8
+    assert [h.pop_max() for _ in range(3)] == [8, 7, 7]
+    assert [h.pop_min() for _ in range(3)] == [1, 2, 4]
+    assert_valid(h)
+    assert h.pop_max() == 6
+    assert h.pop_min() == 4
+    assert h.pop_max() == 5
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 8, 100])
+def test_heapify(n: int):
+    rng = random.Random(n)
+    vals = [rng.randrange(n) for _ in range(n)]
+    h = MinMaxHeap(vals)
+    assert_valid(h)
+    assert [h.pop_min() for _ in range(n)] == sorted(vals)
+    h = MinMaxHeap(vals)
+    assert [h.pop_max() for _ in range(n)] == sorted(vals, reverse=True)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_random_ops(kwargs: dict):
+    rng = random.Random(19)
+    key = kwargs.get("key") or (lambda x: x)
+    reverse = kwargs.get("reverse", False)
+    h = MinMaxHeap(**kwargs)
+    expected = []
+    for _ in range(2000):
+        op = rng.random()
+        if op < 0.5 or len(expected) == 0:
+            val = rng.randrange(-50, 50)
+            h.add(val)
+            expected.append(val)
+        else:
+            expected.sort(key=key, reverse=reverse)
+            if op < 0.75:
+                assert key(h.pop_min()) == key(expected.pop(0))
+            else:
+                assert key(h.pop_max()) == key(expected.pop())
+        assert len(h) == len(expected)
+        if len(expected) > 0:
+            expected.sort(key=key, reverse=reverse)
+            assert key(h.peek_min()) == key(expected[0])
+            assert key(h.peek_max()) == key(expected[-1])
+    assert_valid(h)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_key_and_ties(reverse: bool):
+    calls = []
+
+    def key(x):
+        calls.append(x)
+        return x[0]
+
+    vals = [(1, "a"), (2, "b"), (1, "c"), (2, "d"), (1, "e"), (2, "f")]
+    h = MinMaxHeap(vals[:3], key=key, reverse=reverse)
+    h.update(vals[3:])
+    assert len(calls) == len(vals), "the key should be called once per item"
+    first, last = (["b", "d", "f"], ["e", "c", "a"]) if reverse else (["a", "c", "e"], ["f", "d", "b"])
+    assert [h.pop_min()[1] for _ in range(3)] == first, "ties at the min end should be first-in-first-out"
+    assert [h.pop_max()[1] for _ in range(3)] == last, "ties at the max end should be newest first"
+    assert len(calls) == len(vals)
+    assert_empty(h)
+
+
+def test_bounded_eviction():
+    # keep the 5 best of a stream, evicting the worst when full
+    rng = random.Random(5)
+    vals = [rng.random() for _ in range(200)]
+    h = MinMaxHeap()
+    for val in vals:
+        h.add(val)
+        if len(h) > 5:
+            h.pop_max()
+    assert [h.pop_min() for _ in range(5)] == sorted(vals)[:5]
+
+
+def test_clear():
+    h = MinMaxHeap([3, 1, 2], reverse=True)
+    assert list(sorted(h)) == [1, 2, 3]
+    h.clear()
+    assert_empty(h)
+    h.add(4)
+    assert h.peek_min() == h.peek_max() == 4
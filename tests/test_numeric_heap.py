@@ -0,0 +1,114 @@
+import random
+from array import array
+
+import pytest
+
+from ech_datastructures import NumericHeap
+
+
+def assert_empty(h: NumericHeap):
+    assert len(h) == 0, "empty heap should have length 0"
+    assert h.is_empty(), "empty heap should be marked as empty"
+    with pytest.raises(IndexError):
+        h.peek()
+    with pytest.raises(IndexError):
+        h.pop()
+
+
+def assert_valid(h: NumericHeap):
+    keys = h._keys
+    for i in range(1, len(h)):
+        assert not keys[i] < keys[(i - 1) // 2], f"entry {i} is less than its parent"
+
+
+def test_empty_heap():
+    assert_empty(NumericHeap())
+    assert_empty(NumericHeap([]))
+    with pytest.raises(ValueError):
+        NumericHeap(ids=[1, 2])
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_add_pop_all(reverse: bool):
+    priorities = [5.0, 4.5, 7.0, 8.0, 4.5, 6.0, 2.0, -7.0, 1.0]
+    h = NumericHeap(reverse=reverse)
+    for ident, priority in enumerate(priorities):
+        h.add(priority, ident)
+    assert_valid(h)
+    assert len(h) == len(priorities)
+    assert sorted(h) == sorted(zip(priorities, range(len(priorities))))
+    expected = sorted(priorities, reverse=reverse)
+    assert h.peek()[0] == expected[0]
+    popped = [h.pop() for _ in range(len(priorities))]
+    assert [priority for priority, _ in popped] == expected
+    assert all(priorities[ident] == priority for priority, ident in popped)
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("typecode", ["d", "q"])
+def test_bulk_heapify(typecode: str):
+    rng = random.Random(20)
+    priorities = array(typecode, (rng.randrange(-1000, 1000) for _ in range(500)))
+    h = NumericHeap(priorities, typecode=typecode)
+    assert_valid(h)
+    assert h.capacity == len(priorities)
+    popped_keys, popped_ids = h.pop_many(len(priorities) + 10)
+    assert isinstance(popped_keys, array) and popped_keys.typecode == typecode
+    assert isinstance(popped_ids, array) and popped_ids.typecode == "q"
+    assert list(popped_keys) == sorted(priorities)
+    assert all(priorities[ident] == priority for priority, ident in zip(popped_keys, popped_ids))
+    assert_empty(h)
+    with pytest.raises(ValueError):
+        NumericHeap([1, 2, 3], [1, 2])
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_update_and_pop_many(reverse: bool):
+    rng = random.Random(int(reverse))
+    h = NumericHeap(reverse=reverse)
+    expected = []
+    for batch_size in (3, 50, 5, 400, 1):
+        priorities = [rng.random() for _ in range(batch_size)]
+        ids = [rng.randrange(1 << 40) for _ in range(batch_size)]
+        h.update(priorities, ids)
+        expected.extend(zip(priorities, ids))
+        assert_valid(h)
+        expected.sort(reverse=reverse)
+        popped_keys, popped_ids = h.pop_many(batch_size // 2)
+        assert list(zip(popped_keys, popped_ids)) == expected[:batch_size // 2]
+        del expected[:batch_size // 2]
+    assert sorted(h, reverse=reverse) == expected
+    assert h.pop_many(0) == (array("d"), array("q"))
+    with pytest.raises(ValueError):
+        h.update([1.0, 2.0], [1])
+
+
+def test_growth():
+    h = NumericHeap()
+    assert h.capacity == 0
+    capacities = set()
+    for i in range(1000):
+        h.add(-i, i)
+        capacities.add(h.capacity)
+    assert sorted(capacities) == [16, 32, 64, 128, 256, 512, 1024], "capacity should double"
+    assert h.pop() == (-999, 999)
+    h.clear()
+    assert_empty(h)
+    assert h.capacity == 0
+    h.add(3, 4)
+    assert h.peek() == (3, 4)
+
+
+@pytest.mark.parametrize("priority, ident, kwargs", [
+    (0.5, 99, {"typecode": "q"}),
+    (-2 ** 63, 99, {"typecode": "q", "reverse": True}),
+    (0, 2 ** 63, {"typecode": "q"}),
+    ("x", 99, {}),
+])
+def test_failed_add_leaves_heap_unchanged(priority, ident, kwargs):
+    h = NumericHeap([5, 3, 8, 1], **kwargs)
+    before = list(h)
+    with pytest.raises((TypeError, OverflowError)):
+        h.add(priority, ident)
+    assert len(h) == 4 and list(h) == before
+    assert_valid(h)
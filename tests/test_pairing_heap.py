@@ -0,0 +1,136 @@
+import random
+from typing import Dict
+
+import pytest
+
+from ech_datastructures import PairingHeap
+from ech_datastructures.pairing_heap import PairingHeapHandle
+
+
+def assert_valid(h: PairingHeap):
+    """
+    Check the heap order, the back-pointers, and the count.
+    """
+    n_nodes = 0
+    if h._root is not None:
+        assert h._root._prev is None and h._root._sibling is None
+    stack = [] if h._root is None else [h._root]
+    while len(stack) > 0:
+        node = stack.pop()
+        n_nodes += 1
+        child = node._child
+        prev = node
+        while child is not None:
+            assert child._prev is prev, "broken back-pointer"
+            assert not child._rank < node._rank, "child comes before its parent"
+            stack.append(child)
+            prev = child
+            child = child._sibling
+    assert n_nodes == len(h)
+
+
+def assert_empty(h: PairingHeap):
+    assert len(h) == 0, "empty heap should have length 0"
+    assert h.is_empty(), "empty heap should be marked as empty"
+    with pytest.raises(IndexError):
+        h.peek()
+    with pytest.raises(IndexError):
+        h.pop()
+
+
+def test_empty_heap():
+    assert_empty(PairingHeap())
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"reverse": True}, {"key": abs}, {"key": abs, "reverse": True}])
+def test_add_pop_all(kwargs: dict):
+    vals = [5, -4, 7, 8, -4, 6, 2, -7, 1, 0, 3]
+    h = PairingHeap(vals, **kwargs)
+    assert_valid(h)
+    assert sorted(h) == sorted(vals)
+    assert all(val in h for val in vals)
+    assert 100 not in h
+    expected = sorted(vals, key=kwargs.get("key"), reverse=kwargs.get("reverse", False))
+    assert h.peek() == expected[0]
+    assert [h.pop() for _ in range(len(vals))] == expected
+    assert_empty(h)
+
+
+def test_merge():
+    key = abs
+    h1 = PairingHeap([3, -1, 4], key=key)
+    h2 = PairingHeap([1, -5, 9, 2], key=key)
+    handles = h2.update([-3, 6])
+    h1.merge(h2)
+    assert_empty(h2)
+    assert len(h1) == 9
+    assert_valid(h1)
+    h1.change_priority(handles[1], 0)
+    h1.merge(h1)
+    assert len(h1) == 9
+    # ties pop in insertion order, even across heaps
+    assert [h1.pop() for _ in range(len(h1))] == [0, -1, 1, 2, 3, -3, 4, -5, 9]
+    with pytest.raises(ValueError):
+        h1.merge(PairingHeap(key=key, reverse=True))
+    with pytest.raises(ValueError):
+        h1.merge(PairingHeap())
+
+
+def test_handles():
+    h = PairingHeap(key=lambda x: x["priority"])
+    tasks = [{"name": name, "priority": i} for i, name in enumerate("abcdefgh")]
+    handles = h.update(tasks)
+    assert [handle.item for handle in handles] == tasks
+    tasks[5]["priority"] = -1
+    h.change_priority(handles[5])
+    assert h.peek() is tasks[5]
+    h.change_priority(handles[5], {"name": "f2", "priority": 100})
+    with pytest.raises(KeyError):
+        h.change_priority(handles[5], {"name": "f3"})  # key raises
+    assert handles[5].item["name"] == "f2", "a failed change should keep the old item"
+    assert h.remove(handles[3]) is tasks[3]
+    assert h.remove(handles[0]) is tasks[0]
+    assert_valid(h)
+    with pytest.raises(KeyError):
+        h.remove(handles[3])
+    with pytest.raises(KeyError):
+        h.change_priority(handles[0], tasks[0])
+    assert [h.pop()["name"] for _ in range(len(h))] == ["b", "c", "e", "g", "h", "f2"]
+    with pytest.raises(KeyError):
+        h.remove(handles[1])
+    h.update(tasks[:2])
+    h.clear()
+    assert_empty(h)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_random_ops(reverse: bool):
+    rng = random.Random(18)
+    h: PairingHeap[int] = PairingHeap(reverse=reverse)
+    expected: Dict[PairingHeapHandle, int] = {}
+    for i in range(3000):
+        op = rng.random()
+        if op < 0.4 or len(expected) == 0:
+            val = rng.randrange(500)
+            expected[h.add(val)] = val
+        elif op < 0.6:
+            handle = rng.choice(list(expected))
+            val = rng.randrange(500)
+            h.change_priority(handle, val)
+            expected[handle] = val
+        elif op < 0.7:
+            handle = rng.choice(list(expected))
+            assert h.remove(handle) == expected.pop(handle)
+        else:
+            best = (max if reverse else min)(expected.values())
+            assert h.peek() == best
+            popped = h.pop()
+            assert popped == best
+            handle = next(handle for handle, val in expected.items() if val == popped and handle._prev is None
+                          and handle is not h._root)
+            del expected[handle]
+        assert len(h) == len(expected)
+        if i % 100 == 0:
+            assert_valid(h)
+    assert [h.pop() for _ in range(len(h))] == sorted(expected.values(), reverse=reverse)
+    assert_empty(h)
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from ech_datastructures import RadixHeap
+
+
+def assert_empty(h: RadixHeap):
+    assert len(h) == 0, "empty heap should have length 0"
+    assert h.is_empty(), "empty heap should be marked as empty"
+    with pytest.raises(IndexError):
+        h.peek()
+    with pytest.raises(IndexError):
+        h.pop()
+
+
+def test_empty_heap():
+    assert_empty(RadixHeap())
+
+
+def test_add_pop_all():
+    vals = [5, 4, 7, 8, 4, 6, 2, 7, 1, 0, 1 << 70]
+    h = RadixHeap(vals)
+    assert sorted(h) == sorted(vals)
+    assert 8 in h and 3 not in h
+    assert h.peek() == 0
+    assert [h.pop() for _ in range(len(vals))] == sorted(vals)
+    assert_empty(h)
+
+
+def test_monotone():
+    h = RadixHeap(key=lambda x: x[0])
+    h.update([(10, "a"), (3, "b"), (7, "c")])
+    assert h.pop() == (3, "b")
+    assert h.last_key == 3
+    h.add((3, "d"))
+    with pytest.raises(ValueError):
+        h.add((2, "e"))
+    with pytest.raises(TypeError):
+        h.add((4.5, "f"))
+    assert h.peek() == (3, "d")
+    assert [h.pop() for _ in range(len(h))] == [(3, "d"), (7, "c"), (10, "a")]
+    with pytest.raises(ValueError):
+        h.add((9, "g"))
+    h.clear()
+    assert_empty(h)
+    h.add((0, "h"))
+    assert h.pop() == (0, "h")
+    with pytest.raises(ValueError):
+        RadixHeap([-1])
+
+
+def test_merge():
+    h1 = RadixHeap([5, 10, 20])
+    h2 = RadixHeap([1, 7, 30])
+    assert h1.pop() == 5
+    with pytest.raises(ValueError):
+        h1.merge(h2)
+    assert len(h1) == 2, "a failed merge should not add anything"
+    assert h2.pop() == 1
+    assert h2.pop() == 7
+    h1.merge(h2)
+    assert len(h2) == 1
+    assert [h1.pop() for _ in range(len(h1))] == [10, 20, 30]
+    with pytest.raises(ValueError):
+        h1.merge(RadixHeap(key=abs))
+
+
+def test_simulation():
+    # events that schedule later events, like a timer wheel
+    rng = random.Random(18)
+    h = RadixHeap(key=lambda x: x[0])
+    h.update((rng.randrange(100), i) for i in range(50))
+    popped = []
+    while not h.is_empty():
+        time, i = h.pop()
+        popped.append(time)
+        if len(popped) < 5000:
+            h.add((time + rng.randrange(1000), i))
+    assert popped == sorted(popped)
+    assert len(popped) == 5000 + 49
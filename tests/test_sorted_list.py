@@ -0,0 +1,149 @@
+import bisect
+import random
+
+import pytest
+
+from ech_datastructures import SortedList
+
+
+def assert_empty(sl: SortedList):
+    assert len(sl) == 0, "empty list should have length 0"
+    assert list(sl) == [] and list(reversed(sl)) == []
+    assert 3 not in sl
+    with pytest.raises(IndexError):
+        print(sl[0])
+    with pytest.raises(IndexError):
+        sl.pop()
+    with pytest.raises(ValueError):
+        sl.remove(3)
+    assert sl.bisect_left(3) == sl.bisect_right(3) == 0
+
+
+def assert_valid(sl: SortedList):
+    lists, keys = sl._lists, sl._keys
+    assert len(lists) == len(keys) == len(sl._maxes)
+    assert sum(map(len, lists)) == len(sl)
+    for sub_items, sub_keys, max_key in zip(lists, keys, sl._maxes):
+        assert 0 < len(sub_items) <= 2 * sl._load, "sublist length out of bounds"
+        assert len(sub_items) == len(sub_keys)
+        assert sub_keys[-1] == max_key, "cached max is stale"
+        if sl._key is not None:
+            assert sub_keys == [sl._key(item) for item in sub_items], "cached keys are stale"
+    all_keys = [k for sub_keys in keys for k in sub_keys]
+    assert all_keys == sorted(all_keys), "keys should be in sorted order"
+    if len(sl) > 0:
+        # every position round-trips through the Fenwick tree
+        for position in range(len(sl)):
+            assert sl._position(*sl._locate(position)) == position
+
+
+def test_empty_list():
+    assert_empty(SortedList())
+    assert_empty(SortedList([], key=abs))
+    with pytest.raises(ValueError):
+        SortedList(load=3)
+
+
+@pytest.mark.parametrize("key", [None, abs])
+def test_random_ops(key):
+    rng = random.Random(22)
+    sl = SortedList(key=key, load=8)
+    expected = []
+    sort_key = key or (lambda x: x)
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.55 or len(expected) == 0:
+            val = rng.randrange(-60, 60)
+            sl.add(val)
+            # stable, like the SortedList: after any items with equal keys
+            pos = bisect.bisect_right([sort_key(x) for x in expected], sort_key(val))
+            expected.insert(pos, val)
+        elif op < 0.75:
+            val = rng.choice(expected)
+            sl.remove(val)
+            expected.remove(val)
+        elif op < 0.9:
+            pos = rng.randrange(-len(expected), len(expected))
+            assert sl.pop(pos) == expected.pop(pos)
+        else:
+            val = rng.randrange(-60, 60)
+            assert (val in sl) == (val in expected)
+            assert sl.count(val) == expected.count(val)
+        assert len(sl) == len(expected)
+    assert_valid(sl)
+    assert list(sl) == expected
+    assert list(reversed(sl)) == expected[::-1]
+    for pos in range(len(expected)):
+        assert sl[pos] == expected[pos]
+
+
+def test_bisect_and_index():
+    vals = [5, 1, 3, 3, 9, 3, 7]
+    sl = SortedList(vals, load=4)
+    assert_valid(sl)
+    assert list(sl) == [1, 3, 3, 3, 5, 7, 9]
+    assert sl.bisect_left(3) == 1 and sl.bisect_right(3) == 4
+    assert sl.bisect_left(4) == sl.bisect_right(4) == 4
+    assert sl.bisect_right(10) == 7
+    assert sl.count(3) == 3 and sl.count(4) == 0
+    assert sl.index(3) == 1 and sl.index(3, 2) == 2 and sl.index(9) == 6
+    with pytest.raises(ValueError):
+        sl.index(3, 4)
+    with pytest.raises(ValueError):
+        sl.index(4)
+    assert sl[-1] == 9 and sl[1:5] == [3, 3, 3, 5] and sl[::3] == [1, 3, 9]
+    assert list(sl.islice(-2)) == [7, 9]
+
+
+def test_key():
+    words = ["pear", "fig", "apple", "kiwi", "date", "banana", "plum"]
+    calls = []
+
+    def key(word):
+        calls.append(word)
+        return len(word)
+
+    sl = SortedList(words, key=key, load=4)
+    assert len(calls) == len(words), "the key should be called once per item"
+    assert list(sl) == sorted(words, key=len), "equal keys should stay in insertion order"
+    sl.add("lime")
+    assert list(sl)[1:6] == ["pear", "kiwi", "date", "plum", "lime"]
+    assert sl.bisect_key_left(4) == 1 and sl.bisect_key_right(4) == 6
+    assert sl.bisect_left("xxxx") == 1
+    assert "date" in sl and "dates" not in sl and "zzzz" not in sl
+    assert sl.count("kiwi") == 1 and sl.count("zzzz") == 0
+    assert sl.index("plum") == 4
+    sl.remove("date")
+    sl.discard("nope")
+    assert list(sl)[1:5] == ["pear", "kiwi", "plum", "lime"]
+    assert_valid(sl)
+
+
+@pytest.mark.parametrize("n", [10, 1000])
+def test_update(n: int):
+    rng = random.Random(n)
+    sl = SortedList(range(0, 2 * n, 2), load=16)
+    for batch_size in (1, n // 10, 3 * n):
+        batch = [rng.randrange(2 * n) for _ in range(batch_size)]
+        expected = sorted(list(sl) + batch)
+        sl.update(batch)
+        assert_valid(sl)
+        assert list(sl) == expected
+
+
+def test_delitem_and_clear():
+    sl = SortedList(range(100), load=4)
+    del sl[10]
+    del sl[-1]
+    del sl[20:80:3]
+    expected = list(range(100))
+    del expected[10]
+    del expected[-1]
+    del expected[20:80:3]
+    assert list(sl) == expected
+    assert_valid(sl)
+    assert sl == SortedList(expected) and sl != expected
+    sl.clear()
+    assert_empty(sl)
+    sl.add(1)
+    assert list(sl) == [1]
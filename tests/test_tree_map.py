@@ -1,10 +1,13 @@
+import bisect
 import copy
+import math
 import random
 from typing import List, Set, Tuple
 
 import pytest
 
 from ech_datastructures import TreeMap
+from ech_datastructures.tree_map import _TreeMapNode, _TreeMapView
 
 
 NUM_MAP = {
@@ -53,6 +56,45 @@ def assert_empty(tree: TreeMap):
         pytest.fail("iterating over an empty tree should not enter the loop")
 
 
+def assert_balanced(tree: TreeMap):
+    """
+    Check the structural invariants of the backing AVL tree:
+    parent pointers, key ordering, cached heights, and the balance condition.
+    """
+    root = tree._root
+    if root is None:
+        assert len(tree) == 0
+        return
+    assert root.parent is None, "the root should have no parent"
+    count = 0
+    # iterate post-order so children are checked before their parents
+    stack: List[Tuple[_TreeMapNode, bool]] = [(root, False)]
+    while len(stack) > 0:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            for child in (node.left, node.right):
+                if child is not None:
+                    assert child.parent is node, "child's parent pointer is wrong"
+                    stack.append((child, False))
+            continue
+        count += 1
+        left_height = 0 if node.left is None else node.left.height
+        right_height = 0 if node.right is None else node.right.height
+        if node.left is not None:
+            assert node.left.key < node.key, "left child should have a smaller key"
+        if node.right is not None:
+            assert node.key < node.right.key, "right child should have a larger key"
+        assert node.height == 1 + max(left_height, right_height), "cached height is stale"
+        left_size = 0 if node.left is None else node.left.size
+        right_size = 0 if node.right is None else node.right.size
+        assert node.size == 1 + left_size + right_size, "cached size is stale"
+        assert abs(left_height - right_height) <= 1, "AVL balance condition is violated"
+    assert count == len(tree), "number of nodes does not match the length of the map"
+    keys = list(tree)
+    assert keys == sorted(keys), "keys should be in sorted order"
+
+
 def test_empty_tree():
     tree = TreeMap()
     assert_empty(tree)
@@ -72,6 +114,18 @@ def test_add_many_nums():
         assert list(tree.values()) == [NUM_MAP[x] for x in added_list]
 
 
+def test_contains(tree_filled: Tuple[TreeMap, Set[int]]):
+    tree, nums = tree_filled
+    for num in range(-2, 12):
+        if num in nums:
+            assert num in tree, "key that was added should be in the tree"
+        else:
+            assert num not in tree, "key that was never added should not be in the tree"
+    for num in nums:
+        del tree[num]
+        assert num not in tree, "removed key should not be in the tree"
+
+
 def test_remove_many_nums(tree_filled: Tuple[TreeMap, Set[int]]):
     tree, nums_original = tree_filled
     nums_remaining = list(nums_original)
@@ -103,4 +157,333 @@ def test_remove_root_nums(tree_filled: Tuple[TreeMap, Set[int]]):
     assert_empty(tree)
 
 
+def test_sorted_inserts_stay_balanced():
+    n = 2000
+    tree = TreeMap()
+    for i in range(n):
+        tree[i] = str(i)
+    assert_balanced(tree)
+    # AVL trees are never taller than about 1.44 * log2(n)
+    assert tree._root.height <= 1.45 * math.log2(n + 2)
+    for i in reversed(range(-n, 0)):
+        tree[i] = str(i)
+    assert_balanced(tree)
+    assert list(tree) == list(range(-n, n))
+
+
+def test_random_operations_stay_balanced():
+    random.seed(1234)
+    tree = TreeMap()
+    expected = {}
+    for step in range(3000):
+        key = random.randrange(500)
+        action = random.random()
+        if action < 0.5:
+            tree[key] = step
+            expected[key] = step
+        elif action < 0.6:
+            assert tree.setdefault(key, step) == expected.setdefault(key, step)
+        elif key in expected:
+            assert tree.pop(key) == expected.pop(key)
+        else:
+            with pytest.raises(KeyError):
+                del tree[key]
+        if step % 100 == 0:
+            assert_balanced(tree)
+    assert_balanced(tree)
+    assert list(tree.items()) == sorted(expected.items())
+    while len(tree) > 0:
+        key, value = tree.popitem()
+        assert expected.pop(key) == value
+        assert_balanced(tree)
+    assert len(expected) == 0
+    assert_empty(tree)
+
+
+def test_deep_tree_no_recursion():
+    # hand-build a degenerate (linked-list) tree, far deeper than the recursion limit
+    n = 5000
+    root = _TreeMapNode(0, "0")
+    node = root
+    for i in range(1, n):
+        node.right = _TreeMapNode(i, str(i), parent=node)
+        node = node.right
+    # fix the cached heights, from the bottom up
+    while node is not None:
+        node.refresh()
+        node = node.parent
+    tree = TreeMap()
+    tree._root = root
+    tree._count = n
+    assert tree[n - 1] == str(n - 1)
+    assert tree.get(n, "missing") == "missing"
+    assert tree.setdefault(n - 1, "new") == str(n - 1)
+    assert list(tree) == list(range(n))
+    assert list(tree.values()) == [str(i) for i in range(n)]
+    other = TreeMap()
+    for i in range(n):
+        other[i] = str(i)
+    assert tree == other
+    tree[n] = str(n)
+    assert tree[n] == str(n)
+    assert tree.pop(0) == "0"
+    assert list(tree) == list(range(1, n + 1))
+
+
+def test_construct_from_data():
+    pairs = [(5, "a"), (3, "b"), (9, "c"), (3, "d"), (1, "e")]
+    expected = dict(pairs)
+    for data in (pairs, iter(pairs), expected):
+        tree = TreeMap(data)
+        assert_balanced(tree)
+        assert len(tree) == len(expected)
+        assert list(tree.items()) == sorted(expected.items()), \
+            "the last value given for a duplicate key should be kept"
+    with pytest.raises(TypeError):
+        TreeMap(5)
+    assert_empty(TreeMap([]))
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 8, 100, 1000])
+def test_from_sorted(n: int):
+    pairs = [(i, str(i)) for i in range(n)]
+    tree = TreeMap.from_sorted(pairs)
+    assert_balanced(tree)
+    assert list(tree.items()) == pairs
+    assert tree == TreeMap(reversed(pairs))
+    if n > 0:
+        # a perfectly balanced tree is as short as possible
+        assert tree._root.height == n.bit_length()
+
+
+def test_from_sorted_duplicates_and_errors():
+    tree = TreeMap.from_sorted([(1, "a"), (1, "b"), (2, "c"), (3, "d"), (3, "e"), (3, "f")])
+    assert_balanced(tree)
+    assert list(tree.items()) == [(1, "b"), (2, "c"), (3, "f")]
+    with pytest.raises(ValueError):
+        TreeMap.from_sorted([(1, "a"), (3, "b"), (2, "c")])
+
+
+@pytest.mark.parametrize("n_new", [1, 10, 100, 1000])
+def test_update(n_new: int):
+    random.seed(n_new)
+    expected = {x: "old" for x in random.sample(range(2000), 300)}
+    tree = TreeMap(expected)
+    new_pairs = [(random.randrange(2000), i) for i in range(n_new)]
+    tree.update(new_pairs)
+    expected.update(new_pairs)
+    assert_balanced(tree)
+    assert list(tree.items()) == sorted(expected.items())
+    tree.update({-1: "negative"})
+    assert tree.pop(-1) == "negative"
+    with pytest.raises(TypeError):
+        tree.update(5)
+
+
+def test_update_kwargs():
+    tree = TreeMap({"red": 0, "green": 1})
+    tree.update([("blue", 2)], red=3, yellow=4)
+    assert_balanced(tree)
+    assert list(tree.items()) == [("blue", 2), ("green", 1), ("red", 3), ("yellow", 4)]
+
+
+@pytest.fixture(scope="module")
+def tree_evens() -> Tuple[TreeMap, List[int]]:
+    keys = list(range(0, 200, 2))
+    return TreeMap.from_sorted((x, str(x)) for x in keys), keys
+
+
+def test_neighbor_keys(tree_evens: Tuple[TreeMap, List[int]]):
+    tree, keys = tree_evens
+    for probe in range(-3, 203):
+        i_left = bisect.bisect_left(keys, probe)
+        i_right = bisect.bisect_right(keys, probe)
+        assert tree.floor_key(probe) == (keys[i_right - 1] if i_right > 0 else None)
+        assert tree.lower_key(probe) == (keys[i_left - 1] if i_left > 0 else None)
+        assert tree.ceiling_key(probe) == (keys[i_left] if i_left < len(keys) else None)
+        assert tree.higher_key(probe) == (keys[i_right] if i_right < len(keys) else None)
+    assert tree.first() == (0, "0")
+    assert tree.last() == (198, "198")
+    empty = TreeMap()
+    assert empty.floor_key(5) is None
+    assert empty.ceiling_key(5) is None
+    with pytest.raises(KeyError):
+        empty.first()
+    with pytest.raises(KeyError):
+        empty.last()
+
+
+@pytest.mark.parametrize("inclusive", [(True, True), (True, False), (False, True), (False, False)])
+def test_irange(tree_evens: Tuple[TreeMap, List[int]], inclusive: Tuple[bool, bool]):
+    tree, keys = tree_evens
+    for lo, hi in [(10, 20), (11, 21), (-5, 5), (190, 300), (50, 50), (60, 40), (None, 7), (193, None)]:
+        expected = [
+            x for x in keys
+            if (lo is None or (lo <= x if inclusive[0] else lo < x))
+            and (hi is None or (x <= hi if inclusive[1] else x < hi))
+        ]
+        assert list(tree.irange(lo, hi, inclusive)) == expected
+        assert list(tree.keys(lo, hi, inclusive)) == expected
+        assert list(tree.values(lo, hi, inclusive)) == [str(x) for x in expected]
+        assert list(tree.items(lo, hi, inclusive)) == [(x, str(x)) for x in expected]
+    assert list(tree.irange()) == keys
+    assert list(TreeMap().irange(1, 5)) == []
+
+
+def test_rank_and_select():
+    random.seed(99)
+    keys = sorted(random.sample(range(1000), 200))
+    tree = TreeMap()
+    for key in random.sample(keys, len(keys)):
+        tree[key] = -key
+    # remove some, so the sizes have been maintained through removals and rotations too
+    for key in keys[::3]:
+        del tree[key]
+    keys = [key for i, key in enumerate(keys) if i % 3 != 0]
+    assert_balanced(tree)
+    for i, key in enumerate(keys):
+        assert tree.index(key) == i
+        assert tree.peekitem(i) == (key, -key)
+        assert tree.peekitem(i - len(keys)) == (key, -key)
+    assert tree.peekitem() == (keys[-1], -keys[-1])
+    for probe in range(-1, 1002):
+        assert tree.bisect_left(probe) == bisect.bisect_left(keys, probe)
+        assert tree.bisect_right(probe) == bisect.bisect_right(keys, probe)
+    with pytest.raises(ValueError):
+        tree.index(keys[0] - 1)
+    with pytest.raises(ValueError):
+        tree.index(2000)
+    with pytest.raises(IndexError):
+        tree.peekitem(len(keys))
+    with pytest.raises(IndexError):
+        tree.peekitem(-len(keys) - 1)
+    with pytest.raises(IndexError):
+        TreeMap().peekitem()
+    assert TreeMap().bisect_left(5) == 0
+
+
+def test_islice():
+    keys = list(range(0, 100, 3))
+    tree = TreeMap.from_sorted((x, None) for x in keys)
+    for start, stop in [(None, None), (0, 5), (5, 0), (3, -3), (-5, None), (-100, 100), (30, 40)]:
+        assert list(tree.islice(start, stop)) == keys[start:stop]
+    assert list(TreeMap().islice()) == []
+
+
+def test_views():
+    keys = list(range(0, 50, 5))
+    tree = TreeMap.from_sorted((x, str(x)) for x in keys)
+    keys_view, values_view, items_view = tree.keys(), tree.values(), tree.items()
+    assert not hasattr(keys_view, "__dict__"), "views should not allocate a __dict__"
+    assert len(keys_view) == len(values_view) == len(items_view) == len(keys)
+    assert list(keys_view) == keys
+    assert list(reversed(values_view)) == [str(x) for x in reversed(keys)]
+    assert items_view[0] == (0, "0")
+    assert keys_view[-1] == 45
+    assert values_view[2:5] == ["10", "15", "20"]
+    assert keys_view[::3] == keys[::3]
+    with pytest.raises(IndexError):
+        _ = keys_view[len(keys)]
+    assert 10 in keys_view
+    assert 11 not in keys_view
+    assert "15" in values_view
+    assert (20, "20") in items_view
+    assert (20, "wrong") not in items_view
+    assert (21, "21") not in items_view
+    assert keys_view == set(keys)
+    assert keys_view & {0, 1, 5} == {0, 5}
+    # views are live
+    tree[100] = "100"
+    assert len(keys_view) == len(keys) + 1
+    assert keys_view[-1] == 100
+
+
+def test_bounded_views():
+    keys = list(range(0, 50, 5))
+    tree = TreeMap.from_sorted((x, str(x)) for x in keys)
+    keys_view = tree.keys(10, 30, inclusive=(True, False))
+    expected = [10, 15, 20, 25]
+    assert len(keys_view) == len(expected)
+    assert list(keys_view) == expected
+    assert list(reversed(keys_view)) == expected[::-1]
+    assert keys_view[0] == 10
+    assert keys_view[-1] == 25
+    assert keys_view[1:] == expected[1:]
+    with pytest.raises(IndexError):
+        _ = keys_view[4]
+    assert 10 in keys_view
+    assert 30 not in keys_view
+    assert 5 not in keys_view
+    values_view = tree.values(lo=33)
+    assert list(values_view) == ["35", "40", "45"]
+    assert "5" not in values_view
+    assert "40" in values_view
+    items_view = tree.items(hi=7, inclusive=(True, False))
+    assert list(items_view) == [(0, "0"), (5, "5")]
+    assert (10, "10") not in items_view
+    assert len(tree.keys(30, 10)) == 0
+    assert list(tree.keys(30, 10)) == []
+    assert len(TreeMap().items(1, 2)) == 0
+    with pytest.raises(TypeError):
+        _TreeMapView(tree)  # pylint: disable=abstract-class-instantiated
+
+
+def test_reversed(tree_evens: Tuple[TreeMap, List[int]]):
+    tree, keys = tree_evens
+    assert list(reversed(tree)) == keys[::-1]
+    assert list(reversed(TreeMap())) == []
+    assert list(tree.irange(10, 20, reverse=True)) == [20, 18, 16, 14, 12, 10]
+    assert list(tree.irange(11, 21, inclusive=(False, False), reverse=True)) == [20, 18, 16, 14, 12]
+    assert list(tree.irange(10, 20, inclusive=(False, False), reverse=True)) == [18, 16, 14, 12]
+    assert list(tree.irange(hi=5, reverse=True)) == [4, 2, 0]
+    assert list(tree.irange(lo=193, reverse=True)) == [198, 196, 194]
+
+
+def test_cursor(tree_evens: Tuple[TreeMap, List[int]]):
+    tree, keys = tree_evens
+    cursor = tree.cursor(51)
+    assert cursor.is_valid()
+    assert cursor.key == 52
+    assert cursor.item == (52, "52")
+    # walk forward to the end
+    walked = [cursor.key]
+    while cursor.next():
+        walked.append(cursor.key)
+    assert walked == keys[26:]
+    assert not cursor.is_valid()
+    with pytest.raises(IndexError):
+        _ = cursor.key
+    with pytest.raises(IndexError):
+        cursor.next()
+    # walk backward from the end
+    cursor = tree.cursor(keys[-1])
+    walked = [cursor.key]
+    while cursor.prev():
+        walked.append(cursor.key)
+    assert walked == keys[::-1]
+    # back and forth
+    cursor = tree.cursor()
+    assert cursor.key == 0
+    assert cursor.next() and cursor.next() and cursor.prev()
+    assert cursor.key == 2
+    assert not tree.cursor(1000).is_valid()
+    assert not TreeMap().cursor().is_valid()
+
+
+def test_cursor_write_and_invalidate():
+    tree = TreeMap.from_sorted((x, str(x)) for x in range(10))
+    cursor = tree.cursor(3)
+    cursor.value = "three"
+    assert tree[3] == "three"
+    tree[4] = "four"  # overwriting a value doesn't invalidate the cursor
+    assert cursor.next()
+    assert cursor.value == "four"
+    del tree[8]
+    assert not cursor.is_valid()
+    with pytest.raises(RuntimeError):
+        cursor.next()
+    with pytest.raises(RuntimeError):
+        _ = cursor.key
+
+
 # TODO: more tests
@@ -0,0 +1,191 @@
+import random
+from typing import Tuple
+
+import pytest
+
+from ech_datastructures import TreeSet
+from ech_datastructures.tree_set import _merge
+
+from .test_tree_map import assert_balanced
+
+
+def assert_empty(tree: TreeSet):
+    assert len(tree) == 0, "empty set should have length 0"
+    assert 3 not in tree, "empty set should have no contents"
+    with pytest.raises(KeyError):
+        tree.remove(4)
+    tree.discard(4)
+    with pytest.raises(KeyError):
+        tree.pop()
+    with pytest.raises(KeyError):
+        tree.first()
+    with pytest.raises(IndexError):
+        print(tree[0])
+    assert list(tree) == [] and list(reversed(tree)) == []
+    assert_balanced(tree)
+
+
+def test_empty_set():
+    assert_empty(TreeSet())
+    assert_empty(TreeSet([]))
+
+
+def test_add_discard():
+    rng = random.Random(21)
+    tree = TreeSet()
+    expected = set()
+    for _ in range(2000):
+        key = rng.randrange(300)
+        if rng.random() < 0.6:
+            tree.add(key)
+            expected.add(key)
+        else:
+            tree.discard(key)
+            expected.discard(key)
+        assert len(tree) == len(expected)
+    assert_balanced(tree)
+    assert list(tree) == sorted(expected)
+    assert list(reversed(tree)) == sorted(expected, reverse=True)
+    assert tree == expected and expected == tree
+    for key in list(expected):
+        tree.remove(key)
+    assert_empty(tree)
+
+
+def test_construct_and_from_sorted():
+    tree = TreeSet([5, 3, 9, 3, 1, 5])
+    assert_balanced(tree)
+    assert list(tree) == [1, 3, 5, 9]
+    assert TreeSet.from_sorted([1, 1, 2, 4]) == TreeSet([4, 2, 1])
+    with pytest.raises(ValueError):
+        TreeSet.from_sorted([1, 3, 2])
+
+
+def test_merge():
+    left, right = [1, 3, 5, 7], [3, 4, 5, 8, 9]
+    assert _merge(left, right, True, True, True) == [1, 3, 4, 5, 7, 8, 9]
+    assert _merge(left, right, False, True, False) == [3, 5]
+    assert _merge(left, right, True, False, False) == [1, 7]
+    assert _merge(left, right, True, False, True) == [1, 4, 7, 8, 9]
+    assert _merge(left, [], False, True, True) == []
+
+
+@pytest.mark.parametrize("other_type", [TreeSet, set, list])
+def test_set_algebra(other_type: type):
+    rng = random.Random(3)
+    a_keys = {rng.randrange(100) for _ in range(60)}
+    b_keys = {rng.randrange(100) for _ in range(60)}
+    c_keys = {rng.randrange(100) for _ in range(10)}
+    a = TreeSet(a_keys)
+    b, c = other_type(b_keys), other_type(c_keys)
+    results = {
+        "union": (a.union(b, c), a_keys | b_keys | c_keys),
+        "intersection": (a.intersection(b, c), a_keys & b_keys & c_keys),
+        "difference": (a.difference(b, c), a_keys - b_keys - c_keys),
+        "symmetric_difference": (a.symmetric_difference(b), a_keys ^ b_keys),
+    }
+    for name, (result, expected) in results.items():
+        assert isinstance(result, TreeSet), name
+        assert_balanced(result)
+        assert list(result) == sorted(expected), name
+    assert list(a) == sorted(a_keys), "set algebra should not change the original"
+    for method, expected in [
+        ("update", a_keys | b_keys),
+        ("intersection_update", a_keys & b_keys),
+        ("difference_update", a_keys - b_keys),
+        ("symmetric_difference_update", a_keys ^ b_keys),
+    ]:
+        tree = TreeSet(a_keys)
+        getattr(tree, method)(b)
+        assert_balanced(tree)
+        assert list(tree) == sorted(expected), method
+
+
+def test_operators():
+    a, b = TreeSet([1, 2, 3, 4]), TreeSet([3, 4, 5])
+    assert list(a | b) == [1, 2, 3, 4, 5]
+    assert list(a & b) == [3, 4]
+    assert list(a - b) == [1, 2]
+    assert list(a ^ b) == [1, 2, 5]
+    assert list(a & {4, 9}) == [4] and list({4, 9} & a) == [4]
+    assert {4, 9} - a == {9}
+    with pytest.raises(TypeError):
+        print(a | [1])
+    assert TreeSet([3]) <= b and not a <= b
+    assert a.isdisjoint([7, 8])
+    tree = TreeSet([1, 2, 3])
+    tree |= b
+    tree -= {1}
+    tree &= TreeSet([2, 3, 5, 7])
+    tree ^= {7, 5}
+    assert list(tree) == [2, 3, 7]
+    assert a != b and a == TreeSet([4, 3, 2, 1]) and a == {1, 2, 3, 4}
+
+
+def test_small_updates_insert():
+    tree = TreeSet(range(0, 1000, 2))
+    root = tree._root
+    tree.update([1, 3])
+    tree.difference_update([4])
+    assert tree._root is root, "small batches should not rebuild the tree"
+    assert_balanced(tree)
+    assert tree[:4] == [0, 1, 2, 3] and 4 not in tree
+
+
+@pytest.fixture(scope="function")
+def tree_evens() -> TreeSet:
+    return TreeSet(range(0, 20, 2))
+
+
+def test_neighbors(tree_evens: TreeSet):
+    assert tree_evens.first() == 0 and tree_evens.last() == 18
+    assert tree_evens.floor(7) == 6 and tree_evens.floor(8) == 8 and tree_evens.floor(-1) is None
+    assert tree_evens.ceiling(7) == 8 and tree_evens.ceiling(8) == 8 and tree_evens.ceiling(19) is None
+    assert tree_evens.lower(8) == 6 and tree_evens.lower(0) is None
+    assert tree_evens.higher(8) == 10 and tree_evens.higher(18) is None
+
+
+@pytest.mark.parametrize("inclusive", [(True, True), (True, False), (False, True), (False, False)])
+def test_range_views(tree_evens: TreeSet, inclusive: Tuple[bool, bool]):
+    lo_inclusive, hi_inclusive = inclusive
+    expected = [k for k in range(0, 20, 2)
+                if (4 <= k if lo_inclusive else 4 < k) and (k <= 12 if hi_inclusive else k < 12)]
+    assert list(tree_evens.irange(4, 12, inclusive)) == expected
+    assert list(tree_evens.irange(4, 12, inclusive, reverse=True)) == expected[::-1]
+    view = tree_evens.subset(4, 12, inclusive)
+    assert len(view) == len(expected)
+    assert list(view) == expected and list(reversed(view)) == expected[::-1]
+    assert view[0] == expected[0] and view[-1] == expected[-1] and view[1:3] == expected[1:3]
+    assert 8 in view and 7 not in view and 16 not in view
+    tree_evens.add(9)
+    assert 9 in view and len(view) == len(expected) + 1, "views should reflect later changes"
+
+
+def test_rank_and_select(tree_evens: TreeSet):
+    keys = list(range(0, 20, 2))
+    for i, key in enumerate(keys):
+        assert tree_evens.index(key) == i
+        assert tree_evens[i] == key
+        assert tree_evens[i - len(keys)] == key
+        assert tree_evens.bisect_left(key) == i
+        assert tree_evens.bisect_right(key) == i + 1
+        assert tree_evens.bisect_left(key + 1) == i + 1
+    with pytest.raises(ValueError):
+        tree_evens.index(3)
+    with pytest.raises(IndexError):
+        print(tree_evens[len(keys)])
+    assert tree_evens[2:7] == keys[2:7]
+    assert tree_evens[::-3] == keys[::-3]
+    assert list(tree_evens.islice(-3)) == keys[-3:]
+    assert tree_evens.pop(0) == 0
+    assert tree_evens.pop() == 18
+    assert tree_evens.pop(3) == 8
+    with pytest.raises(IndexError):
+        tree_evens.pop(10)
+    assert list(tree_evens) == [2, 4, 6, 10, 12, 14, 16]
+    assert_balanced(tree_evens)
+
+
+def test_nodes_have_no_values():
+    tree = TreeSet([1, 2, 3])
+    assert not hasattr(tree._root, "value"), "set nodes should not carry a value slot"
@@ -0,0 +1,174 @@
+import copy
+import pickle
+import random
+
+import pytest
+
+from ech_datastructures import Trie
+from ech_datastructures.trie import FrozenTrie, _MISSING
+
+
+def assert_empty(trie):
+    assert len(trie) == 0, "empty trie should have length 0"
+    assert list(trie) == []
+    assert "a" not in trie and "" not in trie and 3 not in trie
+    with pytest.raises(KeyError):
+        print(trie["a"])
+    with pytest.raises(KeyError):
+        trie.longest_prefix("abc")
+    assert trie.count_prefix("") == 0
+    assert list(trie.iter_prefix("")) == []
+
+
+def assert_valid(trie: Trie):
+    """Check that chains are collapsed and the cached subtree sizes are right."""
+    def check(node, is_root: bool) -> int:
+        if not is_root:
+            assert len(node.label) > 0, "only the root may have an empty label"
+            assert node.value is not _MISSING or (node.children is not None and len(node.children) >= 2), \
+                "a node with no value should have been merged with its only child"
+        size = 0 if node.value is _MISSING else 1
+        if node.children is not None:
+            assert len(node.children) > 0, "a node with no children should have `children = None`"
+            for first, child in node.children.items():
+                assert child.label[0] == first
+                size += check(child, False)
+        assert node.size == size, "cached subtree size is stale"
+        return size
+    assert check(trie._root, True) == len(trie)
+
+
+WORDS = ["car", "card", "care", "careful", "cart", "cat", "do", "dog", "dot", "", "zebra"]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_empty_trie(frozen: bool):
+    trie = Trie()
+    assert_empty(trie.freeze() if frozen else trie)
+
+
+def test_random_ops():
+    rng = random.Random(23)
+    trie = Trie()
+    expected = {}
+    for _ in range(4000):
+        key = "".join(rng.choice("abc") for _ in range(rng.randrange(6)))
+        if rng.random() < 0.6:
+            trie[key] = len(expected)
+            expected[key] = len(expected)
+        elif key in expected:
+            del trie[key]
+            del expected[key]
+        else:
+            with pytest.raises(KeyError):
+                del trie[key]
+        assert len(trie) == len(expected)
+    assert_valid(trie)
+    assert list(trie) == sorted(expected)
+    assert dict(trie.items()) == expected
+    for key in list(expected):
+        del trie[key]
+    assert_empty(trie)
+    assert_valid(trie)
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_prefix_queries(frozen: bool):
+    trie = Trie((word, i) for i, word in enumerate(WORDS))
+    assert_valid(trie)
+    if frozen:
+        trie = trie.freeze()
+        assert isinstance(trie, FrozenTrie)
+    assert list(trie) == sorted(WORDS) and len(trie) == len(WORDS)
+    for prefix in ["", "c", "ca", "car", "care", "carel", "d", "do", "dogs", "x", "zeb"]:
+        expected = sorted(w for w in WORDS if w.startswith(prefix))
+        assert list(trie.iter_prefix(prefix)) == expected, prefix
+        assert trie.count_prefix(prefix) == len(expected), prefix
+    assert list(trie.iter_prefix_items("do")) == [("do", 6), ("dog", 7), ("dot", 8)]
+    assert trie.longest_prefix("carefully") == ("careful", 3)
+    assert trie.longest_prefix("cards") == ("card", 1)
+    assert trie.longest_prefix("ca") == ("", 9)
+    assert trie.longest_prefix("dog") == ("dog", 7)
+    assert trie["care"] == 2 and "ca" not in trie and "cars" not in trie and 5 not in trie
+    with pytest.raises(KeyError):
+        print(trie["ca"])
+
+
+def test_longest_prefix_missing():
+    trie = Trie({"10.0": "a", "10.0.1": "b"})
+    assert trie.longest_prefix("10.0.1.7") == ("10.0.1", "b")
+    assert trie.longest_prefix("10.0.2.7") == ("10.0", "a")
+    with pytest.raises(KeyError):
+        trie.longest_prefix("10.")
+
+
+def test_from_sorted():
+    pairs = [(w, i) for i, w in enumerate(sorted(WORDS))]
+    trie = Trie.from_sorted(pairs + [("zebra", -1)])
+    assert_valid(trie)
+    assert list(trie.items()) == pairs[:-1] + [("zebra", -1)]
+    with pytest.raises(ValueError):
+        Trie.from_sorted([("b", 1), ("a", 2)])
+    with pytest.raises(TypeError):
+        Trie([(1, 2)])
+    with pytest.raises(TypeError):
+        Trie()[1] = 2
+
+
+def test_build_matches_inserts():
+    rng = random.Random(5)
+    keys = {"".join(rng.choice("ab") for _ in range(rng.randrange(12))) for _ in range(500)}
+    built = Trie((k, k.upper()) for k in keys)
+    inserted = Trie()
+    for k in keys:
+        inserted[k] = k.upper()
+    assert_valid(built)
+    assert list(built.items()) == list(inserted.items())
+    frozen = built.freeze()
+    for prefix in ["", "a", "ab", "bba", "abababab"]:
+        assert list(frozen.iter_prefix(prefix)) == list(inserted.iter_prefix(prefix))
+        assert frozen.count_prefix(prefix) == inserted.count_prefix(prefix)
+
+
+def test_split_and_merge():
+    trie = Trie({"romane": 1})
+    trie["romanus"] = 2
+    trie["rom"] = 3
+    assert trie._root.children["r"].label == "rom"
+    assert_valid(trie)
+    del trie["rom"]
+    assert trie._root.children["r"].label == "roman"
+    del trie["romanus"]
+    assert trie._root.children["r"].label == "romane"
+    assert_valid(trie)
+    assert trie.pop("romane") == 1
+    assert_empty(trie)
+
+
+def test_values_and_frozen_copy():
+    trie = Trie({"a": None, "ab": 0})
+    assert "a" in trie and trie["a"] is None
+    frozen = trie.freeze()
+    trie["a"] = 1
+    trie["abc"] = 2
+    assert dict(frozen) == {"a": None, "ab": 0}, "frozen copy should not see later changes"
+    assert frozen == {"a": None, "ab": 0}
+    with pytest.raises(TypeError):
+        frozen["a"] = 1  # pylint: disable=unsupported-assignment-operation
+    trie.clear()
+    assert_empty(trie)
+
+
+@pytest.mark.parametrize("round_trip", [copy.deepcopy, lambda trie: pickle.loads(pickle.dumps(trie))])
+def test_copy_and_pickle(round_trip):
+    expected = {"ab": 1, "ac": 2, "": None, "abc": 3}
+    trie = Trie(expected)
+    copied = round_trip(trie)
+    assert_valid(copied)
+    assert dict(copied) == expected and len(copied) == len(expected)
+    assert "a" not in copied, "a node with no value should not become a key"
+    copied["a"] = 0
+    assert "a" not in trie
+    frozen = round_trip(trie.freeze())
+    assert dict(frozen) == expected and "a" not in frozen
+    assert frozen.count_prefix("a") == 3